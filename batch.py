@@ -0,0 +1,183 @@
+# batch.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+"""Regenerate every study at once, each in a background process of its own.
+
+Each study gets a job that builds it in `blender --background` and saves
+a .blend file, and a job that exports it to a .glb file with plain Python.
+The jobs run side by side, a few at a time, and are retried if they fail.
+What they make goes into a folder named for the day, like the ones in
+generated/, along with each study's report:
+
+    python batch.py [manhattan wurster ...] [--jobs 4] [--retries 1]
+"""
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from cli import COMMANDS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATED = os.path.join(HERE, "generated")
+REPORT_START = "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
+
+
+class Job(NamedTuple):
+    name: str              # what its files are named, like "manhattan"
+    study: str             # the cli.py study it builds
+    command: List[str]
+    output: str            # the file it makes
+    report: Optional[str]  # where its report goes, if anywhere
+
+
+class Outcome(NamedTuple):
+    job: Job
+    ok: bool
+    attempts: int
+    seconds: float
+    log: str
+
+
+def _jobs(studies: Sequence[str], folder: str, blender: Optional[str],
+          glb: bool) -> List[Job]:
+    """Return a .blend job (if there is a Blender) and a .glb job per study.
+    """
+    cli = os.path.join(HERE, "cli.py")
+    jobs = []
+    for study in studies:
+        if blender:
+            output = os.path.join(folder, study + ".blend")
+            jobs.append(Job(study, study,
+                            [blender, "--background",
+                             os.path.join(HERE, "nym.blend"),
+                             "--python-exit-code", "1",
+                             "--python", cli, "--", "--merge-walls", "--weld",
+                             "--save", output, study],
+                            output, os.path.join(folder,
+                                                 study + "_stats.txt")))
+        if glb:
+            output = os.path.join(folder, study + ".glb")
+            jobs.append(Job(study + ".glb", study,
+                            [sys.executable, cli, "--merge-walls",
+                             "--envelope", "--weld", "--glb", output, study],
+                            output, None if blender else
+                            os.path.join(folder, study + "_stats.txt")))
+    return jobs
+
+
+def _report(log: str) -> str:
+    """Return what cli.py printed, without what Blender printed around it."""
+    lines = log.splitlines()
+    if REPORT_START in lines:
+        lines = lines[lines.index(REPORT_START):]
+    return "\n".join(lines) + "\n"
+
+
+def run_job(job: Job, retries: int=1,
+            timeout: Optional[float]=None) -> Outcome:
+    """Run a job until it succeeds, or has been tried 1 + retries times."""
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        if os.path.exists(job.output):
+            os.remove(job.output)  # so a stale file can't pass for a new one
+        try:
+            done = subprocess.run(job.command, cwd=HERE, timeout=timeout,
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT,
+                                  universal_newlines=True)
+            (ok, log) = (done.returncode == 0, done.stdout)
+            if not ok:
+                log += "exited with status {}\n".format(done.returncode)
+        except subprocess.TimeoutExpired as expired:
+            (ok, log) = (False, "timed out after {}s".format(expired.timeout))
+        ok = ok and os.path.exists(job.output)
+        if ok:
+            break
+    if ok and job.report:
+        with open(job.report, "w") as file:
+            file.write(_report(log))
+    return Outcome(job, ok, attempt, time.perf_counter() - start, log)
+
+
+def run_all(jobs: Sequence[Job], concurrency: int, retries: int=1,
+            timeout: Optional[float]=None) -> List[Outcome]:
+    """Run the jobs, no more than so many at a time, and return how each went.
+
+    The jobs are separate processes, so a thread apiece is enough to wait
+    on them. Slow jobs should come first, so they don't start last.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda job: run_job(job, retries, timeout),
+                             jobs))
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("studies", nargs="*",
+                        help="studies to build, out of {} (default: all)"
+                             .format(", ".join(COMMANDS)))
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="how many jobs to run at once")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="how many more times to try a failed job")
+    parser.add_argument("--timeout", type=float,
+                        help="seconds to give each try before giving up")
+    parser.add_argument("--blender", default=shutil.which("blender"),
+                        help="the Blender to run (default: blender on PATH)")
+    parser.add_argument("--no-blend", action="store_true",
+                        help="don't build .blend files")
+    parser.add_argument("--no-glb", action="store_true",
+                        help="don't export .glb files")
+    parser.add_argument("--out", default=os.path.join(
+                            GENERATED, datetime.date.today().isoformat()),
+                        help="the folder to put it all in")
+    options = parser.parse_args(argv)
+    for study in options.studies:
+        if study not in COMMANDS:
+            parser.error("there is no study called " + study)
+
+    os.makedirs(options.out, exist_ok=True)
+    blender = None if options.no_blend else options.blender
+    jobs = _jobs(options.studies or list(COMMANDS), options.out, blender,
+                 not options.no_glb)
+    if not jobs:
+        print("Nothing to do: no Blender to run, and no .glb to export")
+        return 1
+    jobs.sort(key=lambda job: job.study != "manhattan")  # the slowest
+    print("Running {} jobs, {} at a time, into {}".format(
+        len(jobs), options.jobs, options.out))
+
+    start = time.perf_counter()
+    outcomes = run_all(jobs, max(1, options.jobs), options.retries,
+                       options.timeout)
+    for outcome in outcomes:
+        print("  {:<16} {:<6} {:>8.2f}s  {} {}".format(
+            outcome.job.name, "ok" if outcome.ok else "FAILED",
+            outcome.seconds, outcome.attempts,
+            "try" if outcome.attempts == 1 else "tries"))
+        if not outcome.ok:
+            log = os.path.join(options.out, outcome.job.name + "_error.txt")
+            with open(log, "w") as file:
+                file.write(outcome.log)
+            print("    see " + log)
+    print("  {:.2f}s in all".format(time.perf_counter() - start))
+    return 0 if all(outcome.ok for outcome in outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
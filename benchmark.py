@@ -0,0 +1,314 @@
+# benchmark.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+"""Time each generator at a few scales, and check its areas.
+
+Run it with plain Python, where a stand-in for bpy takes the place of
+Blender, or inside Blender to time the real thing:
+
+    python benchmark.py [manhattan merlon ...] [--scales 2] [--no-memory]
+    blender --background --python benchmark.py -- [same options]
+"""
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATS = os.path.join(HERE, "generated", "2019-10-15")
+
+AREA_TOLERANCE = 0.005   # how far off an area can be, as a fraction
+RANDOM_TOLERANCE = 0.10  # for the areas of places shaped by random choices
+
+
+class Benchmark(NamedTuple):
+    topic: str             # the study, as named in its stats file
+    module: str
+    generator: str
+    method: str
+    scales: Sequence[Tuple]
+    kwargs: dict
+    stats: str             # the stats file with the study's areas
+    reference: Tuple       # the scale those areas were generated at
+    random_places: Tuple   # Place names whose areas vary from run to run
+    as_generated: dict = {}  # more kwargs, to build it as its stats were
+
+
+BENCHMARKS = [
+    Benchmark("Cottage(s)", "cottage", "Cottage", "add_street",
+              [(3,), (12,), (48,)], {},
+              "cottage_stats.txt", (12,), ()),
+    Benchmark("Manhattan New York", "manhattan", "Manhattan", "add_blocks",
+              [(1, 2), (2, 4), (4, 8)], {},
+              "manhattan_stats.txt", (4, 8), ("ROOM", "WALL"),
+              {"windows": False}),  # the stats are from before windows
+    Benchmark("Merlon Buildings", "merlon", "Merlon", "add_buildings",
+              [(2, 2), (8, 8), (16, 16)], {"buildings": True},
+              "merlon_bikeway_stats.txt", (8, 8), ("ROOF",)),
+    Benchmark("Bikeways", "bikeway", "Bikeway", "add_bikeways",
+              [(1, 1), (3, 3), (6, 6)], {"buildings": True},
+              "merlon_bikeway_stats.txt", (3, 3), ()),
+    Benchmark("Wurster Hall(s)", "wurster", "Wurster", "add_buildings",
+              [(1,)], {},  # there is just the one Wurster Hall
+              "wurster_stats.txt", (1,), ()),
+]
+
+
+class _Rows:
+    """A stand-in for a bpy collection of mesh elements, like mesh.vertices.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.data = {}
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count: int):
+        self.count += count
+
+    def foreach_set(self, attribute: str, values):
+        self.data[attribute] = np.array(values)
+
+
+class _Mesh:
+    def __init__(self, name: str):
+        self.name = name
+        self.users = 0
+        self.vertices = _Rows()
+        self.loops = _Rows()
+        self.polygons = _Rows()
+        self.materials = []
+
+    def update(self, calc_edges: bool=False):
+        pass
+
+
+class _Object:
+    def __init__(self, name: str, data):
+        self.name = name
+        self.data = data
+        self.type = 'MESH'
+        self.mode = 'OBJECT'
+        self.location = (0, 0, 0)
+        self.rotation_euler = (0, 0, 0)
+        data.users += 1
+
+
+class _Material:
+    def __init__(self, name: str):
+        self.name = name
+        self.users = 0
+        self.diffuse_color = (1, 1, 1, 1)
+
+
+class _Collection:
+    def __init__(self, name: str):
+        self.name = name
+        self.objects = _Linked()
+        self.children = _Linked()
+
+    @property
+    def all_objects(self):
+        objects = list(self.objects)
+        for child in self.children:
+            objects += child.all_objects
+        return objects
+
+
+class _Linked(list):
+    def link(self, item):
+        self.append(item)
+
+    def get(self, name: str):
+        return next((item for item in self if item.name == name), None)
+
+
+class _Blocks(dict):
+    """A stand-in for a bpy.data collection, like bpy.data.meshes."""
+
+    def __init__(self, kind: type):
+        super().__init__()
+        self._kind = kind
+        self._suffixes = {}
+
+    def new(self, name: str, *args):
+        unique = name
+        while unique in self:
+            self._suffixes[name] = self._suffixes.get(name, 0) + 1
+            unique = "{}.{:03d}".format(name, self._suffixes[name])
+        self[unique] = self._kind(unique, *args)
+        return self[unique]
+
+    def __iter__(self):
+        return iter(list(self.values()))
+
+
+def _stand_in_bpy():
+    """Return a module with just the parts of bpy that plato uses.
+
+    It keeps a copy of every array that would go to Blender, so the time
+    and memory it takes to hand faces over are counted, but draws nothing.
+    """
+    bpy = types.ModuleType("bpy")
+    data = types.SimpleNamespace(meshes=_Blocks(_Mesh),
+                                 objects=_Blocks(_Object),
+                                 materials=_Blocks(_Material),
+                                 collections=_Blocks(_Collection))
+
+    def batch_remove(ids):
+        for block in ids:
+            for blocks in (data.meshes, data.objects, data.materials,
+                           data.collections):
+                if blocks.get(block.name) is block:
+                    del blocks[block.name]
+            if isinstance(block, _Object):
+                block.data.users -= 1
+    data.batch_remove = batch_remove
+    scene = types.SimpleNamespace(collection=_Collection("Scene Collection"))
+    bpy.data = data
+    bpy.context = types.SimpleNamespace(scene=scene, active_object=None)
+    return bpy
+
+
+def _use_blender_or_stand_in():
+    """Import bpy if we are inside Blender, or else put the stand-in in place.
+    """
+    try:
+        import bpy
+        return "Blender"
+    except ImportError:
+        sys.modules["bpy"] = _stand_in_bpy()
+        return "stand-in bpy"
+
+
+def _read_square_feet(lines: Iterable[str]) -> dict:
+    """Return {topic: {place name: square feet}} from pontificate() reports.
+    """
+    studies = {}
+    areas = None
+    for line in lines:
+        line = line.strip()
+        if line.endswith(" floor area"):
+            areas = studies.setdefault(line[:-len(" floor area")], {})
+        elif line.endswith(" square feet") and areas is not None:
+            (name, area) = line[:-len(" square feet")].split(": ")
+            areas[name] = float(area.replace(",", ""))
+    return studies
+
+
+def _build(benchmark: Benchmark, scale: Tuple, **kwargs):
+    """Build a study at one scale, and return (plato, its report)."""
+    from plato import Plato
+    module = importlib.import_module(benchmark.module)
+    random.seed(0)
+    plato = Plato(batch=True)
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        plato.study(benchmark.topic)
+        generator = getattr(module, benchmark.generator)(plato)
+        getattr(generator, benchmark.method)(*scale, **benchmark.kwargs,
+                                             **kwargs)
+        plato.pontificate()
+    return (plato, report.getvalue())
+
+
+def _peak_megabytes(benchmark: Benchmark, scale: Tuple):
+    tracemalloc.start()
+    (plato, report) = _build(benchmark, scale)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plato.delete_study(benchmark.topic)
+    return peak / 2**20
+
+
+def check_areas(benchmark: Benchmark, report: str) -> List[str]:
+    """Compare a report with the stats file, and return what differs."""
+    with open(os.path.join(STATS, benchmark.stats)) as file:
+        expected = _read_square_feet(file)[benchmark.topic]
+    actual = _read_square_feet(report.splitlines())[benchmark.topic]
+    problems = []
+    for name in sorted(set(expected) | set(actual)):
+        (was, now) = (expected.get(name, 0), actual.get(name, 0))
+        tolerance = (RANDOM_TOLERANCE if name in benchmark.random_places
+                     else AREA_TOLERANCE)
+        if abs(now - was) > tolerance * max(abs(was), 1):
+            problems.append("{}: {:,.0f} square feet, not {:,.0f}"
+                            .format(name, now, was))
+    return problems
+
+
+def run(benchmark: Benchmark, scales: int, memory: bool=True):
+    """Time one generator at each of its first few scales, and report."""
+    for scale in benchmark.scales[:scales]:
+        start = time.perf_counter()
+        (plato, report) = _build(benchmark, scale)
+        seconds = time.perf_counter() - start
+        faces = len(plato.faces)
+        verts = len(plato.faces.verts)
+        stages = plato.counters.timings()
+        plato.delete_study(benchmark.topic)
+        if memory:
+            megabytes = "{:.1f}".format(_peak_megabytes(benchmark, scale))
+        else:
+            megabytes = "-"
+        print("{:<10} {:<9} {:>9,} {:>10,} {:>8.2f} {:>11,.0f} {:>11,.0f} "
+              "{:>8}".format(benchmark.generator, str(scale), faces, verts,
+                             seconds, faces / seconds, verts / seconds,
+                             megabytes))
+        print("    " + ", ".join("{} {:.2f}s".format(stage, seconds)
+                                 for (stage, seconds) in stages.items()))
+        if scale == benchmark.reference:
+            if benchmark.as_generated:
+                (plato, report) = _build(benchmark, scale,
+                                         **benchmark.as_generated)
+                plato.delete_study(benchmark.topic)
+            for problem in check_areas(benchmark, report):
+                print("    areas differ from {}: {}".format(benchmark.stats,
+                                                            problem))
+
+
+def main(argv: Sequence[str]):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("generators", nargs="*",
+                        help="modules to time, like manhattan (default: all)")
+    parser.add_argument("--scales", type=int, default=3,
+                        help="how many of the scales to run, smallest first")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the second, traced, run for peak memory")
+    options = parser.parse_args(argv)
+    sys.path.insert(0, HERE)
+    print("Building into", _use_blender_or_stand_in())
+    print("{:<10} {:<9} {:>9} {:>10} {:>8} {:>11} {:>11} {:>8}".format(
+        "generator", "scale", "faces", "verts", "seconds", "faces/s",
+        "verts/s", "peak MB"))
+    for benchmark in BENCHMARKS:
+        if not options.generators or benchmark.module in options.generators:
+            run(benchmark, options.scales, memory=not options.no_memory)
+
+
+if __name__ == "__main__":
+    # Blender keeps its own options before a "--", and ours after it
+    if "--" in sys.argv:
+        main(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        main(sys.argv[1:])
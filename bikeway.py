@@ -12,111 +12,112 @@ from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
 from random import randint
 from importlib import reload
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, yzwh2rect, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, yzwh2rect, nudge
 from compass_facing import CompassFacing as Facing
 from place import Place
 from plato import Plato, rotate
 
 # in feet
 BLOCK_LENGTH = 660
-
-PARCEL = [(0, 0, 0),
-          (BLOCK_LENGTH, 0, 0),
-          (BLOCK_LENGTH, BLOCK_LENGTH, 0),
-          (0, BLOCK_LENGTH, 0)]
-
-EXIT_DOWN = [(25, 0, 0.1),
-             (25, 45, 0.1),
-             (30, 90, 0.1),
-             (40, 90, 0.1),
-             (30, 0, 0.1)]
-RAMP_DOWN_TO_LANDING = [(30, 90, 0),
-                        (30, 270, -7.5),
-                        (40, 270, -7.5),
-                        (40, 90, 0)]
-LANDING = [(30, 270, -7.5),
-           (30, 390, -7.5),
-           (50, 390, -7.5),
-           (50, 270, -7.5)]
-LANDING_PARKING = [(50, 270, -7.5),
-                   (50, 390, -7.5),
-                   (55, 390, -7.5),
-                   (55, 270, -7.5)]
-LANDING_PLAZA = [(55, 270, -7.5),
-                 (55, 390, -7.5),
-                 (70, 390, -7.5),
-                 (70, 270, -7.5)]
-LANDING_NORTH_WALKWAY = [(70, 381, -7.5),
-                         (129, 381, -5),
-                         (129, 375, -5),
-                         (70, 375, -7.5)]
-LANDING_SOUTH_WALKWAY = [(70, 285, -7.5),
-                         (129, 285, -5),
-                         (129, 279, -5),
-                         (70, 279, -7.5)]
-
-RAMP_UP_FROM_LANDING = [(30, 390, -7.5),
-                        (30, 570, 0),
-                        (40, 570, 0),
-                        (40, 390, -7.5)]
-ENTRANCE_FROM_BELOW = [(30, 570, 0.1),
-                       (25, 615, 0.1),
-                       (25, 660, 0.1),
-                       (30, 660, 0.1),
-                       (40, 570, 0.1)]
-RAMP_DOWN_FROM_LANDING = [(40, 390, -7.5),
-                          (40, 570, -15),
-                          (50, 570, -15),
-                          (50, 390, -7.5)]
-RIGHT_TURN_TO_ENTER = [(40, 570, -15),
-                       (55, 620, -14.9),
-                       (100, 635, -14.9),
-                       (100, 625, -14.9),
-                       (64, 612, -15),
-                       (50, 570, -15)]
-ENTRANCE_FROM_ABOVE = [(100, 635, -14.9),
-                       (170, 635, -14.9),
-                       (100, 625, -14.9)]
-EXIT_UP = [(170, 25, -14.9),
-           (100, 25, -14.9),
-           (100, 35, -14.9)]
-RIGHT_TURN_FROM_EXIT = [(100, 25, -14.9),
-                        (55, 40, -14.9),
-                        (40, 90, -15),
-                        (50, 90, -15),
-                        (64, 48, -15),
-                        (100, 35, -14.9)]
-RAMP_UP_TO_LANDING = [(40, 90, -15),
-                      (40, 270, -7.5),
-                      (50, 270, -7.5),
-                      (50, 90, -15)]
-LOWER_PLAZA = [(170, 30, -14.9),
-               (170, 45, -14.9),
-               (490, 45, -14.9),
-               (490, 30, -14.9)]
+TILE_GRID = (BLOCK_LENGTH, BLOCK_LENGTH, 0, 0)  # one block per tile
+
+PARCEL = Shape([(0, 0, 0),
+                (BLOCK_LENGTH, 0, 0),
+                (BLOCK_LENGTH, BLOCK_LENGTH, 0),
+                (0, BLOCK_LENGTH, 0)])
+
+EXIT_DOWN = Shape([(25, 0, 0.1),
+                   (25, 45, 0.1),
+                   (30, 90, 0.1),
+                   (40, 90, 0.1),
+                   (30, 0, 0.1)])
+RAMP_DOWN_TO_LANDING = Shape([(30, 90, 0),
+                              (30, 270, -7.5),
+                              (40, 270, -7.5),
+                              (40, 90, 0)])
+LANDING = Shape([(30, 270, -7.5),
+                 (30, 390, -7.5),
+                 (50, 390, -7.5),
+                 (50, 270, -7.5)])
+LANDING_PARKING = Shape([(50, 270, -7.5),
+                         (50, 390, -7.5),
+                         (55, 390, -7.5),
+                         (55, 270, -7.5)])
+LANDING_PLAZA = Shape([(55, 270, -7.5),
+                       (55, 390, -7.5),
+                       (70, 390, -7.5),
+                       (70, 270, -7.5)])
+LANDING_NORTH_WALKWAY = Shape([(70, 381, -7.5),
+                               (129, 381, -5),
+                               (129, 375, -5),
+                               (70, 375, -7.5)])
+LANDING_SOUTH_WALKWAY = Shape([(70, 285, -7.5),
+                               (129, 285, -5),
+                               (129, 279, -5),
+                               (70, 279, -7.5)])
+
+RAMP_UP_FROM_LANDING = Shape([(30, 390, -7.5),
+                              (30, 570, 0),
+                              (40, 570, 0),
+                              (40, 390, -7.5)])
+ENTRANCE_FROM_BELOW = Shape([(30, 570, 0.1),
+                             (25, 615, 0.1),
+                             (25, 660, 0.1),
+                             (30, 660, 0.1),
+                             (40, 570, 0.1)])
+RAMP_DOWN_FROM_LANDING = Shape([(40, 390, -7.5),
+                                (40, 570, -15),
+                                (50, 570, -15),
+                                (50, 390, -7.5)])
+RIGHT_TURN_TO_ENTER = Shape([(40, 570, -15),
+                             (55, 620, -14.9),
+                             (100, 635, -14.9),
+                             (100, 625, -14.9),
+                             (64, 612, -15),
+                             (50, 570, -15)])
+ENTRANCE_FROM_ABOVE = Shape([(100, 635, -14.9),
+                             (170, 635, -14.9),
+                             (100, 625, -14.9)])
+EXIT_UP = Shape([(170, 25, -14.9),
+                 (100, 25, -14.9),
+                 (100, 35, -14.9)])
+RIGHT_TURN_FROM_EXIT = Shape([(100, 25, -14.9),
+                              (55, 40, -14.9),
+                              (40, 90, -15),
+                              (50, 90, -15),
+                              (64, 48, -15),
+                              (100, 35, -14.9)])
+RAMP_UP_TO_LANDING = Shape([(40, 90, -15),
+                            (40, 270, -7.5),
+                            (50, 270, -7.5),
+                            (50, 90, -15)])
+LOWER_PLAZA = Shape([(170, 30, -14.9),
+                     (170, 45, -14.9),
+                     (490, 45, -14.9),
+                     (490, 30, -14.9)])
 
 WALKWAY_SPACING = 96
 WALKWAY_WIDTH = 6
 WALKWAY_XA = 183
-LOWER_PLAZA_WALKWAY_A = [(WALKWAY_XA, 45, -15),
-                         (WALKWAY_XA, 129, -15),
-                         (WALKWAY_XA + WALKWAY_WIDTH, 129, -15),
-                         (WALKWAY_XA + WALKWAY_WIDTH, 45, -15)]
+LOWER_PLAZA_WALKWAY_A = Shape([(WALKWAY_XA, 45, -15),
+                               (WALKWAY_XA, 129, -15),
+                               (WALKWAY_XA + WALKWAY_WIDTH, 129, -15),
+                               (WALKWAY_XA + WALKWAY_WIDTH, 45, -15)])
 WALKWAY_XB = WALKWAY_XA + WALKWAY_SPACING
-LOWER_PLAZA_WALKWAY_B = [(WALKWAY_XB, 45, -15),
-                         (WALKWAY_XB, 129, -15),
-                         (WALKWAY_XB + WALKWAY_WIDTH, 129, -15),
-                         (WALKWAY_XB + WALKWAY_WIDTH, 45, -15)]
+LOWER_PLAZA_WALKWAY_B = Shape([(WALKWAY_XB, 45, -15),
+                               (WALKWAY_XB, 129, -15),
+                               (WALKWAY_XB + WALKWAY_WIDTH, 129, -15),
+                               (WALKWAY_XB + WALKWAY_WIDTH, 45, -15)])
 WALKWAY_XC = WALKWAY_XB + WALKWAY_SPACING
-LOWER_PLAZA_WALKWAY_C = [(WALKWAY_XC, 45, -15),
-                         (WALKWAY_XC, 129, -15),
-                         (WALKWAY_XC + WALKWAY_WIDTH, 129, -15),
-                         (WALKWAY_XC + WALKWAY_WIDTH, 45, -15)]
+LOWER_PLAZA_WALKWAY_C = Shape([(WALKWAY_XC, 45, -15),
+                               (WALKWAY_XC, 129, -15),
+                               (WALKWAY_XC + WALKWAY_WIDTH, 129, -15),
+                               (WALKWAY_XC + WALKWAY_WIDTH, 45, -15)])
 WALKWAY_XD = WALKWAY_XC + WALKWAY_SPACING
-LOWER_PLAZA_WALKWAY_D = [(WALKWAY_XD, 45, -15),
-                         (WALKWAY_XD, 129, -15),
-                         (WALKWAY_XD + WALKWAY_WIDTH, 129, -15),
-                         (WALKWAY_XD + WALKWAY_WIDTH, 45, -15)]
+LOWER_PLAZA_WALKWAY_D = Shape([(WALKWAY_XD, 45, -15),
+                               (WALKWAY_XD, 129, -15),
+                               (WALKWAY_XD + WALKWAY_WIDTH, 129, -15),
+                               (WALKWAY_XD + WALKWAY_WIDTH, 45, -15)])
 
 
 class Bikeway:
@@ -235,7 +236,7 @@ class Bikeway:
         return self
 
     def add_bikeways(self, num_rows: Num=0, num_cols: Num=0, buildings: bool=True):
-        for row in range(num_rows):
-            for col in range(num_cols):
-                self.add_block(row, col, buildings=buildings)
+        blocks = [(row, col)
+                  for row in range(num_rows) for col in range(num_cols)]
+        self._plato.add_blocks(self, "add_block", blocks, buildings=buildings)
         return self
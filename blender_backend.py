@@ -0,0 +1,232 @@
+# blender_backend.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import bpy
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from random import randint
+import math
+import time
+
+import numpy as np
+
+from xyz import Xyz
+from compass_facing import CompassFacing as Facing
+from place import Place
+from face_buffer import FaceBuffer
+from plato import Backend, Occurrence, COLORS_OF_PLACES, move_home
+
+
+def _material_by_place(place: Place):
+    material = bpy.data.materials.get(place.name)
+    if material is None:
+        material = bpy.data.materials.new(name=place.name)
+        material.diffuse_color = COLORS_OF_PLACES[place]
+    return material
+
+
+def _new_mesh(name: str, verts, loops, starts, sizes):
+    """Make a Blender mesh datablock out of a submesh of a FaceBuffer."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.astype(np.float32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops.astype(np.int32))
+    mesh.polygons.add(len(starts))
+    mesh.polygons.foreach_set("loop_start", starts.astype(np.int32))
+    mesh.polygons.foreach_set("loop_total", sizes.astype(np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def _collection(name: str, parent):
+    """Return the collection of that name, linked under the parent."""
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if parent.children.get(name) is None:
+        parent.children.link(collection)
+    return collection
+
+
+def _with_children(collection) -> List:
+    """Return a collection and all the collections nested inside it."""
+    collections = [collection]
+    for child in collection.children:
+        collections += _with_children(child)
+    return collections
+
+
+def _layer_collection(layer, name: str):
+    """Find where a collection is in a view layer, or return None."""
+    if layer.name == name:
+        return layer
+    for child in layer.children:
+        found = _layer_collection(child, name)
+        if found is not None:
+            return found
+    return None
+
+
+def _leave_edit_mode():
+    """Go back to object mode, since objects being edited can't be removed."""
+    obj = bpy.context.active_object
+    if obj is not None and obj.mode == 'EDIT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+
+def _remove_objects(objects: Sequence):
+    """Remove objects, and then the meshes and materials they leave unused.
+
+    This goes straight through bpy.data in a few batches, rather than by
+    selecting and deleting with bpy.ops, which slows down as the number of
+    objects grows and leaves each mesh behind as an orphan datablock.
+    """
+    meshes = {obj.data.name: obj.data for obj in objects
+              if obj.type == 'MESH'}
+    bpy.data.batch_remove(objects)
+    bpy.data.batch_remove([mesh for mesh in meshes.values()
+                           if mesh.users == 0])
+    materials = [bpy.data.materials.get(place.name) for place in Place]
+    bpy.data.batch_remove([material for material in materials
+                           if material is not None and material.users == 0])
+
+
+def _add_seconds(counters, converting: float, linking: float):
+    if counters is not None:
+        counters.add_seconds("mesh conversion", converting)
+        counters.add_seconds("linking", linking)
+
+
+class BlenderBackend(Backend):
+    """BlenderBackend turns the faces plato records into Blender objects.
+
+    Each study gets a collection of its own, named for its topic, so that
+    it can be hidden, exported, or deleted all at once. Coarser levels of
+    detail go in collections of their own inside it.
+    """
+
+    def __init__(self):
+        self._study = ""
+
+    def _collection_of(self, topic: str):
+        scene = bpy.context.scene.collection
+        if not topic:
+            return scene
+        if not self._study or topic == self._study:
+            return _collection(topic, scene)
+        return _collection(topic, _collection(self._study, scene))
+
+    def study(self, topic: str):
+        self._study = topic
+        if topic:
+            _collection(topic, bpy.context.scene.collection)
+        return self
+
+    def consume(self,
+                buffer: FaceBuffer,
+                faces: np.ndarray,
+                *,
+                topic: str="",
+                merge: bool=False):
+        collection = self._collection_of(topic)
+        (converting, linking) = (0, 0)
+        places = buffer.places[faces]
+        for place in Place:
+            faces_of_place = faces[places == place.value]
+            if len(faces_of_place) == 0:
+                continue
+            name = topic + " " + place.name
+            if merge:
+                batches = [(name, faces_of_place)]
+            else:
+                batches = [(name, faces_of_place[i:i+1])
+                           for i in range(len(faces_of_place))]
+            material = _material_by_place(place)
+            for (name, batch) in batches:
+                start_time = time.perf_counter()
+                mesh = _new_mesh(name, *buffer.submesh(batch, self.weld))
+                mesh.materials.append(material)
+                obj = bpy.data.objects.new(name, mesh)
+                link_time = time.perf_counter()
+                collection.objects.link(obj)
+                converting += link_time - start_time
+                linking += time.perf_counter() - link_time
+        _add_seconds(self.counters, converting, linking)
+        return self
+
+    def instantiate(self,
+                    buffer: FaceBuffer,
+                    designs: Sequence[Sequence[Occurrence]],
+                    *,
+                    topic: str=""):
+        collection = self._collection_of(topic)
+        (converting, linking) = (0, 0)
+        for i, occurrences in enumerate(designs):
+            start_time = time.perf_counter()
+            name = "{} design {}".format(topic, i)
+            (f0, f1, at, facing) = occurrences[0]
+            faces = np.arange(f0, f1)
+            (verts, loops, starts, sizes) = buffer.submesh(faces, self.weld)
+            verts = move_home(verts, at, facing)
+            mesh = _new_mesh(name, verts, loops, starts, sizes)
+            places = [Place(value) for value in buffer.places[faces]]
+            slots = list(dict.fromkeys(places))
+            for place in slots:
+                mesh.materials.append(_material_by_place(place))
+            mesh.polygons.foreach_set("material_index",
+                                      [slots.index(place) for place in places])
+            link_time = time.perf_counter()
+            for (f0, f1, at, facing) in occurrences:
+                obj = bpy.data.objects.new(name, mesh)
+                obj.location = at
+                obj.rotation_euler = (0, 0, math.radians(facing.value))
+                collection.objects.link(obj)
+            converting += link_time - start_time
+            linking += time.perf_counter() - link_time
+        _add_seconds(self.counters, converting, linking)
+        return self
+
+    def delete_all_objects(self):
+        """Delete every object in the file, along with its unused data."""
+        _leave_edit_mode()
+        _remove_objects(list(bpy.data.objects))
+        return self
+
+    def delete_study(self, topic: str):
+        """Delete a study's collection, its objects, and their data."""
+        collection = bpy.data.collections.get(topic)
+        if collection is None:
+            return self
+        _leave_edit_mode()
+        _remove_objects(list(collection.all_objects))
+        bpy.data.batch_remove(_with_children(collection))
+        return self
+
+    def hide_study(self, topic: str, hide: bool=True):
+        """Exclude a study's collection from the view layer, or bring it back.
+        """
+        layer = _layer_collection(bpy.context.view_layer.layer_collection,
+                                  topic)
+        if layer is not None:
+            layer.exclude = hide
+        return self
+
+    def add_cubes(self, number_of_cubes: int=1):
+        """Create N new cubes at random locations, with different orientations.
+        """
+        for i in range(number_of_cubes):
+            x = randint(-10, 20)
+            y = randint(-10, 20)
+            z = randint(-10, 20)
+            bpy.ops.mesh.primitive_cube_add(location=(x, y, z), size=4)
+            radians = i*(3.14/(4*number_of_cubes))
+            bpy.ops.transform.rotate(orient_axis='Z', value=radians)
+        return self
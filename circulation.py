@@ -0,0 +1,156 @@
+# circulation.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+import heapq
+
+import numpy as np
+
+from xyz import Num
+from place import Place
+
+# How fast people get around on each kind of path, in feet per second
+SPEEDS = {Place.WALKWAY: 4.5,    # walking, about 3 miles per hour
+          Place.BIKEPATH: 22.0}  # biking, about 15 miles per hour
+
+TOUCHING = 0.5          # feet: faces this close together are connected
+FLUIDITY_SAMPLES = 16   # trips are timed from this many places
+STOKES_PER_SQUARE_FOOT_PER_SECOND = 929.0304  # 1 St is 1 cm^2/s
+
+
+class Graph(NamedTuple):
+    """A graph in compressed sparse row (CSR) form.
+
+    The neighbors of node i are indices[indptr[i]:indptr[i+1]], and the
+    costs of getting to them are the same run of costs.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    costs: np.ndarray
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+
+def touching(lows: np.ndarray,
+             highs: np.ndarray,
+             tolerance: Num=TOUCHING) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the pairs of boxes that touch or overlap, as two index arrays.
+
+    The boxes are rows of low and high xyz corners. They are sorted by low
+    x, so each box only has to be checked against the run of boxes that
+    start within its own x extent, and then in y and z, all at once.
+    """
+    order = np.argsort(lows[:, 0], kind="stable")
+    (lows, highs) = (lows[order], highs[order])
+    ends = np.searchsorted(lows[:, 0], highs[:, 0] + tolerance, side="right")
+    counts = ends - np.arange(len(lows)) - 1
+    firsts = np.repeat(np.arange(len(lows)), counts)
+    seconds = (np.arange(counts.sum()) + 1 +
+               np.repeat(np.arange(len(lows)) - (np.cumsum(counts) - counts),
+                         counts))
+    near = np.all((lows[seconds, 1:] <= highs[firsts, 1:] + tolerance) &
+                  (lows[firsts, 1:] <= highs[seconds, 1:] + tolerance),
+                  axis=1)
+    return (order[firsts[near]], order[seconds[near]])
+
+
+def graph(n: int, firsts: np.ndarray, seconds: np.ndarray,
+          costs: np.ndarray) -> Graph:
+    """Return the CSR graph of n nodes with an edge each way for each pair.
+    """
+    tails = np.concatenate([firsts, seconds])
+    heads = np.concatenate([seconds, firsts])
+    costs = np.concatenate([costs, costs])
+    order = np.argsort(tails, kind="stable")
+    indptr = np.searchsorted(tails[order], np.arange(n + 1))
+    return Graph(indptr, heads[order], costs[order])
+
+
+def shortest_paths(graph: Graph, source: int) -> np.ndarray:
+    """Return the least cost of getting from the source to each node.
+
+    This is Dijkstra's algorithm, on plain lists made once from the CSR
+    arrays. Nodes that can't be reached cost infinity.
+    """
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    costs = graph.costs.tolist()
+    best = [float("inf")] * len(graph)
+    best[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        (cost, node) = heapq.heappop(heap)
+        if cost > best[node]:
+            continue
+        for k in range(indptr[node], indptr[node + 1]):
+            further = cost + costs[k]
+            neighbor = indices[k]
+            if further < best[neighbor]:
+                best[neighbor] = further
+                heapq.heappush(heap, (further, neighbor))
+    return np.array(best)
+
+
+def circulation_graph(places: np.ndarray,
+                      centers: np.ndarray,
+                      lows: np.ndarray,
+                      highs: np.ndarray) -> Graph:
+    """Return the graph of the paths: one node per face, an edge between
+    faces that touch, and the seconds it takes to get from the center of
+    one to the center of the other as its cost.
+    """
+    speeds = np.zeros(len(places))
+    for (place, speed) in SPEEDS.items():
+        speeds[places == place.value] = speed
+    (firsts, seconds) = touching(lows, highs)
+    lengths = np.linalg.norm(centers[firsts] - centers[seconds], axis=1)
+    costs = 0.5 * lengths / speeds[firsts] + 0.5 * lengths / speeds[seconds]
+    return graph(len(places), firsts, seconds, costs)
+
+
+def kinematic_fluidity(places: np.ndarray,
+                       centers: np.ndarray,
+                       areas: np.ndarray,
+                       lows: np.ndarray,
+                       highs: np.ndarray,
+                       samples: int=FLUIDITY_SAMPLES) -> float:
+    """Return the Kinematic Fluidity of the paths, in megastokes.
+
+    The paths are the faces of the Places in SPEEDS, given by their Place
+    values, centers, areas, and bounding boxes. Like a diffusion constant,
+    Kinematic Fluidity is how much area a trip covers per second: the
+    square of the distance from start to end, as the crow flies, over the
+    seconds it takes along the paths, on average over trips between every
+    two spots on the paths. The trips are timed from a sample of the
+    faces, chosen by area, to every face that can be reached from them.
+    """
+    paths = np.isin(places, [place.value for place in SPEEDS])
+    (places, centers, areas) = (places[paths], centers[paths], areas[paths])
+    sources = np.count_nonzero(areas > 0)
+    if len(places) < 2 or sources == 0:
+        return 0
+    network = circulation_graph(places, centers, lows[paths], highs[paths])
+    chosen = np.random.default_rng(0).choice(
+        len(places), size=min(samples, sources), replace=False,
+        p=areas / areas.sum())
+    (total, weight) = (0, 0)
+    for source in chosen:
+        seconds = shortest_paths(network, source)
+        trips = np.isfinite(seconds) & (seconds > 0)
+        if trips.any():
+            distances = np.linalg.norm(centers[trips] - centers[source],
+                                       axis=1)
+            total += np.sum(areas[trips] * distances**2 / seconds[trips])
+            weight += areas[trips].sum()
+    if weight == 0:
+        return 0
+    return total / weight * STOKES_PER_SQUARE_FOOT_PER_SECOND / 1e6
@@ -0,0 +1,160 @@
+# cli.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+"""Build one study from the command line, and report on it.
+
+Only plato and the one generator asked for are imported, so a small study
+starts and finishes quickly. Run it with plain Python to build headless,
+or inside Blender to build Blender objects:
+
+    python cli.py manhattan --rows 4 --cols 8 [--glb city.glb]
+    blender --background nym.blend --python cli.py -- manhattan --rows 4
+"""
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+import argparse
+import importlib
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Command(NamedTuple):
+    topic: str             # the study, as named in nym.py
+    module: str
+    generator: str
+    method: str
+    options: Sequence[Tuple[str, str, Any]]  # (option, parameter, default)
+
+
+COMMANDS = {
+    "cottage": Command("Cottage(s)", "cottage", "Cottage", "add_street",
+                       [("count", "count", 12)]),
+    "manhattan": Command("Manhattan New York", "manhattan", "Manhattan",
+                         "add_blocks",
+                         [("rows", "num_rows", 2), ("cols", "num_cols", 4)]),
+    "merlon": Command("Merlon Buildings", "merlon", "Merlon", "add_buildings",
+                      [("rows", "num_rows", 8), ("cols", "num_cols", 8),
+                       ("buildings", "buildings", True)]),
+    "bikeway": Command("Bikeways", "bikeway", "Bikeway", "add_bikeways",
+                       [("rows", "num_rows", 3), ("cols", "num_cols", 3),
+                        ("buildings", "buildings", True)]),
+    "wurster": Command("Wurster Hall(s)", "wurster", "Wurster",
+                       "add_buildings", [("count", "num", 1)]),
+}
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--headless", action="store_true",
+                        help="don't build Blender objects, even in Blender")
+    parser.add_argument("--glb", metavar="PATH",
+                        help="write the study to a GLB file instead")
+    parser.add_argument("--counters", metavar="PATH",
+                        help="write the counts and timings, as JSON or CSV")
+    parser.add_argument("--save", metavar="PATH",
+                        help="save the .blend file when done (Blender only)")
+    parser.add_argument("--at", nargs=2, type=float, default=(0, 0),
+                        metavar=("X0", "Y0"), help="where the study goes")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to build blocks with (0: all cores)")
+    parser.add_argument("--lod", type=int, default=2,
+                        help="level of detail: 0 massing, 1 floors, 2 all")
+    parser.add_argument("--merge-walls", action="store_true",
+                        help="merge the walls of stacked floors")
+    parser.add_argument("--envelope", action="store_true",
+                        help="leave floors hidden inside buildings out")
+    parser.add_argument("--weld", action="store_true",
+                        help="have faces that meet share their vertices")
+    parser.add_argument("--instance", action="store_true",
+                        help="build repeated designs once and place copies")
+    studies = parser.add_subparsers(dest="study", metavar="study")
+    studies.required = True
+    for (name, command) in COMMANDS.items():
+        subparser = studies.add_parser(name, help=command.topic)
+        for (option, parameter, default) in command.options:
+            if isinstance(default, bool):
+                subparser.add_argument("--no-" + option, dest=parameter,
+                                       action="store_false",
+                                       help="leave out the " + option)
+            else:
+                subparser.add_argument("--" + option, dest=parameter,
+                                       type=type(default), default=default,
+                                       metavar=option.upper(),
+                                       help="default: {}".format(default))
+    return parser
+
+
+def _backend(options: argparse.Namespace):
+    """Return the backend asked for, or None for plato's default one."""
+    if options.glb:
+        from glb import GlbBackend
+        return GlbBackend(options.glb)
+    if options.headless:
+        from plato import Backend
+        return Backend()
+    return None
+
+
+def run(options: argparse.Namespace):
+    """Build the study the options ask for, and print its report."""
+    start = time.perf_counter()
+    from plato import Plato
+    command = COMMANDS[options.study]
+    module = importlib.import_module(command.module)
+    loaded = time.perf_counter()
+
+    backend = _backend(options)
+    plato = Plato(lod=options.lod, batch=True, instance=options.instance,
+                  merge_walls=options.merge_walls, envelope=options.envelope,
+                  weld=options.weld, workers=options.workers or None,
+                  backend=backend)
+    plato.delete_study(command.topic)
+    plato.study(command.topic, x0=options.at[0], y0=options.at[1])
+    generator = getattr(module, command.generator)(plato)
+    kwargs = {parameter: getattr(options, parameter)
+              for (option, parameter, default) in command.options}
+    getattr(generator, command.method)(**kwargs)
+    plato.pontificate()
+    if options.glb:
+        backend.close()
+    built = time.perf_counter()
+
+    if options.counters:
+        plato.write_counters(options.counters)
+    if options.save:
+        import bpy
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(options.save))
+    print("")
+    print("  {:,} faces, {:,} vertices".format(len(plato.faces),
+                                              len(plato.faces.verts)))
+    print("  {:.2f}s to import, {:.2f}s to build".format(loaded - start,
+                                                        built - loaded))
+    print("    " + ", ".join("{} {:.2f}s".format(stage, seconds)
+                             for (stage, seconds)
+                             in plato.counters.timings().items()))
+    return plato
+
+
+def main(argv: Sequence[str]):
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    run(_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    # Blender keeps its own options before a "--", and ours after it
+    if "--" in sys.argv:
+        main(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        main(sys.argv[1:])
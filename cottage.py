@@ -12,7 +12,7 @@ from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
 from random import randint
 from importlib import reload
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, yzwh2rect, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, yzwh2rect, nudge
 from compass_facing import CompassFacing as Facing
 from place import Place
 from plato import Plato
@@ -21,48 +21,48 @@ from plato import Plato
 PARCEL_DY = 50
 PARCEL_X0_NORTH = -232.72
 PARCEL_X0_SOUTH = -224.15
-PARCEL = [(PARCEL_X0_SOUTH, 0, 0),
-          (PARCEL_X0_NORTH, PARCEL_DY, 0),
-          (0, PARCEL_DY, 0),
-          (0, 0, 0)]
+PARCEL = Shape([(PARCEL_X0_SOUTH, 0, 0),
+                (PARCEL_X0_NORTH, PARCEL_DY, 0),
+                (0, PARCEL_DY, 0),
+                (0, 0, 0)])
 
 FENCE_HEIGHT = 6
-FENCE_LINE = [(-52, 0, 0),
-              (PARCEL_X0_SOUTH, 0, 0),
-              (PARCEL_X0_NORTH, PARCEL_DY, 0),
-              (0, PARCEL_DY, 0)]
-
-DRIVEWAY = [(-194, 2, 0.01),
-            (-194, 13, 0.01),
-            (-181, 13, 0.01),
-            (-181, 23, 0.01),
-            (-165, 23, 0.01),
-            (-165, 13, 0.01),
-            (-0, 13, 0.01),
-            (-0, 2, 0.01)]
-
-DOORPATH = [(-15.5, 31.75, 0.01),
-            (-0, 31.75, 0.01),
-            (-0, 26.75, 0.01),
-            (-15.5, 26.75, 0.01)]
+FENCE_LINE = Shape([(-52, 0, 0),
+                    (PARCEL_X0_SOUTH, 0, 0),
+                    (PARCEL_X0_NORTH, PARCEL_DY, 0),
+                    (0, PARCEL_DY, 0)])
+
+DRIVEWAY = Shape([(-194, 2, 0.01),
+                  (-194, 13, 0.01),
+                  (-181, 13, 0.01),
+                  (-181, 23, 0.01),
+                  (-165, 23, 0.01),
+                  (-165, 13, 0.01),
+                  (-0, 13, 0.01),
+                  (-0, 2, 0.01)])
+
+DOORPATH = Shape([(-15.5, 31.75, 0.01),
+                  (-0, 31.75, 0.01),
+                  (-0, 26.75, 0.01),
+                  (-15.5, 26.75, 0.01)])
 
 GARAGE_HEIGHT = 8
 GARAGE_SPEC = [((-185, 23, 0), []),
                ((-185, 44, 0), []),
                ((-161, 44, 0), []),
                ((-161, 23, 0), [])]
-GARAGE = [entry[0] for entry in GARAGE_SPEC]
+GARAGE = Shape(entry[0] for entry in GARAGE_SPEC)
 
 ADU_SPEC = [((-154, 23, 0), []),
             ((-154, 44, 0), []),
             ((-124, 44, 0), []),
             ((-124, 23, 0), [])]
-ADU = [entry[0] for entry in ADU_SPEC]
+ADU = Shape(entry[0] for entry in ADU_SPEC)
 
-ADU_DOORPATH = [(-160, 13, 0),
-                (-160, 36, 0),
-                (-155, 36, 0),
-                (-155, 13, 0)]
+ADU_DOORPATH = Shape([(-160, 13, 0),
+                      (-160, 36, 0),
+                      (-155, 36, 0),
+                      (-155, 13, 0)])
 
 # exterior walls (0.5 feet thick), clockwise from the back wall of the house
 KITCHEN_WINDOWS = [yzwh2rect(3.958, 2.583, 5.750, 4.083)]
@@ -89,7 +89,7 @@ HOUSE_SPEC = [((-57.792, 44.542, 0), KITCHEN_WINDOWS),
               ((-41.167, 14.75, 0), []),
               ((-41.167, 16.75, 0), BED_AND_BATH_WINDOWS),
               ((-57.792, 16.75, 0), [])]
-HOUSE = [entry[0] for entry in HOUSE_SPEC]
+HOUSE = Shape(entry[0] for entry in HOUSE_SPEC)
 HOUSE_WINDOWS = [(i, entry[1]) for i, entry in enumerate(HOUSE_SPEC)]
 
 WEST_WINDOWS = [yzwh2rect(1.500, 4.500, 1.750, 2.083),   # half-bath
@@ -101,29 +101,29 @@ ADDON_SPEC = [((-63.75, 43.625, 0), []),
               ((-57.792, 17.833, 0), []),
               ((-63.75, 17.833, 0), WEST_WINDOWS)]
 
-ADDON = [entry[0] for entry in ADDON_SPEC]
+ADDON = Shape(entry[0] for entry in ADDON_SPEC)
 ADDON_WINDOWS = [(i, entry[1]) for i, entry in enumerate(ADDON_SPEC)]
 
-ATTIC = [nudge(HOUSE[0], dx=-1, dy=1),
-         nudge(HOUSE[1], dx=-1, dy=1),
-         nudge(HOUSE[2], dx=-1, dy=1),
-         nudge((HOUSE[4][X], HOUSE[3][Y], 0), dx=1, dy=1),
-         nudge((HOUSE[5][X], HOUSE[6][Y], 0), dx=1, dy=-1),
-         nudge(HOUSE[7], dx=1, dy=-1),
-         nudge(HOUSE[8], dx=1, dy=-1),
-         nudge(HOUSE[9], dx=-1, dy=-1),
-         nudge(HOUSE[10], dx=-1, dy=-1),
-         nudge(HOUSE[11], dx=-1, dy=-1)]
-PORCH = [(-25.792, 32.75, 0),
-         (-25.792 + 5.333, 32.75, 0),
-         (-25.792 + 5.333, 32.75 - 17.083, 0),
-         (-25.792, 32.75 - 17.083, 0)]
+ATTIC = Shape([nudge(HOUSE[0], dx=-1, dy=1),
+               nudge(HOUSE[1], dx=-1, dy=1),
+               nudge(HOUSE[2], dx=-1, dy=1),
+               nudge((HOUSE[4][X], HOUSE[3][Y], 0), dx=1, dy=1),
+               nudge((HOUSE[5][X], HOUSE[6][Y], 0), dx=1, dy=-1),
+               nudge(HOUSE[7], dx=1, dy=-1),
+               nudge(HOUSE[8], dx=1, dy=-1),
+               nudge(HOUSE[9], dx=-1, dy=-1),
+               nudge(HOUSE[10], dx=-1, dy=-1),
+               nudge(HOUSE[11], dx=-1, dy=-1)])
+PORCH = Shape([(-25.792, 32.75, 0),
+               (-25.792 + 5.333, 32.75, 0),
+               (-25.792 + 5.333, 32.75 - 17.083, 0),
+               (-25.792, 32.75 - 17.083, 0)])
 NUM_STAIR_STEPS = 5
 STAIR_X = -25.792 + 5.333 + NUM_STAIR_STEPS
-STAIR = [(STAIR_X, 31.75, 0),
-         (STAIR_X + 1, 31.75, 0),
-         (STAIR_X + 1, 26.75, 0),
-         (STAIR_X, 26.75, 0)]
+STAIR = Shape([(STAIR_X, 31.75, 0),
+               (STAIR_X + 1, 31.75, 0),
+               (STAIR_X + 1, 26.75, 0),
+               (STAIR_X, 26.75, 0)])
 
 D1 = (ATTIC[0][Y] - ATTIC[9][Y]) / 2.0
 PEAK_BACK = (HOUSE[0][X]+D1, HOUSE[0][Y]-D1, D1)
@@ -149,30 +149,30 @@ DORMER_SW = nudge(PEAK_DORMER_INSET, dx=2.5, dy=-2.5, dz=-2.5)
 DORMER_NE = (PEAK_DORMER[X], DORMER_NW[Y], DORMER_NW[Z])
 DORMER_SE = (PEAK_DORMER[X], DORMER_SW[Y], DORMER_SW[Z])
 
-PORCH_ROOF = [[ADDON[0], xy2xyz(ADDON[1], 2), xy2xyz(ADDON[2], 2), ADDON[3]],
-              [xy2xyz(PORCH[0], 2), PORCH[1], PORCH[2], xy2xyz(PORCH[3], 2)]
+PORCH_ROOF = [Shape([ADDON[0], xy2xyz(ADDON[1], 2), xy2xyz(ADDON[2], 2), ADDON[3]]),
+              Shape([xy2xyz(PORCH[0], 2), PORCH[1], PORCH[2], xy2xyz(PORCH[3], 2)])
               ]
 
-ROOF = [[PEAK_BACK, ATTIC[0], ATTIC[9]],
-        [PEAK_NORTH_INSET, PEAK_BACK_INSET, PEAK_BACK, ATTIC[0], ATTIC[1]],
-        [PEAK_NORTH, PEAK_NORTH_INSET, ATTIC[1], ATTIC[2]],
-        [PEAK_FRONT, PEAK_FRONT_INSET, PEAK_NORTH, ATTIC[2], ATTIC[3]],
-        [PEAK_FRONT, ATTIC[3], ATTIC[4]],
-        [PEAK_FRONT_INSET, PEAK_FRONT, ATTIC[4], ATTIC[5]],
-        [PEAK_OFFICE, PEAK_OFFICE_INSET, PEAK_BACK_INSET, PEAK_NORTH_INSET, PEAK_NORTH, PEAK_FRONT_INSET, ATTIC[5], ATTIC[6]],
-        [PEAK_OFFICE, ATTIC[6], ATTIC[7]],
-        [PEAK_OFFICE_INSET, PEAK_OFFICE, ATTIC[7], ATTIC[8]],
-        [PEAK_BACK, PEAK_BACK_INSET, PEAK_OFFICE_INSET, ATTIC[8], ATTIC[9]],
-        [PEAK_DORMER, PEAK_DORMER_INSET, DORMER_NW, DORMER_NE],
-        [PEAK_DORMER_INSET, PEAK_DORMER, DORMER_SE, DORMER_SW]
+ROOF = [Shape([PEAK_BACK, ATTIC[0], ATTIC[9]]),
+        Shape([PEAK_NORTH_INSET, PEAK_BACK_INSET, PEAK_BACK, ATTIC[0], ATTIC[1]]),
+        Shape([PEAK_NORTH, PEAK_NORTH_INSET, ATTIC[1], ATTIC[2]]),
+        Shape([PEAK_FRONT, PEAK_FRONT_INSET, PEAK_NORTH, ATTIC[2], ATTIC[3]]),
+        Shape([PEAK_FRONT, ATTIC[3], ATTIC[4]]),
+        Shape([PEAK_FRONT_INSET, PEAK_FRONT, ATTIC[4], ATTIC[5]]),
+        Shape([PEAK_OFFICE, PEAK_OFFICE_INSET, PEAK_BACK_INSET, PEAK_NORTH_INSET, PEAK_NORTH, PEAK_FRONT_INSET, ATTIC[5], ATTIC[6]]),
+        Shape([PEAK_OFFICE, ATTIC[6], ATTIC[7]]),
+        Shape([PEAK_OFFICE_INSET, PEAK_OFFICE, ATTIC[7], ATTIC[8]]),
+        Shape([PEAK_BACK, PEAK_BACK_INSET, PEAK_OFFICE_INSET, ATTIC[8], ATTIC[9]]),
+        Shape([PEAK_DORMER, PEAK_DORMER_INSET, DORMER_NW, DORMER_NE]),
+        Shape([PEAK_DORMER_INSET, PEAK_DORMER, DORMER_SE, DORMER_SW])
         ]
 
 CHIMNEY_HEIGHT = 16
 CHIMNEY_XYZ = nudge(PEAK_BACK, dx=-1.5, dy=3, dz=-PEAK_BACK[Z])
-CHIMNEY = [CHIMNEY_XYZ,
-           nudge(CHIMNEY_XYZ, dx=0.0, dy=2.95),
-           nudge(CHIMNEY_XYZ, dx=2.1, dy=2.95),
-           nudge(CHIMNEY_XYZ, dx=2.1, dy=0.00)]
+CHIMNEY = Shape([CHIMNEY_XYZ,
+                 nudge(CHIMNEY_XYZ, dx=0.0, dy=2.95),
+                 nudge(CHIMNEY_XYZ, dx=2.1, dy=2.95),
+                 nudge(CHIMNEY_XYZ, dx=2.1, dy=0.00)])
 
 CRAWL_SPACE_HEIGHT = 4
 GROUND_FLOOR_HEIGHT = 11.5
@@ -0,0 +1,128 @@
+# counters.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+import csv
+import json
+import time
+
+import numpy as np
+
+from place import Place
+
+KINDS = ("faces", "verts", "openings", "objects")
+
+
+class Counters:
+    """Counters keeps count of what plato builds, and how long it takes.
+
+    For each study it counts the faces, vertices, openings, and objects of
+    each Place, and adds up the seconds spent in each stage of building,
+    like "add" or "backend". The counts are plain lists indexed by Place
+    value, so that counting costs next to nothing on the hot paths.
+
+    A stage's seconds leave out the stages timed within it, like "backend"
+    within "add", so no second is counted twice, and the stages add up to
+    the time spent in all of them.
+    """
+
+    def __init__(self):
+        self._studies = {}
+        self.counted = 0  # seconds added to any stage, for add_seconds_since()
+        self.study()
+
+    def study(self, topic: str=""):
+        """Start counting afresh for a study."""
+        self._topic = topic
+        self._studies[topic] = ({kind: [0] * (len(Place) + 1)
+                                 for kind in KINDS}, {})
+        (counts, self.seconds) = self._studies[topic]
+        self.faces = counts["faces"]
+        self.verts = counts["verts"]
+        self.openings = counts["openings"]
+        self.objects = counts["objects"]
+        return self
+
+    def add_seconds(self, stage: str, seconds: float):
+        self.seconds[stage] = seconds + self.seconds.get(stage, 0)
+        self.counted += seconds
+        return self
+
+    def add_seconds_since(self, stage: str, start_time: float,
+                          counted: float):
+        """Add the seconds since start_time to a stage, less those added to
+        other stages since then, when self.counted was counted.
+        """
+        seconds = time.perf_counter() - start_time
+        return self.add_seconds(stage, seconds - (self.counted - counted))
+
+    def add_objects(self, places: np.ndarray, copies: int=1):
+        """Count copies of objects holding faces of the given Place values."""
+        for (value, count) in zip(*np.unique(places, return_counts=True)):
+            self.objects[value] += int(count) * copies
+        return self
+
+    def absorb(self, counts: dict, seconds: dict):
+        """Add counts and seconds from another Counters to this study."""
+        for kind in KINDS:
+            for place in Place:
+                getattr(self, kind)[place.value] += counts[kind][place.value]
+        for (stage, more) in seconds.items():
+            self.add_seconds(stage, more)
+        return self
+
+    def current(self) -> Tuple[dict, dict]:
+        """Return this study's (counts, seconds), as absorb() takes them."""
+        return self._studies[self._topic]
+
+    def counts(self, topic: Optional[str]=None) -> dict:
+        """Return {Place name: {kind: count}} for a study, the current one
+        by default, leaving out Places with nothing to count.
+        """
+        (counts, seconds) = self._studies[self._topic if topic is None
+                                          else topic]
+        return {place.name: {kind: counts[kind][place.value]
+                             for kind in KINDS}
+                for place in Place
+                if any(counts[kind][place.value] for kind in KINDS)}
+
+    def timings(self, topic: Optional[str]=None) -> dict:
+        """Return {stage: seconds} for a study, the current one by default."""
+        return dict(self._studies[self._topic if topic is None
+                                  else topic][1])
+
+    def topics(self) -> List[str]:
+        return [topic for (topic, (counts, seconds)) in self._studies.items()
+                if topic or any(any(row) for row in counts.values())]
+
+    def write(self, path: str):
+        """Write every study's counts and timings, as JSON or as CSV.
+
+        A path ending in .csv gets one row per number: topic, kind (like
+        "faces", or "seconds"), Place name or stage, and value. Any other
+        path gets JSON, with the counts and timings nested by topic.
+        """
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["topic", "kind", "name", "value"])
+                for topic in self.topics():
+                    for (name, counts) in self.counts(topic).items():
+                        for kind in KINDS:
+                            writer.writerow([topic, kind, name, counts[kind]])
+                    for (stage, seconds) in self.timings(topic).items():
+                        writer.writerow([topic, "seconds", stage,
+                                         "{:.6f}".format(seconds)])
+        else:
+            with open(path, "w") as file:
+                json.dump({topic: {"counts": self.counts(topic),
+                                   "seconds": self.timings(topic)}
+                           for topic in self.topics()}, file, indent=1)
+        return self
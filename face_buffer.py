@@ -0,0 +1,374 @@
+# face_buffer.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from functools import lru_cache
+
+import numpy as np
+
+from xyz import Num, Xyz
+from place import Place
+from triangulate import triangulate, _signed_area
+
+TRIANGULATION_CACHE_SIZE = 512
+WELD_TOLERANCE = 0.001  # feet: vertices closer than this become one vertex
+SLIVER_WIDTH = 0.0001   # feet: a ring narrower than this on average is a line
+
+
+def _reserve(array: np.ndarray, size: int):
+    """Return the array, or a copy with room for at least size rows."""
+    if size <= len(array):
+        return array
+    capacity = max(size, 2 * len(array))
+    bigger = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    bigger[:len(array)] = array
+    return bigger
+
+
+def _flat_key(xyzs: np.ndarray, normal: np.ndarray) -> bytes:
+    """Return a polygon's (x, y) points in its own plane, as a cache key.
+
+    The x axis runs toward the point farthest from the first, so the key is
+    the same for every copy of the polygon, wherever it is and whichever
+    way it faces.
+    """
+    offsets = xyzs - xyzs[0]
+    lengths = np.linalg.norm(offsets, axis=1)
+    far = int(np.argmax(lengths))
+    x_axis = offsets[far] / max(lengths[far], 1e-12)
+    y_axis = np.cross(normal, x_axis)
+    points = np.stack([offsets @ x_axis, offsets @ y_axis], axis=1)
+    return np.round(points, 6).tobytes()
+
+
+def _split_rings(points: np.ndarray) -> List[List[int]]:
+    """Split a polygon that comes back to its own points into simple rings.
+
+    A wall outline threads each opening in by a bridge there and back, so
+    it passes the ends of each bridge twice. Whenever the walk around the
+    polygon comes back to a point it has been at, the loop since then is
+    cut off as a ring of its own. Rings with next to no area for their
+    length, like the bridges, are dropped. Returns the rings as lists of
+    positions in the polygon, the one with the most area (the outer ring)
+    first.
+    """
+    path = []
+    seen = {}
+    rings = []
+    for (i, point) in enumerate(map(tuple, points)):
+        if point in seen:
+            j = seen[point]
+            rings.append(path[j:])
+            for k in path[j+1:]:
+                del seen[tuple(points[k])]
+            del path[j+1:]
+        else:
+            seen[point] = len(path)
+            path.append(i)
+    rings.append(path)
+    areas = np.array([abs(_signed_area(points[ring])) for ring in rings])
+    perimeters = np.array([np.linalg.norm(points[ring] -
+                                          np.roll(points[ring], -1, axis=0),
+                                          axis=1).sum() for ring in rings])
+    order = np.argsort(areas, kind="stable")[::-1]
+    return [rings[i] for i in order
+            if areas[i] > SLIVER_WIDTH * perimeters[i]]
+
+
+@lru_cache(maxsize=TRIANGULATION_CACHE_SIZE)
+def _cut(key: bytes, n: int) -> np.ndarray:
+    """Return the triangles for a polygon given by a _flat_key().
+
+    A bridged outline, like that of a wall with windows, is split back
+    into its outer ring and holes first, since ear clipping the bridges
+    as if they were edges of a simple polygon cuts the wrong triangles.
+    The triangles index the polygon's own points.
+    """
+    points = np.frombuffer(key).reshape(n, 2)
+    rings = _split_rings(points)
+    if not rings:
+        return np.empty((0, 3), dtype=np.int64)
+    (cut_points, triangles) = triangulate(points[rings[0]],
+                                          [points[ring] for ring in rings[1:]])
+    return np.concatenate(rings)[triangles]
+
+
+def weld_verts(verts: np.ndarray,
+               loops: np.ndarray,
+               tolerance: float=WELD_TOLERANCE):
+    """Merge vertices at the same place, and return (verts, loops) to match.
+
+    Each vertex is snapped to a grid with cells tolerance apart, and the
+    three cell numbers together are its key: vertices with the same key are
+    one vertex, kept at the first of them, and the loops are renumbered to
+    point at it. Faces keep their order, so their Place values still apply.
+    """
+    if len(verts) == 0:
+        return (verts, loops)
+    cells = np.ascontiguousarray(np.floor(verts / tolerance + 0.5),
+                                 dtype=np.int64)
+    keys = cells.view(np.dtype((np.void, cells.itemsize * 3))).ravel()
+    (_, first, inverse) = np.unique(keys, return_index=True,
+                                    return_inverse=True)
+    return (verts[first], inverse.ravel()[loops])
+
+
+class FaceBuffer:
+    """FaceBuffer records polygons in growable NumPy arrays.
+
+    The vertices are rows of one (n, 3) float array. Each face is a run of
+    vertex indices in one flat array of loops, given by its start and size,
+    and each face is tagged with the value of its Place.
+    """
+
+    def __init__(self, capacity: int=1024):
+        self._verts = np.empty((capacity, 3))
+        self._loops = np.empty(capacity, dtype=np.int64)
+        self._starts = np.empty(capacity, dtype=np.int64)
+        self._sizes = np.empty(capacity, dtype=np.int64)
+        self._places = np.empty(capacity, dtype=np.int8)
+        self._num_verts = 0
+        self._num_loops = 0
+        self._num_faces = 0
+
+    def __len__(self):
+        return self._num_faces
+
+    @property
+    def verts(self) -> np.ndarray:
+        return self._verts[:self._num_verts]
+
+    @property
+    def loops(self) -> np.ndarray:
+        return self._loops[:self._num_loops]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._starts[:self._num_faces]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return self._sizes[:self._num_faces]
+
+    @property
+    def places(self) -> np.ndarray:
+        return self._places[:self._num_faces]
+
+    def add_face(self, place: Place, xyzs: Sequence[Xyz]) -> int:
+        """Record a new polygon, and return its face index."""
+        n = len(xyzs)
+        v0 = self._num_verts
+        l0 = self._num_loops
+        f0 = self._num_faces
+        self._verts = _reserve(self._verts, v0 + n)
+        self._loops = _reserve(self._loops, l0 + n)
+        self._starts = _reserve(self._starts, f0 + 1)
+        self._sizes = _reserve(self._sizes, f0 + 1)
+        self._places = _reserve(self._places, f0 + 1)
+        self._verts[v0:v0+n] = xyzs
+        self._loops[l0:l0+n] = np.arange(v0, v0+n)
+        self._starts[f0] = l0
+        self._sizes[f0] = n
+        self._places[f0] = place.value
+        self._num_verts += n
+        self._num_loops += n
+        self._num_faces += 1
+        return f0
+
+    def add_faces(self, place: Place, xyzs: Sequence[Xyz], faces: np.ndarray):
+        """Record polygons that share vertices, and return the first index.
+
+        Each row of faces is a polygon given by indices into xyzs, and all
+        the rows have the same number of sides, like a list of triangles.
+        """
+        (m, n) = faces.shape
+        v0 = self._num_verts
+        l0 = self._num_loops
+        f0 = self._num_faces
+        self._verts = _reserve(self._verts, v0 + len(xyzs))
+        self._loops = _reserve(self._loops, l0 + m * n)
+        self._starts = _reserve(self._starts, f0 + m)
+        self._sizes = _reserve(self._sizes, f0 + m)
+        self._places = _reserve(self._places, f0 + m)
+        self._verts[v0:v0+len(xyzs)] = xyzs
+        self._loops[l0:l0+m*n] = faces.ravel() + v0
+        self._starts[f0:f0+m] = np.arange(l0, l0 + m * n, n)
+        self._sizes[f0:f0+m] = n
+        self._places[f0:f0+m] = place.value
+        self._num_verts += len(xyzs)
+        self._num_loops += m * n
+        self._num_faces += m
+        return f0
+
+    def append(self, other: 'FaceBuffer') -> int:
+        """Record all the faces of another buffer, and return the first index.
+        """
+        v0 = self._num_verts
+        l0 = self._num_loops
+        f0 = self._num_faces
+        self._verts = _reserve(self._verts, v0 + len(other.verts))
+        self._loops = _reserve(self._loops, l0 + len(other.loops))
+        self._starts = _reserve(self._starts, f0 + len(other))
+        self._sizes = _reserve(self._sizes, f0 + len(other))
+        self._places = _reserve(self._places, f0 + len(other))
+        self._verts[v0:v0+len(other.verts)] = other.verts
+        self._loops[l0:l0+len(other.loops)] = other.loops + v0
+        self._starts[f0:f0+len(other)] = other.starts + l0
+        self._sizes[f0:f0+len(other)] = other.sizes
+        self._places[f0:f0+len(other)] = other.places
+        self._num_verts += len(other.verts)
+        self._num_loops += len(other.loops)
+        self._num_faces += len(other)
+        return f0
+
+    def __getstate__(self):
+        """Pickle just the rows in use, not the spare capacity."""
+        return (self.verts, self.loops, self.starts, self.sizes, self.places)
+
+    def __setstate__(self, state):
+        (verts, loops, starts, sizes, places) = state
+        self._verts = verts
+        self._loops = loops
+        self._starts = starts
+        self._sizes = sizes
+        self._places = places
+        self._num_verts = len(verts)
+        self._num_loops = len(loops)
+        self._num_faces = len(starts)
+
+    def centers(self, start: int=0, stop: int=None) -> np.ndarray:
+        """Return the mean of the vertices of each face in [start, stop)."""
+        starts = self.starts[start:stop]
+        sizes = self.sizes[start:stop]
+        if len(starts) == 0:
+            return np.zeros((0, 3))
+        loops = self.loops[starts[0]:starts[-1] + sizes[-1]]
+        sums = np.add.reduceat(self.verts[loops], starts - starts[0], axis=0)
+        return sums / sizes[:, np.newaxis]
+
+    def bounds(self, start: int=0, stop: int=None):
+        """Return (lows, highs): the corners of the box around each face in
+        [start, stop), as rows of xyz.
+        """
+        starts = self.starts[start:stop]
+        sizes = self.sizes[start:stop]
+        if len(starts) == 0:
+            return (np.zeros((0, 3)), np.zeros((0, 3)))
+        loops = self.loops[starts[0]:starts[-1] + sizes[-1]]
+        corners = self.verts[loops]
+        return (np.minimum.reduceat(corners, starts - starts[0], axis=0),
+                np.maximum.reduceat(corners, starts - starts[0], axis=0))
+
+    def faces_of(self, place: Place, start: int=0, stop: int=None):
+        """Return the indices of the faces of a Place, within a range."""
+        places = self.places[start:stop]
+        return np.flatnonzero(places == place.value) + start
+
+    def submesh(self, faces: np.ndarray, weld: bool=False):
+        """Return (verts, loops, starts, sizes) for just the given faces.
+
+        The result is compact: it holds only the vertices those faces use,
+        and its loops index into its own vertex array. With weld=True, faces
+        that meet share their vertices at the corners where they meet.
+        """
+        starts = self.starts[faces]
+        sizes = self.sizes[faces]
+        new_starts = np.cumsum(sizes) - sizes
+        offsets = np.repeat(starts - new_starts, sizes)
+        loop_ids = np.arange(sizes.sum()) + offsets
+        vert_ids, loops = np.unique(self.loops[loop_ids], return_inverse=True)
+        verts = self.verts[vert_ids]
+        if weld:
+            (verts, loops) = weld_verts(verts, loops)
+        return (verts, loops, new_starts, sizes)
+
+    def select(self, faces: np.ndarray) -> 'FaceBuffer':
+        """Return a new buffer of just the given faces, in the given order."""
+        selected = FaceBuffer.__new__(FaceBuffer)
+        selected.__setstate__(self.submesh(faces) + (self.places[faces],))
+        return selected
+
+    def triangles(self, faces: np.ndarray, weld: bool=False):
+        """Return (verts, triangles, places) for the given faces, in triangles.
+
+        Like submesh(), the verts are just the ones those faces use, welded
+        or not. Convex faces are cut into fans all at once; the few that are
+        not (L-shaped floors, walls with openings) are cut up by ear
+        clipping, once for each distinct shape. Each triangle is wound the
+        same way as its face, and has its Place value.
+        """
+        (verts, loops, starts, sizes) = self.submesh(faces, weld)
+        places = self.places[faces]
+        if len(starts) == 0:
+            return (verts, np.empty((0, 3), dtype=np.int64), places)
+        new_starts = np.cumsum(sizes) - sizes
+        ends = new_starts + sizes - 1
+        next_ids = np.arange(len(loops)) + 1
+        next_ids[ends] = new_starts
+        prev_ids = np.arange(len(loops)) - 1
+        prev_ids[new_starts] = ends
+        origins = np.repeat(verts[loops[new_starts]], sizes, axis=0)
+        here = verts[loops] - origins
+        there = verts[loops[next_ids]] - origins
+        normals = np.add.reduceat(np.cross(here, there), new_starts)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        units = normals / np.where(lengths > 0, lengths, 1)
+        back = verts[loops[prev_ids]] - origins
+        turns = np.cross(here - back, there - here)
+        bends = np.einsum("ij,ij->i", turns, np.repeat(units, sizes, axis=0))
+        scale = np.linalg.norm(turns, axis=1)
+        bent_back = np.add.reduceat(bends < -1e-9 * scale, new_starts) > 0
+        convex = ~bent_back
+
+        fan_faces = np.flatnonzero(convex)
+        fans = sizes[fan_faces] - 2
+        fan_of = np.repeat(fan_faces, fans)
+        k = np.arange(fans.sum()) - np.repeat(np.cumsum(fans) - fans, fans)
+        base = new_starts[fan_of]
+        chunks = [np.stack([loops[base], loops[base + k + 1],
+                            loops[base + k + 2]], axis=1)]
+        owners = [fan_of]
+        for f in np.flatnonzero(bent_back):
+            ring = loops[new_starts[f]:new_starts[f] + sizes[f]]
+            cut = _cut(_flat_key(verts[ring], units[f]), len(ring))
+            chunks.append(ring[cut])
+            owners.append(np.full(len(cut), f))
+        triangles = np.concatenate(chunks)
+        return (verts, triangles, places[np.concatenate(owners)])
+
+    def areas(self, start: int=0, stop: int=None) -> np.ndarray:
+        """Return the area of each face in [start, stop), all in one pass.
+
+        This is Newell's method, vectorized: half the length of the sum of
+        the cross products of each vertex and the next one around its face.
+        Each face is first moved so that its first vertex is at the origin,
+        which keeps the sums small and precise far from the origin.
+        """
+        starts = self.starts[start:stop]
+        sizes = self.sizes[start:stop]
+        if len(starts) == 0:
+            return np.zeros(0)
+        new_starts = np.cumsum(sizes) - sizes
+        offsets = np.repeat(starts - new_starts, sizes)
+        loop_ids = np.arange(sizes.sum()) + offsets
+        next_ids = loop_ids + 1
+        ends = new_starts + sizes - 1
+        next_ids[ends] = starts
+        origins = np.repeat(self.verts[self.loops[starts]], sizes, axis=0)
+        here = self.verts[self.loops[loop_ids]] - origins
+        there = self.verts[self.loops[next_ids]] - origins
+        normals = np.add.reduceat(np.cross(here, there), new_starts)
+        return 0.5 * np.linalg.norm(normals, axis=1)
+
+    def square_feet(self, start: int=0, stop: int=None) -> np.ndarray:
+        """Return the total area of faces in [start, stop), by Place value."""
+        areas = self.areas(start, stop)
+        places = self.places[start:stop]
+        return np.bincount(places, weights=areas, minlength=len(Place) + 1)
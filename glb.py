@@ -0,0 +1,305 @@
+# glb.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+import json
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from xyz import Xyz
+from compass_facing import CompassFacing as Facing
+from place import Place
+from face_buffer import FaceBuffer
+from plato import Backend, Occurrence, COLORS_OF_PLACES
+from plato import rotation_matrix, move_home
+
+CHUNK_FACES = 65536  # faces triangulated and written at a time
+COPY_BYTES = 1 << 20
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+JSON_CHUNK = 0x4E4F534A  # "JSON"
+BIN_CHUNK = 0x004E4942  # "BIN\0"
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_INT = 5125
+
+# glTF is Y-up: plato's (x, y, z) is (x, z, -y) in glTF. Lengths stay in
+# feet, one foot to the unit, which is how Blender exported them.
+Y_UP = np.array([(1, 0, 0), (0, 0, -1), (0, 1, 0)], dtype=float)
+
+
+def _material(place: Place):
+    (r, g, b, a) = COLORS_OF_PLACES[place]
+    material = {"name": place.name,
+                "doubleSided": True,
+                "pbrMetallicRoughness": {"baseColorFactor": [r, g, b, a],
+                                         "metallicFactor": 0}}
+    if a < 1:
+        material["alphaMode"] = "BLEND"
+    return material
+
+
+class _Spool:
+    """The vertices and triangles of one Place, written as they come in."""
+
+    def __init__(self):
+        self.points = tempfile.TemporaryFile()
+        self.indices = tempfile.TemporaryFile()
+        self.num_points = 0
+        self.num_indices = 0
+        self.low = np.full(3, np.inf)
+        self.high = np.full(3, -np.inf)
+
+    def write(self, points: np.ndarray, triangles: np.ndarray):
+        used, triangles = np.unique(triangles, return_inverse=True)
+        points = (points[used] @ Y_UP).astype(np.float32)
+        self.points.write(points.tobytes())
+        indices = triangles.ravel() + self.num_points
+        self.indices.write(indices.astype(np.uint32).tobytes())
+        self.num_points += len(points)
+        self.num_indices += len(indices)
+        self.low = np.minimum(self.low, points.min(axis=0))
+        self.high = np.maximum(self.high, points.max(axis=0))
+
+    def close(self):
+        self.points.close()
+        self.indices.close()
+
+
+class GlbWriter:
+    """GlbWriter streams meshes into one binary glTF (GLB) file.
+
+    Geometry goes to a temporary file as it is added, a chunk of faces at a
+    time, so a whole city can be written without holding it all in memory
+    at once. close() writes the GLB: the JSON that describes the scene, and
+    then the buffer, copied over from the temporary file.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._bin = tempfile.TemporaryFile()
+        self._gltf = {"asset": {"generator": "nym3d glb.py",
+                                "version": "2.0"},
+                      "scene": 0,
+                      "scenes": [{"name": "Scene", "nodes": []}],
+                      "nodes": [],
+                      "meshes": [],
+                      "materials": [],
+                      "accessors": [],
+                      "bufferViews": [],
+                      "buffers": [{"byteLength": 0}]}
+        self._materials = {}
+
+    def _material_index(self, place: Place):
+        if place not in self._materials:
+            self._materials[place] = len(self._gltf["materials"])
+            self._gltf["materials"].append(_material(place))
+        return self._materials[place]
+
+    def _buffer_view(self, spooled, target: int):
+        """Copy a spooled file onto the end of the buffer, as a bufferView."""
+        offset = self._bin.tell()
+        spooled.seek(0)
+        shutil.copyfileobj(spooled, self._bin, COPY_BYTES)
+        views = self._gltf["bufferViews"]
+        views.append({"buffer": 0,
+                      "byteOffset": offset,
+                      "byteLength": self._bin.tell() - offset,
+                      "target": target})
+        return len(views) - 1
+
+    def _accessor(self, view: int, component: int, count: int, kind: str,
+                  **bounds):
+        accessors = self._gltf["accessors"]
+        accessors.append(dict({"bufferView": view,
+                               "componentType": component,
+                               "count": count,
+                               "type": kind}, **bounds))
+        return len(accessors) - 1
+
+    def _add_mesh(self, name: str, spools: dict):
+        """Add a mesh with one primitive per Place, and return its index."""
+        primitives = []
+        for place in Place:
+            spool = spools.get(place)
+            if spool is None or spool.num_indices == 0:
+                continue
+            points = self._accessor(
+                self._buffer_view(spool.points, ARRAY_BUFFER),
+                FLOAT, spool.num_points, "VEC3",
+                min=spool.low.tolist(), max=spool.high.tolist())
+            indices = self._accessor(
+                self._buffer_view(spool.indices, ELEMENT_ARRAY_BUFFER),
+                UNSIGNED_INT, spool.num_indices, "SCALAR")
+            primitives.append({"attributes": {"POSITION": points},
+                               "indices": indices,
+                               "material": self._material_index(place)})
+        for spool in spools.values():
+            spool.close()
+        if not primitives:
+            return None
+        meshes = self._gltf["meshes"]
+        meshes.append({"name": name, "primitives": primitives})
+        return len(meshes) - 1
+
+    def _add_node(self, node: dict):
+        nodes = self._gltf["nodes"]
+        nodes.append(node)
+        self._gltf["scenes"][0]["nodes"].append(len(nodes) - 1)
+        return self
+
+    def _spool(self, buffer: FaceBuffer, faces: np.ndarray, spools: dict,
+               move=None, weld: bool=False):
+        for i in range(0, len(faces), CHUNK_FACES):
+            chunk = faces[i:i+CHUNK_FACES]
+            (verts, triangles, places) = buffer.triangles(chunk, weld)
+            if move is not None:
+                verts = move(verts)
+            for place in Place:
+                mine = places == place.value
+                if mine.any():
+                    spool = spools.setdefault(place, _Spool())
+                    spool.write(verts, triangles[mine])
+        return spools
+
+    def add_mesh(self, name: str, buffer: FaceBuffer, faces: np.ndarray,
+                 weld: bool=False):
+        """Add some faces of a buffer as one node, with a mesh of them.
+
+        With weld=True, faces that meet share their vertices.
+        """
+        mesh = self._add_mesh(name, self._spool(buffer, faces, {},
+                                                weld=weld))
+        if mesh is not None:
+            self._add_node({"name": name, "mesh": mesh})
+        return self
+
+    def add_design(self,
+                   name: str,
+                   buffer: FaceBuffer,
+                   occurrences: Sequence[Occurrence],
+                   weld: bool=False):
+        """Add a design as one mesh, with a node for each occurrence of it."""
+        (f0, f1, at, facing) = occurrences[0]
+        spools = self._spool(buffer, np.arange(f0, f1), {},
+                             move=lambda verts: move_home(verts, at, facing),
+                             weld=weld)
+        mesh = self._add_mesh(name, spools)
+        if mesh is None:
+            return self
+        for (f0, f1, at, facing) in occurrences:
+            matrix = np.identity(4)
+            matrix[:3, :3] = Y_UP.T @ rotation_matrix(facing).T @ Y_UP
+            matrix[:3, 3] = np.array(at) @ Y_UP
+            self._add_node({"name": name,
+                            "mesh": mesh,
+                            "matrix": matrix.T.ravel().tolist()})
+        return self
+
+    def close(self):
+        """Write the GLB file, and let go of the temporary buffer."""
+        length = self._bin.tell()
+        self._bin.write(b"\0" * (-length % 4))
+        self._gltf["buffers"][0]["byteLength"] = self._bin.tell()
+        gltf = dict(self._gltf)
+        if not gltf["nodes"]:
+            del gltf["scenes"][0]["nodes"]
+        if not self._bin.tell():
+            del gltf["buffers"]
+        gltf = {key: value for (key, value) in gltf.items() if value != []}
+        text = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+        text += b" " * (-len(text) % 4)
+        size = 12 + 8 + len(text) + 8 + self._bin.tell()
+        with open(self._path, "wb") as glb:
+            glb.write(struct.pack("<III", GLB_MAGIC, 2, size))
+            glb.write(struct.pack("<II", len(text), JSON_CHUNK))
+            glb.write(text)
+            glb.write(struct.pack("<II", self._bin.tell(), BIN_CHUNK))
+            self._bin.seek(0)
+            shutil.copyfileobj(self._bin, glb, COPY_BYTES)
+        self._bin.close()
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GlbBackend(Backend):
+    """GlbBackend writes the faces plato records into a GLB file.
+
+    It needs no Blender. The faces of each topic become a node named for
+    it, with one primitive per Place, and each repeated design becomes one
+    mesh shared by a node for each occurrence. Call close() (or use it in
+    a with statement) once the last study is done, to write the file.
+    """
+
+    triangles = True
+
+    def __init__(self, path: str):
+        self._writer = GlbWriter(path)
+        self._loose = None  # (buffer, topic, [faces]) not yet written
+
+    def consume(self,
+                buffer: FaceBuffer,
+                faces: np.ndarray,
+                *,
+                topic: str="",
+                merge: bool=False):
+        """Hold the faces back, to write with the rest of their topic.
+
+        Batched or not, a topic's faces go into one node, with a primitive
+        per Place, rather than a node and a mesh for every add().
+        """
+        if self._loose and (self._loose[0] is not buffer or
+                            self._loose[1] != topic):
+            self._write_loose()
+        if not self._loose:
+            self._loose = (buffer, topic, [])
+        self._loose[2].append(faces)
+        return self
+
+    def _write_loose(self):
+        if self._loose:
+            (buffer, topic, faces) = self._loose
+            self._writer.add_mesh(topic, buffer, np.concatenate(faces),
+                                  self.weld)
+            self._loose = None
+        return self
+
+    def study(self, topic: str):
+        return self._write_loose()
+
+    def instantiate(self,
+                    buffer: FaceBuffer,
+                    designs: Sequence[Sequence[Occurrence]],
+                    *,
+                    topic: str=""):
+        for i, occurrences in enumerate(designs):
+            name = "{} design {}".format(topic, i)
+            self._writer.add_design(name, buffer, occurrences, self.weld)
+        return self
+
+    def close(self):
+        self._write_loose()
+        self._writer.close()
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
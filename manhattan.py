@@ -12,10 +12,11 @@ from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
 from random import randint
 from importlib import reload
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, yzwh2rect, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, yzwh2rect, nudge
 from compass_facing import CompassFacing as Facing
 from place import Place
 from plato import Plato
+from walls import Facade
 
 # in feet
 BLOCK_DX = 600
@@ -35,37 +36,39 @@ HALF_STREET = 32 / 2
 HALF_AVENUE = 60 / 2
 
 STORY_HEIGHT = 10
-
-BUILDING = [(0, 0, 0),
-            (BUILDING_DX, 0, 0),
-            (BUILDING_DX, BUILDING_DY, 0),
-            (0, BUILDING_DY, 0)]
-INTERSECTION = [(0, 0, 0),
+WINDOWS = Facade(bay=8, sill=3, width=4, height=5)  # fits 9-foot stories
+
+BUILDING = Shape([(0, 0, 0),
+                  (BUILDING_DX, 0, 0),
+                  (BUILDING_DX, BUILDING_DY, 0),
+                  (0, BUILDING_DY, 0)])
+INTERSECTION = Shape([(0, 0, 0),
+                      (HALF_AVENUE, 0, 0),
+                      (HALF_AVENUE, HALF_STREET, 0),
+                      (0, HALF_STREET, 0)])
+STREET = Shape([(0, 0, 0),
+                (BLOCK_DX, 0, 0),
+                (BLOCK_DX, HALF_STREET, 0),
+                (0, HALF_STREET, 0)])
+AVENUE = Shape([(0, 0, 0),
                 (HALF_AVENUE, 0, 0),
-                (HALF_AVENUE, HALF_STREET, 0),
-                (0, HALF_STREET, 0)]
-STREET = [(0, 0, 0),
-          (BLOCK_DX, 0, 0),
-          (BLOCK_DX, HALF_STREET, 0),
-          (0, HALF_STREET, 0)]
-AVENUE = [(0, 0, 0),
-          (HALF_AVENUE, 0, 0),
-          (HALF_AVENUE, BLOCK_DY, 0),
-          (0, BLOCK_DY, 0)]
-SIDEWALK_FOR_STREET = [(0, 0, 0),
-                       (BLOCK_DX, 0, 0),
-                       (BLOCK_DX, SIDEWALK_WIDTH_STREETS, 0),
-                       (0, SIDEWALK_WIDTH_STREETS, 0)]
-SIDEWALK_FOR_AVENUE = [(0, 0, 0),
-                       (0, BLOCK_DY, 0),
-                       (SIDEWALK_WIDTH_AVENUES, BLOCK_DY, 0),
-                       (SIDEWALK_WIDTH_AVENUES, 0, 0)]
-BLOCK = [(0, 0, 0),
-         (BLOCK_DX, 0, 0),
-         (BLOCK_DX, BLOCK_DY, 0),
-         (0, BLOCK_DY, 0)]
+                (HALF_AVENUE, BLOCK_DY, 0),
+                (0, BLOCK_DY, 0)])
+SIDEWALK_FOR_STREET = Shape([(0, 0, 0),
+                             (BLOCK_DX, 0, 0),
+                             (BLOCK_DX, SIDEWALK_WIDTH_STREETS, 0),
+                             (0, SIDEWALK_WIDTH_STREETS, 0)])
+SIDEWALK_FOR_AVENUE = Shape([(0, 0, 0),
+                             (0, BLOCK_DY, 0),
+                             (SIDEWALK_WIDTH_AVENUES, BLOCK_DY, 0),
+                             (SIDEWALK_WIDTH_AVENUES, 0, 0)])
+BLOCK = Shape([(0, 0, 0),
+               (BLOCK_DX, 0, 0),
+               (BLOCK_DX, BLOCK_DY, 0),
+               (0, BLOCK_DY, 0)])
 REPEAT_DX = BLOCK_DX + AVENUE_WIDTH + (SIDEWALK_WIDTH_AVENUES * 2)
 REPEAT_DY = BLOCK_DY + STREET_WIDTH + (SIDEWALK_WIDTH_STREETS * 2)
+TILE_GRID = (REPEAT_DX, REPEAT_DY, 0, 0)  # one block per tile, for tiles.py
 
 
 class Manhattan:
@@ -84,21 +87,23 @@ class Manhattan:
                   dx: Num=0,
                   dy: Num=0,
                   wall: Num=0,
-                  openings: Sequence[Tuple]=[]):
+                  openings: Sequence[Tuple]=[],
+                  facade: Optional[Facade]=None):
         self._plato.goto(x=x+dx, y=y+dy, z=z)
-        self._plato.add_place(place=place, shape=shape, wall=wall, openings=openings)
+        self._plato.add_place(place=place, shape=shape, wall=wall, openings=openings, facade=facade)
 
-    def add_building_at(self, x: Num=0, y: Num=0):
+    def add_building_at(self, x: Num=0, y: Num=0, windows: bool=True):
         # print("  NYC building: {:,.0f}, {:,.0f}".format(x, y))
+        facade = WINDOWS if windows else None
         self.add_place(Place.PARCEL, shape=BUILDING, x=x, y=y, z=0)
         num_floors = randint(4, 60)
         story_height = randint(9, 12)
         for i in range(num_floors):
             z = i * story_height
-            self.add_place(Place.ROOM, shape=BUILDING, x=x, y=y, z=z, wall=story_height, openings=[])
+            self.add_place(Place.ROOM, shape=BUILDING, x=x, y=y, z=z, wall=story_height, facade=facade)
         self.add_place(Place.ROOF, shape=BUILDING, x=x, y=y, z=z+story_height)
 
-    def add_block(self, row: Num=0, col: Num=0):
+    def add_block(self, row: Num=0, col: Num=0, windows: bool=True):
         x = row * REPEAT_DX
         y = col * REPEAT_DY
 
@@ -108,7 +113,7 @@ class Manhattan:
                 y0 = HALF_STREET + SIDEWALK_WIDTH_STREETS + y
                 dx = bx * BUILDING_DX
                 dy = by * BUILDING_DY
-                self.add_building_at(dx + x0, dy + y0)
+                self.add_building_at(dx + x0, dy + y0, windows)
 
         self.add_place(Place.STREET, shape=STREET, x=x, y=y, dx=HALF_AVENUE+SIDEWALK_WIDTH_AVENUES)
         self.add_place(Place.STREET, shape=STREET, x=x, y=y, dx=HALF_AVENUE+SIDEWALK_WIDTH_AVENUES, dy=HALF_STREET+(SIDEWALK_WIDTH_STREETS*2)+BLOCK_DY)
@@ -127,8 +132,9 @@ class Manhattan:
 
         return self
 
-    def add_blocks(self, num_rows: int=2, num_cols: int=2):
-        for row in range(num_rows):
-            for col in range(num_cols):
-                self.add_block(row, col)
+    def add_blocks(self, num_rows: int=2, num_cols: int=2,
+                   windows: bool=True):
+        blocks = [(row, col)
+                  for row in range(num_rows) for col in range(num_cols)]
+        self._plato.add_blocks(self, "add_block", blocks, windows=windows)
         return self
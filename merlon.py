@@ -12,7 +12,7 @@ from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
 from random import randint
 from importlib import reload
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, yzwh2rect, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, yzwh2rect, nudge
 from compass_facing import CompassFacing as Facing
 from place import Place
 from plato import Plato
@@ -31,32 +31,35 @@ RAMP_HEIGHT = 2.5
 TOWER_WIDTH = RAMP_LENGTH + 12
 LANDING_WIDTH = RAMP_WIDTH + TOWER_WIDTH - RAMP_LENGTH
 TOWER_SPACING = TOWER_WIDTH + RAMP_WIDTH
+# one tower per tile, for tiles.py
+TILE_GRID = (TOWER_SPACING, TOWER_SPACING,
+             -TOWER_SPACING/2, -TOWER_SPACING/2)
 
 D1 = LANDING_WIDTH/2.0
 D2 = RAMP_WIDTH/2.0
-RAMP = [(+D2, D1, 0),
-        (+D2, D1 + RAMP_LENGTH, RAMP_HEIGHT),
-        (-D2, D1 + RAMP_LENGTH, RAMP_HEIGHT),
-        (-D2, D1, 0)]
-OCTAGONAL_LANDING = [(-D1, -D2, 0),
-                     (-D2, -D1, 0),
-                     (+D2, -D1, 0),
-                     (+D1, -D2, 0),
-                     (+D1, +D2, 0),
-                     (+D2, +D1, 0),
-                     (-D2, +D1, 0),
-                     (-D1, +D2, 0)]
-DIAMOND_CENTER = [(-3, 0, 0),
-                  (0, +3, 0),
-                  (+3, 0, 0),
-                  (0, -3, 0)]
-BASEMENT = [(D1, 0, 0),
-            (D1, D2, 0),
-            (D2, D1, 0),
-            (0, D1, 0),
-            (0, 2 * D1 + RAMP_LENGTH, 0),
-            (2 * D1 + RAMP_LENGTH, 2 * D1 + RAMP_LENGTH, 0),
-            (2 * D1 + RAMP_LENGTH, 0, 0)]
+RAMP = Shape([(+D2, D1, 0),
+              (+D2, D1 + RAMP_LENGTH, RAMP_HEIGHT),
+              (-D2, D1 + RAMP_LENGTH, RAMP_HEIGHT),
+              (-D2, D1, 0)])
+OCTAGONAL_LANDING = Shape([(-D1, -D2, 0),
+                           (-D2, -D1, 0),
+                           (+D2, -D1, 0),
+                           (+D1, -D2, 0),
+                           (+D1, +D2, 0),
+                           (+D2, +D1, 0),
+                           (-D2, +D1, 0),
+                           (-D1, +D2, 0)])
+DIAMOND_CENTER = Shape([(-3, 0, 0),
+                        (0, +3, 0),
+                        (+3, 0, 0),
+                        (0, -3, 0)])
+BASEMENT = Shape([(D1, 0, 0),
+                  (D1, D2, 0),
+                  (D2, D1, 0),
+                  (0, D1, 0),
+                  (0, 2 * D1 + RAMP_LENGTH, 0),
+                  (2 * D1 + RAMP_LENGTH, 2 * D1 + RAMP_LENGTH, 0),
+                  (2 * D1 + RAMP_LENGTH, 0, 0)])
 APARTMENT_WIDTH = D1 + RAMP_LENGTH + (D1+D2)/2
 
 DOOR_HEIGHT = 6 + 8/12
@@ -81,16 +84,16 @@ APARTMENT_SPEC = [((D1, D2, 0), DOORS),
                   ((D1 + RAMP_LENGTH + (D1+D2)/2, D1 + RAMP_LENGTH, 0), WINDOWS),
                   ((D1 + RAMP_LENGTH + (D1+D2)/2, D1, 0), []),
                   ((D1 + RAMP_LENGTH, D2, 0), WINDOWS)]
-APARTMENT = [entry[0] for entry in APARTMENT_SPEC]
+APARTMENT = Shape(entry[0] for entry in APARTMENT_SPEC)
 APARTMENT_WINDOWS = [(i, entry[1]) for i, entry in enumerate(APARTMENT_SPEC)]
-ATTIC = [nudge(APARTMENT[0], dx=-1.2, dy=-2),
-         nudge(APARTMENT[1], dx=-2, dy=-1.2),
-         nudge(APARTMENT[2], dx=-2, dy=1.2),
-         nudge(APARTMENT[3], dx=-1.2, dy=2),
-         nudge(APARTMENT[4], dx=1.2, dy=2),
-         nudge(APARTMENT[5], dx=2, dy=1.2),
-         nudge(APARTMENT[6], dx=2, dy=-1.2),
-         nudge(APARTMENT[7], dx=1.2, dy=-2)]
+ATTIC = Shape([nudge(APARTMENT[0], dx=-1.2, dy=-2),
+               nudge(APARTMENT[1], dx=-2, dy=-1.2),
+               nudge(APARTMENT[2], dx=-2, dy=1.2),
+               nudge(APARTMENT[3], dx=-1.2, dy=2),
+               nudge(APARTMENT[4], dx=1.2, dy=2),
+               nudge(APARTMENT[5], dx=2, dy=1.2),
+               nudge(APARTMENT[6], dx=2, dy=-1.2),
+               nudge(APARTMENT[7], dx=1.2, dy=-2)])
 
 
 def _get_cloverleaf_landing_pattern():
@@ -280,15 +283,26 @@ class Merlon:
 
     def add_buildings(self, num_rows: int=2, num_cols: int=2, buildings: bool=True):
         """Tell plato about all of our landings, ramps, rooms, and roofs."""
-        for i, row in enumerate(_get_landing_pattern(num_rows, num_cols)):
-            for j, grid_cell in enumerate(row):
-                x = i * TOWER_SPACING
-                y = j * TOWER_SPACING
-                for landing_spec in grid_cell:
-                    z = landing_spec[0]
-                    ramp_bearings = landing_spec[1]
-                    _add_features_at_landing(self._plato,
-                                             ramp_bearings,
-                                             at=(x, y, z),
-                                             buildings=buildings)
+        pattern = _get_landing_pattern(num_rows, num_cols)
+        towers = [(i, j, grid_cell)
+                  for i, row in enumerate(pattern)
+                  for j, grid_cell in enumerate(row)]
+        self._plato.add_blocks(self, "add_tower", towers, buildings=buildings)
+        return self
+
+    def add_tower(self,
+                  i: int,
+                  j: int,
+                  landings: Iterable[Landing],
+                  buildings: bool=True):
+        """Tell plato about the landings in one cell of the grid, and so on."""
+        x = i * TOWER_SPACING
+        y = j * TOWER_SPACING
+        for landing_spec in landings:
+            z = landing_spec[0]
+            ramp_bearings = landing_spec[1]
+            _add_features_at_landing(self._plato,
+                                     ramp_bearings,
+                                     at=(x, y, z),
+                                     buildings=buildings)
         return self
@@ -8,15 +8,43 @@
 #
 # Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
 
-import bpy
-import bmesh  # for creating Blender mesh objects
-
 from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, nudge, polygon_area
 from compass_facing import CompassFacing as Facing
 from place import Place
+from face_buffer import FaceBuffer
+from spatial_index import GridIndex
+from circulation import kinematic_fluidity
+from counters import Counters
+from walls import Facade, wall_template, wall_triangles, facade_grid
+from walls import frame_matrix
+
+# Data types
+Occurrence = Tuple[int, int, Xyz, Facing]  # (first face, stop, at, facing)
+
+# Levels of detail
+LOD_MASSING = 0  # one extruded box per building, and the ground around it
+LOD_FLOORS = 1   # floors and plain walls
+LOD_DETAIL = 2   # windows, doors, roofs, stair steps, and other nuance
+
+GROUND_PLACES = {Place.STREET, Place.BIKEPATH, Place.WALKWAY, Place.PARCEL,
+                 Place.CANAL}
+CIRCULATION = (Place.STREET, Place.BIKEPATH, Place.WALKWAY)
+
+PROXIMITY_RADIUS = 1320  # feet: a quarter mile, about a five-minute walk
+PROXIMITY_CELLS = 16     # cells of the floor grid per radius
+METERS_PER_FOOT = 0.3048
+SURVEY_CACHE_SIZE = 4096  # shapes, walls, and spots that surveys remember
 
 WHITE = (1, 1, 1, 1)  # opaque white
 RED = (0.8, 0, 0, 1)  # opaque red
@@ -72,12 +100,28 @@ def rotate(xyz, facing: Facing):
         raise Exception("bad compass facing in plato.rotate(): " + str(facing.value))
 
 
-def _material_by_place(place: Place):
-    material = bpy.data.materials.get(place.name)
-    if material is None:
-        material = bpy.data.materials.new(name=place.name)
-        material.diffuse_color = COLORS_OF_PLACES[place]
-    return material
+_ROTATIONS = {}  # matrix for each facing, to rotate rows of xyz
+
+
+def rotation_matrix(facing: Facing):
+    """Return the matrix that does rotate() to each row of an xyz array."""
+    matrix = _ROTATIONS.get(facing)
+    if matrix is None:
+        matrix = np.array([rotate((1, 0, 0), facing),
+                           rotate((0, 1, 0), facing),
+                           rotate((0, 0, 1), facing)], dtype=float)
+        _ROTATIONS[facing] = matrix
+    return matrix
+
+
+def move_home(verts: np.ndarray, at: Xyz, facing: Facing):
+    """Move rows of xyz from where they are back to where they were designed.
+
+    This undoes goto(): it subtracts the offset, and then undoes the
+    rotation by rotating each vertex to face the other way around.
+    """
+    back = Facing((360 - facing.value) % 360)
+    return (verts - np.array(at)) @ rotation_matrix(back)
 
 
 def _printXyz(xyz: Xyz):
@@ -85,41 +129,526 @@ def _printXyz(xyz: Xyz):
     print("   xyz: ({:,.2f}, {:,.2f}, {:,.2f})".format(x, y, z))
 
 
-def _xyzFromDotOnEdge(length: Num, height: Num, edge: Tuple[Xyz]):
-    (x0, y0, z0) = edge[0]
-    (x1, y1, z1) = edge[1]
-    x_span = x1 - x0
-    y_span = y1 - y0
-    edge_length = math.sqrt(x_span**2 + y_span**2)
+def _shape_key(shape: Sequence[Xyz]):
+    if isinstance(shape, Shape):
+        return shape
+    return tuple(map(tuple, shape))
+
+
+def _openings_key(openings: Sequence[Sequence[Xyz]]):
+    return tuple(map(_shape_key, openings))
+
+
+def _wall_openings_key(openings: Sequence[Tuple]):
+    return tuple((i, _openings_key(windows)) for (i, windows) in openings)
+
+
+@lru_cache(maxsize=SURVEY_CACHE_SIZE)
+def _area(shape: Sequence[Xyz], openings: Tuple):
+    if openings:
+        return wall_template(shape, openings)[0].area
+    if isinstance(shape, Shape):
+        return shape.area
+    return polygon_area(shape)
+
+
+def _shape_area(shape: Sequence[Xyz], openings: Sequence[Sequence[Xyz]]=[]):
+    """Return the area of a shape less its openings, from a cache."""
+    return _area(_shape_key(shape), _openings_key(openings))
+
+
+@lru_cache(maxsize=SURVEY_CACHE_SIZE)
+def _walls_area(shape: Sequence[Xyz],
+                height: Num,
+                openings: Tuple,
+                cap: bool,
+                facade: Optional[Facade],
+                stories: int):
+    """Return the area of all the walls around a shape, from a cache."""
+    return sum(facade_grid(wall, stories, facade)[0].area
+               if _has_facade(wall, windows, facade)
+               else _shape_area(wall, windows)
+               for (wall, windows) in _walls(shape, height, openings, cap))
+
+
+@lru_cache(maxsize=SURVEY_CACHE_SIZE)
+def _spot(shape: Sequence[Xyz], facing: Facing) -> np.ndarray:
+    xyzs = np.asarray(shape, dtype=float) @ rotation_matrix(facing)
+    spot = np.concatenate([xyzs.mean(axis=0), xyzs.min(axis=0),
+                           xyzs.max(axis=0)])
+    spot.setflags(write=False)
+    return spot
+
+
+def _shape_spot(shape: Sequence[Xyz], facing: Facing) -> np.ndarray:
+    """Return the mean of the points of a shape turned to face a way, and
+    the low and high corners of the box around them, from a cache.
+    """
+    return _spot(_shape_key(shape), facing)
 
-    # (d_edge, dz) = dot
-    dx = length * x_span / edge_length
-    dy = length * y_span / edge_length
-    return (x0+dx, y0+dy, z0+height)
+
+def proximity(places: np.ndarray,
+              xys: np.ndarray,
+              areas: np.ndarray,
+              radius: Num=PROXIMITY_RADIUS) -> float:
+    """Return the Proximity of a study, in square meters per meter.
+
+    Proximity is how much ROOM floor area is within a radius (as the crow
+    flies) of a spot on the streets, bikepaths, and walkways, on average
+    over all of their area, per meter of the radius. Each face is taken to
+    be at its center: places are the Place values of the faces, xys the
+    (x, y) of their centers, and areas their square feet. The floors go
+    in a GridIndex with cells a sixteenth of the radius across, and each
+    spot adds up the floor area in the disk of cells around it, so the
+    work stays the same for each spot however many floors are near it.
+    """
+    floors = places == Place.ROOM.value
+    spots = np.isin(places, [place.value for place in CIRCULATION])
+    if not (floors.any() and areas[spots].sum() > 0):
+        return 0
+    index = GridIndex(xys[floors], radius / PROXIMITY_CELLS, areas[floors])
+    reachable = index.sums_within(xys[spots], radius, exact=False)
+    square_feet = np.average(reachable, weights=areas[spots])
+    return square_feet * METERS_PER_FOOT / radius
+
+
+def _has_facade(wall: Sequence[Xyz],
+                windows: Sequence,
+                facade: Optional[Facade]):
+    """Does a wall get a facade: one with no openings, on level ground?"""
+    return facade is not None and not windows and wall[0][Z] == wall[1][Z]
+
+
+def _is_level(shape: Sequence[Xyz]):
+    return all(xyz[Z] == shape[0][Z] for xyz in shape)
+
+
+def _shows(lod: int, place: Place, nuance: bool):
+    """Does a face of this Place belong in a model at this level of detail?"""
+    if lod >= LOD_DETAIL:
+        return True
+    if nuance:
+        return False
+    return lod == LOD_FLOORS or place in GROUND_PLACES
+
+
+def _counts(lod: int, nuance: bool):
+    """Does a face count in the report at this level of detail? Every Place
+    does, built or not, but nuance faces only count in full detail."""
+    return lod >= LOD_DETAIL or not nuance
+
+
+def _walls(shape: Sequence[Xyz],
+           height: Num,
+           openings: Sequence[Tuple],
+           cap: bool):
+    """Yield a (wall, windows) pair for each wall around a shape."""
+    for i, xyz in enumerate(shape):
+        windows = []
+        for opening in openings:
+            if opening[0] == i:
+                windows = opening[1]
+        if cap or i+1 < len(shape):
+            next = i+1 if i+1 < len(shape) else 0
+            wall = [xyz,
+                    shape[next],
+                    nudge(shape[next], dz=height),
+                    nudge(xyz, dz=height)]
+            yield (wall, windows)
+
+
+class Backend:
+    """A Backend consumes the faces that plato records.
+
+    This base Backend is headless: it builds nothing, and leaves the faces
+    in plato's FaceBuffer, where they can be read without Blender.
+    """
+
+    triangles = False  # True if walls with openings must come in triangles
+    counters = None    # the Counters of the Plato using this, if any
+    weld = False       # True to have faces that meet share their vertices
+
+    def consume(self,
+                buffer: FaceBuffer,
+                faces: np.ndarray,
+                *,
+                topic: str="",
+                merge: bool=False):
+        """Build the given faces of the buffer, merged by Place or not."""
+        return self
+
+    def instantiate(self,
+                    buffer: FaceBuffer,
+                    designs: Sequence[Sequence[Occurrence]],
+                    *,
+                    topic: str=""):
+        """Build each design once, and place a copy at each occurrence.
+
+        The faces of the first occurrence of a design, moved back from
+        where that occurrence is and how it faces, give the shared shape.
+        """
+        return self
+
+    def study(self, topic: str):
+        """Start a new study: whatever is built next belongs to it."""
+        return self
+
+    def delete_all_objects(self):
+        return self
+
+    def delete_study(self, topic: str):
+        """Delete whatever was built for one study, and nothing else."""
+        return self
+
+    def hide_study(self, topic: str, hide: bool=True):
+        """Hide a study from view, or show it again."""
+        return self
+
+    def add_cubes(self, number_of_cubes: int=1):
+        return self
+
+
+def _add_blocks_apart(settings: dict,
+                      generator_class: type,
+                      method: str,
+                      blocks: Sequence[Tuple],
+                      seeds: Sequence[str],
+                      kwargs: dict):
+    """Build some blocks in a worker process, and return what plato recorded.
+    """
+    plato = Plato(backend=Backend(), **settings["options"])
+    plato.study(settings["topic"], x0=settings["x0"], y0=settings["y0"])
+    generator = generator_class(plato)
+    for (block, seed) in zip(blocks, seeds):
+        random.seed(seed)
+        getattr(generator, method)(*block, **kwargs)
+    return plato._recorded()
+
+
+def _pool_context():
+    """Fork where we can, so workers start with everything already imported.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def default_backend() -> Backend:
+    """Build into Blender when running inside Blender, else stay headless."""
+    try:
+        from blender_backend import BlenderBackend
+    except ImportError:
+        return Backend()
+    return BlenderBackend()
 
 
 class Plato:
     """Plato can envision 3D architectural spaces, with walls, floors, etc."""
 
-    def __init__(self, hurry: bool=False):
+    def __init__(self,
+                 hurry: bool=False,
+                 lod: Union[int, Sequence[int]]=LOD_DETAIL,
+                 batch: bool=False,
+                 survey: bool=False,
+                 instance: bool=False,
+                 triangulate: bool=False,
+                 merge_walls: bool=False,
+                 envelope: bool=False,
+                 weld: bool=False,
+                 workers: Optional[int]=1,
+                 backend: Optional[Backend]=None):
         """Sets plato's initial mental state."""
         self._x = 0
         self._y = 0
         self._z = 0
         self._facing = Facing.NORTH
-        self.hurry(hurry)
+        self._topic = ""
+        self._faces = FaceBuffer()
+        self._emitted = 0
+        self._tallied = 0
+        self._occurrences = {}
+        self._coarse = {}
+        self._masses = {}
+        self._stacks = {}
+        self._slabs = {}
+        self._tops = {}
+        self._hidden = []
+        self._backend = default_backend() if backend is None else backend
+        self._counters = Counters()
+        self._backend.counters = self._counters
+        self.lod(LOD_FLOORS if hurry else lod)
+        self.batch(batch)
+        self.survey(survey)
+        self.instance(instance)
+        self.triangulate(triangulate or self._backend.triangles)
+        self.merge_walls(merge_walls)
+        self.envelope(envelope)
+        self.weld(weld)
+        self.parallel(workers)
         self.study()
 
     def hurry(self, hurry: bool=False):
-        self._hurry = hurry
+        """Skip the details: the same as lod(LOD_FLOORS), or lod(LOD_DETAIL).
+        """
+        return self.lod(LOD_FLOORS if hurry else LOD_DETAIL)
+
+    def lod(self, lod: Union[int, Sequence[int]]=LOD_DETAIL):
+        """Set the level of detail, or several levels to record at once.
+
+        LOD_MASSING records just a massing box for each building (the walls
+        of each walled add_place() stacked up, with a roof on top) and the
+        ground places. LOD_FLOORS records floors, walls and roofs, without
+        openings or nuance faces. LOD_DETAIL records everything. The report
+        tallies every Place at any level, whether or not it gets built.
+
+        Given several levels, plato records each of them in the same pass,
+        each in its own FaceBuffer. plato.faces holds the finest one, and
+        faces_at() the others; the backend gets each level as its own topic.
+        """
+        self._emit(merge=True)
+        levels = sorted(set([lod] if isinstance(lod, int) else lod))
+        self._lod = levels[-1]
+        self._coarse = {level: [FaceBuffer(), 0] for level in levels[:-1]}
+        return self
+
+    def batch(self, batch: bool=True):
+        """Collect faces into one mesh per Place, instead of one per face.
+
+        In batch mode the backend is handed the faces of a study all at once,
+        when pontificate() or study() closes the topic, so that it can build
+        a single object (with that Place's material) for each Place.
+        """
+        self._emit(merge=True)
+        self._batch = batch
+        return self
+
+    def survey(self, survey: bool=True):
+        """Only tally floor area, without recording any geometry.
+
+        In survey mode the generators make all the same calls, but each
+        add() just looks up the area of its shape in a cache, so that
+        pontificate() can report on a whole city in a moment.
+        """
+        self._survey = survey
+        return self
+
+    def instance(self, instance: bool=True):
+        """Share one mesh among all the copies of each repeated design.
+
+        With instancing on, each add_place() call is a design: its place,
+        shape, wall height and openings. Designs that occur more than once
+        in a study are handed to the backend to build once and then place
+        many times, instead of being merged with the other faces.
+        """
+        self._emit(merge=True)
+        self._instance = instance
+        return self
+
+    def triangulate(self, triangulate: bool=True):
+        """Cut walls with openings into triangles, instead of one n-gon.
+
+        Without this, each opening is threaded into its wall's polygon by a
+        zero-width bridge, and whatever renders or exports that polygon has
+        to triangulate it again. With this, each wall template is cut into
+        clean triangles once, and every repeat of it reuses them.
+        """
+        self._triangulate = triangulate
+        return self
+
+    def merge_walls(self, merge: bool=True):
+        """Stack the plain walls of floors with the same footprint into one.
+
+        The walls of a walled add_place() with no openings wait to see if
+        the floor above or below has the same footprint, and floors that
+        stack up share one set of tall walls. So a 60-story tower gets 4
+        walls, not 240, and the same square footage of wall either way.
+        In instance mode each floor keeps its own walls, as part of its
+        design.
+        """
+        self._merge_walls = merge
+        return self
+
+    def envelope(self, envelope: bool=True):
+        """Leave out the floors that can't be seen from outside a building.
+
+        In envelope mode, a floor walled all around, with no openings and no
+        facade of windows, that has another floor or a roof of the same
+        footprint right on top of its walls is hidden inside its building,
+        and a floor that lies on an earlier face of the same footprint, like
+        a ground floor on its parcel, is hidden by that face. Hidden floors
+        are still recorded, and still count in the report, but they are not
+        handed to the backend. The faces of each study are held until the
+        end, as in batch mode, so that a floor can be hidden by the ones
+        that come after it.
+        """
+        self._emit(merge=True)
+        self._envelope = envelope
         return self
 
+    def weld(self, weld: bool=True):
+        """Have the backend weld the vertices of the faces it is handed.
+
+        Plato records each face with vertices of its own, so a corner where
+        a floor meets two walls is there three times over. With this, the
+        backend merges vertices at the same place within each batch of
+        faces it builds or writes, so faces that meet share their corners.
+        The faces in plato.faces are left as they are.
+        """
+        self._backend.weld = weld
+        return self
+
+    def parallel(self, workers: Optional[int]=None):
+        """Build the blocks of add_blocks() in this many worker processes.
+
+        With workers=None, use all the cores; with workers=1, build the
+        blocks one after another, in this process.
+        """
+        self._workers = os.cpu_count() if workers is None else workers
+        return self
+
+    @property
+    def faces(self) -> FaceBuffer:
+        """The faces recorded so far for the current study."""
+        return self._faces
+
+    @property
+    def counters(self) -> Counters:
+        """Counts of the faces, vertices, etc. built, and the time it took."""
+        return self._counters
+
+    def write_counters(self, path: str):
+        """Write the counters of every study so far, as JSON or CSV.
+
+        Like the *_stats.txt reports: plato.write_counters("x_counters.json")
+        """
+        self._counters.write(path)
+        return self
+
+    def faces_at(self, lod: int) -> FaceBuffer:
+        """The faces recorded so far at one of the levels of detail."""
+        if lod == self._lod:
+            return self._faces
+        return self._coarse[lod][0]
+
     def study(self, topic: str="", x0: Num=0, y0: Num=0):
+        self._emit(merge=True)
+        self._backend.study(topic)
+        self._counters.study(topic)
         self._topic = topic
+        self._faces = FaceBuffer()
+        self._emitted = 0
+        self._tallied = 0
+        self._occurrences = {}
+        self._coarse = {level: [FaceBuffer(), 0] for level in self._coarse}
+        self._masses = {}
+        self._stacks = {}
+        self._slabs = {}
+        self._tops = {}
+        self._hidden = []
+        self._spots = []
         self._square_feet = {}
         self._x0 = x0
         self._y0 = y0
 
+    def add_blocks(self,
+                   generator: Any,
+                   method: str,
+                   blocks: Sequence[Tuple],
+                   **kwargs):
+        """Call generator.method(*block, **kwargs) for each of the blocks.
+
+        Each block gets its own seed for the random module, so that it comes
+        out the same whether the blocks are built here, one after another,
+        or split across worker processes. Each worker builds a contiguous
+        run of blocks with a Plato of its own, and their faces are added to
+        this study in order, so either way the study comes out the same.
+        Survey mode is quick enough that it always builds here.
+        """
+        base = random.getrandbits(32)
+        seeds = ["{}:{}".format(base, i) for i in range(len(blocks))]
+        workers = min(self._workers, len(blocks))
+        if workers <= 1 or self._survey:
+            for (block, seed) in zip(blocks, seeds):
+                random.seed(seed)
+                getattr(generator, method)(*block, **kwargs)
+        else:
+            settings = {"options": self._options(),
+                        "topic": self._topic,
+                        "x0": self._x0,
+                        "y0": self._y0}
+            runs = [range(len(blocks) * i // workers,
+                          len(blocks) * (i + 1) // workers)
+                    for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=_pool_context()) as pool:
+                results = [pool.submit(_add_blocks_apart,
+                                       settings,
+                                       type(generator),
+                                       method,
+                                       [blocks[i] for i in run],
+                                       [seeds[i] for i in run],
+                                       kwargs)
+                           for run in runs]
+                for result in results:
+                    self._absorb(result.result())
+        random.seed("{}:end".format(base))
+        return self
+
+    def _options(self):
+        """The settings a worker's Plato needs to record what this one would.
+        """
+        return {"lod": list(self._coarse) + [self._lod],
+                "batch": True,
+                "instance": self._instance,
+                "triangulate": self._triangulate,
+                "merge_walls": self._merge_walls,
+                "envelope": self._envelope,
+                "workers": 1}
+
+    def _recorded(self):
+        """Everything recorded in this study, for _absorb() to take in."""
+        return {"faces": self._faces,
+                "coarse": {level: buffer for (level, (buffer, emitted))
+                           in self._coarse.items()},
+                "square_feet": self._square_feet,
+                "spots": self._spots,
+                "occurrences": self._occurrences,
+                "masses": self._masses,
+                "stacks": self._stacks,
+                "envelope": (self._slabs, self._tops, self._hidden),
+                "counters": self._counters.current(),
+                "at": (self._x, self._y, self._z, self._facing)}
+
+    def _absorb(self, recorded: dict):
+        """Add what another Plato recorded to the end of this study."""
+        offset = self._faces.append(recorded["faces"])
+        for (level, buffer) in recorded["coarse"].items():
+            self._coarse[level][0].append(buffer)
+        for (place, area) in recorded["square_feet"].items():
+            self._add_square_feet(place, area)
+        self._spots += recorded["spots"]
+        for (key, occurrences) in recorded["occurrences"].items():
+            self._occurrences.setdefault(key, []).extend(
+                (f0 + offset, f1 + offset, at, facing)
+                for (f0, f1, at, facing) in occurrences)
+        for (footprint, (low, high)) in recorded["masses"].items():
+            (low0, high0) = self._masses.get(footprint, (low, high))
+            self._masses[footprint] = (min(low, low0), max(high, high0))
+        for (key, (low, high)) in recorded["stacks"].items():
+            self._restack(key, low, high)
+        (slabs, tops, hidden) = recorded["envelope"]
+        for (key, (f0, f1)) in slabs.items():
+            self._add_slab(key, f0 + offset, f1 + offset)
+        for (key, floors) in tops.items():
+            for (f0, f1) in floors:
+                self._add_top(key, f0 + offset, f1 + offset)
+        self._hidden += [(f0 + offset, f1 + offset) for (f0, f1) in hidden]
+        self._counters.absorb(*recorded["counters"])
+        (self._x, self._y, self._z, self._facing) = recorded["at"]
+        if not (self._batch or self._instance or self._envelope):
+            self._emit(merge=False)
+        return self
+
     def goto(self, *, x: Num=0, y: Num=0, z: Num=0, facing: Facing=Facing.NORTH):
         self._x = self._x0 + x
         self._y = self._y0 + y
@@ -130,43 +659,291 @@ class Plato:
 
     def delete_all_objects(self):
         """Try to delete everything in the Blender scene."""
+        self._backend.delete_all_objects()
+        return self
 
-        if bpy.context.active_object:
-            mode = bpy.context.active_object.mode
-            # print("mode: " + mode)
-            if (mode == 'EDIT'):
-                bpy.ops.object.mode_set(mode='OBJECT')
-                mode = bpy.context.active_object.mode
-                print("new mode: " + mode)
-                # print("SELECT and delete FACE")
-                # bpy.ops.mesh.select_all(action='SELECT')
-                # bpy.ops.mesh.delete(type='FACE')
-            if (mode == 'OBJECT'):
-                bpy.ops.object.select_all(action='SELECT')
-                bpy.ops.object.delete(use_global=False)
-        else:
-            print("mode: There is no active_object")
+    def delete_study(self, topic: str):
+        """Delete the objects built for one study, leaving the others."""
+        self._backend.delete_study(topic)
+        return self
+
+    def hide_study(self, topic: str, hide: bool=True):
+        """Hide the objects built for one study, or show them again."""
+        self._backend.hide_study(topic, hide)
         return self
 
     def _begin_face(self):
-        self._bmesh = bmesh.new()
+        self._face_xyzs = []
+
+    def _end_face(self, place: Place, buffer: FaceBuffer):
+        if buffer is self._faces:
+            self._square_feet.setdefault(place, 0)
+            self._counters.faces[place.value] += 1
+            self._counters.verts[place.value] += len(self._face_xyzs)
+        return buffer.add_face(place, self._face_xyzs)
+
+    def _add_faces(self,
+                   place: Place,
+                   xyzs: np.ndarray,
+                   faces: np.ndarray,
+                   buffer: FaceBuffer):
+        if buffer is self._faces:
+            self._square_feet.setdefault(place, 0)
+            self._counters.faces[place.value] += len(faces)
+            self._counters.verts[place.value] += len(xyzs)
+        return buffer.add_faces(place, xyzs, faces)
+
+    def _to_world(self, local: np.ndarray, frame):
+        """Move rows of (along, across, up) in a wall's frame to world xyz."""
+        xyzs = local @ frame_matrix(frame) + frame[0]
+        at = (self._x, self._y, self._z)
+        return xyzs @ rotation_matrix(self._facing) + at
+
+    def _add_square_feet(self, place: Place, area: Num):
+        self._square_feet[place] = area + self._square_feet.get(place, 0)
+        return self
+
+    def _add_spot(self, place: Place, shape: Sequence[Xyz], area: Num):
+        """Note where a survey's floor or circulation face is, and its box.
+        """
+        at = (self._x, self._y, self._z) * 3
+        spot = _shape_spot(shape, self._facing) + at
+        self._spots.append((place.value, area) + tuple(spot))
+        return self
+
+    def _spots_table(self):
+        """Return (places, centers, areas, lows, highs) of the floors and
+        circulation of the study so far, for the metrics to work from.
+        """
+        spots = np.array(self._spots, dtype=float).reshape(-1, 11)
+        surveyed = (spots[:, 0].astype(np.int8), spots[:, 2:5], spots[:, 1],
+                    spots[:, 5:8], spots[:, 8:11])
+        if self._survey:
+            return surveyed
+        places = self._faces.places
+        faces = self._faces.select(np.flatnonzero(
+            np.isin(places, [place.value for place in CIRCULATION]) |
+            (places == Place.ROOM.value)))
+        built = (faces.places, faces.centers(), faces.areas()) + faces.bounds()
+        return tuple(np.concatenate(pair) for pair in zip(built, surveyed))
+
+    def _tally(self):
+        """Add the areas of the faces recorded since the last tally."""
+        if self._tallied < len(self._faces):
+            totals = self._faces.square_feet(self._tallied)
+            for place in self._square_feet:
+                self._square_feet[place] += totals[place.value]
+            self._tallied = len(self._faces)
+        return self
+
+    def _topic_at(self, lod: int):
+        if not self._coarse:
+            return self._topic
+        return "{} LOD{}".format(self._topic, lod)
+
+    def _massing(self):
+        """Is plato building massing boxes, at any level of detail?"""
+        if self._survey:
+            return False
+        return self._lod == LOD_MASSING or LOD_MASSING in self._coarse
+
+    def _footprint(self, shape: Sequence[Xyz]):
+        """Return the (x, y) corners of a shape where it is in the world."""
+        at = (self._x, self._y, self._z)
+        return tuple((round(x, 6), round(y, 6)) for (x, y, z) in
+                     (nudge(rotate(xyz, self._facing), dxyz=at)
+                      for xyz in shape))
+
+    def _add_mass(self, shape: Sequence[Xyz], height: Num):
+        """Stack a walled floor onto the massing box for its footprint."""
+        footprint = self._footprint(shape)
+        low = min(xyz[Z] for xyz in shape) + self._z
+        high = max(xyz[Z] for xyz in shape) + self._z + height
+        (low0, high0) = self._masses.get(footprint, (low, high))
+        self._masses[footprint] = (min(low, low0), max(high, high0))
+        return self
+
+    def _close_masses(self):
+        """Record a box, with walls and a roof, for each massing footprint.
+
+        The boxes stand in for the walls and roofs the report has already
+        tallied, so they are left out of it.
+        """
+        if not self._masses:
+            return self
+        if self._lod == LOD_MASSING:
+            self._tally()
+            buffer = self._faces
+        else:
+            buffer = self._coarse[LOD_MASSING][0]
+        for (footprint, (low, high)) in self._masses.items():
+            base = [(x, y, low) for (x, y) in footprint]
+            top = [(x, y, high) for (x, y) in footprint]
+            for (wall, windows) in _walls(base, high - low, [], True):
+                self._face_xyzs = wall
+                self._end_face(Place.WALL, buffer)
+            self._face_xyzs = top
+            self._end_face(Place.ROOF, buffer)
+        if buffer is self._faces:
+            self._tallied = len(self._faces)
+        self._masses = {}
+        return self
+
+    def _consume(self,
+                 buffer: FaceBuffer,
+                 faces: np.ndarray,
+                 topic: str,
+                 merge: bool):
+        """Hand faces to the backend, counting the objects it makes of them."""
+        places = buffer.places[faces]
+        self._counters.add_objects(np.unique(places) if merge else places)
+        (start_time, counted) = (time.perf_counter(), self._counters.counted)
+        self._backend.consume(buffer, faces, topic=topic, merge=merge)
+        self._counters.add_seconds_since("backend", start_time, counted)
+
+    def _stack_walls(self,
+                     shape: Sequence[Xyz],
+                     height: Num,
+                     nuance: bool,
+                     facade: Optional[Facade]):
+        """Set aside the walls of a floor, to merge with the floors around it.
+        """
+        if _counts(self._lod, nuance):
+            self._square_feet.setdefault(Place.WALL, 0)  # report it in order
+        low = round(shape[0][Z] + self._z, 6)
+        story = height if facade else None  # a facade's stories must match
+        key = (self._footprint(shape), nuance, facade, story)
+        self._restack(key, low, round(low + height, 6))
+        return self
+
+    def _restack(self, key: Tuple, low: Num, high: Num):
+        """Add walls from low to high to the stack for a footprint.
+
+        Walls that meet the stack, above or below, make it taller. Walls
+        that don't mean the stack is done, and they start a new one.
+        """
+        stack = self._stacks.pop(key, None)
+        if stack is not None:
+            (low0, high0) = stack
+            if low == high0 or high == low0:
+                (low, high) = (min(low, low0), max(high, high0))
+            else:
+                self._add_stack(key, low0, high0)
+        self._stacks[key] = (low, high)
+        return self
+
+    def _add_stack(self, key: Tuple, low: Num, high: Num):
+        """Add one set of walls, from low to high, around a footprint."""
+        (footprint, nuance, facade, story) = key
+        at = (self._x, self._y, self._z, self._facing)
+        (self._x, self._y, self._z, self._facing) = (0, 0, 0, Facing.NORTH)
+        self.add_wall(shape=[(x, y, low) for (x, y) in footprint],
+                      height=high - low,
+                      nuance=nuance,
+                      facade=facade,
+                      stories=round((high - low) / story) if facade else 1)
+        (self._x, self._y, self._z, self._facing) = at
+        return self
+
+    def _close_stacks(self):
+        """Add the walls of every stack that is still set aside."""
+        stacks = self._stacks
+        self._stacks = {}
+        for (key, (low, high)) in stacks.items():
+            self._add_stack(key, low, high)
+        return self
+
+    def _cover(self, shape: Sequence[Xyz], wall: Num, sealed: bool,
+               f0: int, f1: int):
+        """Work out which floors the new faces f0 to f1 hide, or are hidden by.
+
+        A floor whose walls have openings, or a facade of windows, can be
+        seen through them, so it is never hidden by what covers its walls.
+        """
+        footprint = self._footprint(shape)
+        z = round(shape[0][Z] + self._z, 6)
+        self._add_slab((footprint, z), f0, f1)
+        if wall != 0 and sealed:
+            self._add_top((footprint, round(z + wall, 6)), f0, f1)
+        return self
+
+    def _add_slab(self, key: Tuple, f0: int, f1: int):
+        """Record a floor, hiding it if it lies on an earlier one."""
+        if key in self._slabs:
+            self._hidden.append((f0, f1))
+        else:
+            self._slabs[key] = (f0, f1)
+        self._hidden += self._tops.pop(key, [])
+        return self
+
+    def _add_top(self, key: Tuple, f0: int, f1: int):
+        """Record where the walls of a floor stop, to see if it gets covered.
+        """
+        if key in self._slabs:
+            self._hidden.append((f0, f1))
+        else:
+            self._tops.setdefault(key, []).append((f0, f1))
+        return self
 
-    def _end_face(self):
-        return self._bmesh.faces.new(self._bmesh.verts)
+    def _emit(self, merge: bool):
+        """Hand the faces recorded since the last call to the backend.
 
-    def _new_bpy_object_for_face(self):
-        self._bmesh.normal_update()
-        my_mesh = bpy.data.meshes.new("")
-        self._bmesh.to_mesh(my_mesh)
-        self._bmesh.free()
-        obj = bpy.data.objects.new("", my_mesh)
-        return obj
+        The faces of coarser levels of detail are handed over only when
+        merging, at the end of a study, each level as a topic of its own.
+        """
+        if merge:
+            self._close_stacks()
+            self._close_masses()
+            for (level, entry) in self._coarse.items():
+                (buffer, emitted) = entry
+                if emitted < len(buffer):
+                    faces = np.arange(emitted, len(buffer))
+                    self._consume(buffer, faces, self._topic_at(level),
+                                  merge=True)
+                    entry[1] = len(buffer)
+        start = self._emitted
+        stop = len(self._faces)
+        if start < stop:
+            hidden = np.zeros(stop - start, dtype=bool)
+            for (f0, f1) in self._hidden:
+                hidden[max(f0-start, 0):max(f1-start, 0)] = True
+            # An occurrence with hidden faces is not a copy of its design
+            designs = []
+            for occurrences in self._occurrences.values():
+                shown = [(f0, f1, at, facing)
+                         for (f0, f1, at, facing) in occurrences
+                         if not hidden[f0-start:f1-start].any()]
+                if len(shown) > 1:
+                    designs.append(shown)
+            loose = ~hidden
+            for occurrences in designs:
+                for (f0, f1, at, facing) in occurrences:
+                    loose[f0-start:f1-start] = False
+            faces = np.arange(start, stop)[loose]
+            if len(faces):
+                self._consume(self._faces, faces, self._topic_at(self._lod),
+                              merge=merge)
+            if designs:
+                for occurrences in designs:
+                    (f0, f1, at, facing) = occurrences[0]
+                    places = np.unique(self._faces.places[f0:f1])
+                    self._counters.add_objects(places, len(occurrences))
+                (start_time, counted) = (time.perf_counter(),
+                                         self._counters.counted)
+                self._backend.instantiate(self._faces, designs,
+                                          topic=self._topic_at(self._lod))
+                self._counters.add_seconds_since("backend", start_time,
+                                                 counted)
+            self._emitted = stop
+            self._hidden = []
+        self._occurrences = {}
+        return self
 
     def _new_vert(self, xyz: Xyz):
         xyz = rotate(xyz, self._facing)
         dxyz = (self._x, self._y, self._z)
         xyz = nudge(xyz, dxyz=dxyz)
-        self._bmesh.verts.new(xyz)
+        self._face_xyzs.append(xyz)
 
     def add(self,
             place: Place,
@@ -175,45 +952,77 @@ class Plato:
             openings: Sequence[Sequence[Xyz]]=[],
             nuance: bool=False,
             flip: bool=False):
-        """Add a new mesh to the blender scene."""
+        """Add a new polygon to the study, and to the scene."""
+
+        (start_time, counted) = (time.perf_counter(), self._counters.counted)
+        if (openings and self._lod == LOD_DETAIL and
+                _shows(self._lod, place, nuance)):
+            self._counters.openings[place.value] += len(openings)
+        if self._survey or not _shows(self._lod, place, nuance):
+            if _counts(self._lod, nuance):
+                self._survey_face(place, shape, openings)
+        if not self._survey:
+            for (level, buffer) in self._levels():
+                self._add_at(level, buffer, place, shape, openings, nuance)
+
+            if not (self._batch or self._instance or self._envelope):
+                self._emit(merge=False)
+        self._counters.add_seconds_since("add", start_time, counted)
+        return self
+
+    def _survey_face(self,
+                     place: Place,
+                     shape: Sequence[Xyz],
+                     openings: Sequence[Sequence[Xyz]]):
+        """Tally a polygon that is surveyed, or not built at this level."""
+        if self._lod < LOD_DETAIL:
+            openings = []
+        area = _shape_area(shape, openings)
+        self._add_square_feet(place, area)
+        if place == Place.ROOM or place in CIRCULATION:
+            self._add_spot(place, shape, area)
+        return self
+
+    def _levels(self):
+        """Return (level of detail, FaceBuffer) for each level, finest last.
+        """
+        return ([(level, buffer)
+                 for (level, (buffer, emitted)) in self._coarse.items()] +
+                [(self._lod, self._faces)])
 
-        if nuance and self._hurry:
+    def _add_at(self,
+                lod: int,
+                buffer: FaceBuffer,
+                place: Place,
+                shape: Sequence[Xyz],
+                openings: Sequence[Sequence[Xyz]],
+                nuance: bool):
+        """Record a polygon into the FaceBuffer for one level of detail."""
+        if not _shows(lod, place, nuance):
             return self
-        at = (self._x, self._y, self._z)
         self._begin_face()
-        if self._hurry or len(openings) == 0:
-            for xyz in shape:
-                self._new_vert(xyz)
-            face = self._end_face()
-        else:
-            edge = (shape[0], shape[1])
-            self._new_vert(shape[0])
-            for i, opening in enumerate(openings):
-                opening = opening.copy()
-                opening.reverse()
-                opening = opening[-1:] + opening[:-1]  # rotate: last to first
-                (length, height) = opening[0]
-                base_point = _xyzFromDotOnEdge(length, shape[0][Z], edge)
-                self._new_vert(base_point)
-                for qz in opening:
-                    (length, height) = qz
-                    xyz = _xyzFromDotOnEdge(length, height, edge)
+        if lod < LOD_DETAIL or len(openings) == 0:
+            start_time = time.perf_counter()
+            if isinstance(shape, Shape):
+                turn = rotation_matrix(self._facing)
+                at = (self._x, self._y, self._z)
+                self._face_xyzs = shape.array @ turn + at
+            else:
+                for xyz in shape:
                     self._new_vert(xyz)
-                (length, height) = opening[0]
-                xyz = _xyzFromDotOnEdge(length, height, edge)
-                self._new_vert(xyz)
-                self._new_vert(base_point)
-            for xyz in shape:
-                self._new_vert(xyz)
-            face = self._end_face()
-
-        area = face.calc_area()
-        self._square_feet[place] = area + self._square_feet.get(place, 0)
-
-        obj = self._new_bpy_object_for_face()
-        obj.data.materials.append(_material_by_place(place))
-        scene = bpy.context.scene
-        scene.collection.objects.link(obj)
+            self._counters.add_seconds("_new_vert",
+                                       time.perf_counter() - start_time)
+            self._end_face(place, buffer)
+        else:
+            if self._triangulate:
+                (triangles, frame) = wall_triangles(shape, openings)
+            if self._triangulate and triangles is not None:
+                verts = self._to_world(triangles.verts, frame)
+                self._add_faces(place, verts, triangles.triangles, buffer)
+            else:
+                (template, frame) = wall_template(shape, openings)
+                self._face_xyzs = self._to_world(template.outline, frame)
+                self._end_face(place, buffer)
         return self
 
     def add_place(self,
@@ -223,10 +1032,29 @@ class Plato:
                   nuance: bool=False,
                   flip: bool=False,
                   wall: Num=0,
-                  openings: Sequence[Tuple]=[]):
+                  openings: Sequence[Tuple]=[],
+                  facade: Optional[Facade]=None):
+        f0 = len(self._faces)
         self.add(place=place, shape=shape, nuance=nuance, flip=flip)
+        if self._envelope and not self._survey and _is_level(shape):
+            self._cover(shape, wall, not (openings or facade), f0,
+                        len(self._faces))
         if wall != 0:
-            self.add_wall(shape=shape, height=wall, openings=openings, nuance=nuance)
+            if (self._merge_walls and _is_level(shape) and
+                    not (openings or self._survey or self._instance)):
+                self._stack_walls(shape, wall, nuance, facade)
+            else:
+                self.add_wall(shape=shape, height=wall, openings=openings,
+                              nuance=nuance, facade=facade)
+            if not nuance and self._massing():
+                self._add_mass(shape, wall)
+        f1 = len(self._faces)
+        if self._instance and f0 < f1:
+            key = (place, _shape_key(shape), wall,
+                   _wall_openings_key(openings), facade, nuance, self._lod)
+            at = (self._x, self._y, self._z)
+            self._occurrences.setdefault(key, []).append(
+                (f0, f1, at, self._facing))
         return self
 
     def add_wall(self,
@@ -235,24 +1063,71 @@ class Plato:
                  height: Num=10,
                  openings: Sequence[Tuple]=[],
                  nuance: bool=False,
-                 cap: bool=True):
-        for i, xyz in enumerate(shape):
-            windows = []
-            for opening in openings:
-                if opening[0] == i:
-                    windows = opening[1]
-            if cap or i+1 < len(shape):
-                next = i+1 if i+1 < len(shape) else 0
-                wall = [xyz,
-                        shape[next],
-                        nudge(shape[next], dz=height),
-                        nudge(xyz, dz=height)]
-                self.add(Place.WALL, shape=wall, nuance=nuance, openings=windows)
+                 cap: bool=True,
+                 facade: Optional[Facade]=None,
+                 stories: int=1):
+        """Add walls around a shape, with openings, or windows in a Facade.
+
+        A Facade puts a grid of windows in each wall that has no openings
+        of its own, with the height split into that many stories.
+        """
+        if self._survey:
+            return self._survey_wall(shape, height, openings, nuance, cap,
+                                     facade, stories)
+        for (wall, windows) in _walls(shape, height, openings, cap):
+            if _has_facade(wall, windows, facade):
+                self._add_facade(wall, facade, stories, nuance)
+            else:
+                self.add(Place.WALL, shape=wall, nuance=nuance,
+                         openings=windows)
+        return self
+
+    def _add_facade(self,
+                    wall: Sequence[Xyz],
+                    facade: Facade,
+                    stories: int,
+                    nuance: bool):
+        """Add a wall with a grid of windows, or a plain one if less detailed.
+        """
+        (start_time, counted) = (time.perf_counter(), self._counters.counted)
+        (grid, frame) = facade_grid(wall, stories, facade)
+        if self._lod == LOD_DETAIL and _shows(self._lod, Place.WALL, nuance):
+            self._counters.openings[Place.WALL.value] += grid.windows
+        if (_counts(self._lod, nuance) and
+                not _shows(self._lod, Place.WALL, nuance)):
+            self._survey_face(Place.WALL, wall, [])
+        for (level, buffer) in self._levels():
+            if level < LOD_DETAIL:
+                self._add_at(level, buffer, Place.WALL, wall, [], nuance)
+            elif _shows(level, Place.WALL, nuance):
+                verts = self._to_world(grid.verts, frame)
+                self._add_faces(Place.WALL, verts, grid.quads, buffer)
+        if not (self._batch or self._instance or self._envelope):
+            self._emit(merge=False)
+        self._counters.add_seconds_since("add", start_time, counted)
         return self
 
+    def _survey_wall(self,
+                     shape: Sequence[Xyz],
+                     height: Num,
+                     openings: Sequence[Tuple],
+                     nuance: bool,
+                     cap: bool,
+                     facade: Optional[Facade],
+                     stories: int):
+        if not _counts(self._lod, nuance) or len(shape) < 2:
+            return self
+        if self._lod < LOD_DETAIL:
+            (openings, facade) = ([], None)
+        area = _walls_area(_shape_key(shape), height,
+                           _wall_openings_key(openings), cap, facade, stories)
+        return self._add_square_feet(Place.WALL, area)
+
     def pontificate(self):
         """Print a report of square footage of rooms, walkways, etc."""
 
+        self._emit(merge=True)
+        self._tally()
         print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
         print("")
         print(str(self._topic) + " floor area")
@@ -271,21 +1146,16 @@ class Plato:
             print("  Parcel FAR:   {:,.2f} floor area ratio".format(parcel_far))
             print("  Citywide FAR: {:,.2f} floor area ratio".format(urban_far))
 
-        proximity = 0
-        megastokes = 0
-        print("  Proximity: {:,.2f} ??? square-meters per meter".format(proximity))
-        print("  Kinematic Fluidity: {:,.2f} ??? megaStokes (MSt)".format(megastokes))
+        (places, centers, areas, lows, highs) = self._spots_table()
+        print("  Proximity: {:,.2f} square-meters per meter".format(
+            proximity(places, centers[:, :2], areas)))
+        print("  Kinematic Fluidity: {:,.2f} megaStokes (MSt)".format(
+            kinematic_fluidity(places, centers, areas, lows, highs)))
         print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
         return self
 
     def add_cubes(self, number_of_cubes: int=1):
         """Create N new cubes at random locations, with different orientations.
         """
-        for i in range(number_of_cubes):
-            x = randint(-10, 20)
-            y = randint(-10, 20)
-            z = randint(-10, 20)
-            bpy.ops.mesh.primitive_cube_add(location=(x, y, z), size=4)
-            radians = i*(3.14/(4*number_of_cubes))
-            bpy.ops.transform.rotate(orient_axis='Z', value=radians)
+        self._backend.add_cubes(number_of_cubes)
         return self
@@ -0,0 +1,184 @@
+# rebuild.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+import ast
+import hashlib
+import importlib
+import os
+import sys
+import time
+
+from xyz import Num
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_FINGERPRINTS = {}  # fingerprint of each study as last built, by topic
+_MODULE_HASHES = {}  # hash of each module file as last loaded, by name
+
+
+class Study(NamedTuple):
+    """A study to build: where it goes, and which generator call builds it.
+
+    The generator is named, rather than passed in, so that it can be found
+    again in its module after the module is reloaded.
+    """
+    topic: str
+    x0: Num
+    y0: Num
+    module: str
+    generator: str
+    method: str
+    args: Tuple = ()
+    kwargs: dict = {}
+
+
+def _path(module: str):
+    return os.path.join(HERE, module + ".py")
+
+
+def _file_hash(module: str):
+    with open(_path(module), "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _local_imports(module: str):
+    """Return the names of the modules in this folder that a module imports.
+    """
+    with open(_path(module)) as file:
+        tree = ast.parse(file.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.add(node.module)
+    return {name for name in names if os.path.exists(_path(name))}
+
+
+def dependencies(module: str) -> List[str]:
+    """Return a module and all the local modules it needs, needed ones first.
+    """
+    order = []
+    seen = set()
+
+    def visit(name: str):
+        if name not in seen:
+            seen.add(name)
+            for imported in sorted(_local_imports(name)):
+                visit(imported)
+            order.append(name)
+    visit(module)
+    return order
+
+
+def fingerprint(study: Study) -> str:
+    """Return a hash of a study's parameters and of every file it depends on.
+    """
+    digest = hashlib.sha1(repr(study).encode("utf-8"))
+    for module in dependencies(study.module):
+        digest.update(module.encode("utf-8"))
+        digest.update(_file_hash(module).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _reload_changed(modules: Sequence[str]):
+    """Reload the loaded modules whose files have changed since loading,
+    and the loaded modules that import them, directly or through others.
+
+    A module that did "from walls import Wall" still holds the old Wall
+    after walls is reloaded, so it has to be reloaded too, after walls.
+    The modules are given needed ones first, as dependencies() lists them,
+    and are reloaded in that order, all at once for every study, so that
+    each study's modules see the others' changes. Modules that were
+    loaded before this one was are reloaded once, since there is no
+    telling what file they came from. Modules that are not loaded yet are
+    left for the build to import.
+    """
+    imports = {module: _local_imports(module) for module in modules}
+    stale = {module for module in modules if module in sys.modules and
+             _MODULE_HASHES.get(module) != _file_hash(module)}
+    while True:
+        importers = {module for module in modules
+                     if imports[module] & stale} - stale
+        if not importers:
+            break
+        stale |= importers
+    reloaded = []
+    for module in modules:
+        if module in stale and module in sys.modules:
+            importlib.reload(sys.modules[module])
+            _MODULE_HASHES[module] = _file_hash(module)
+            reloaded.append(module)
+    # In an import cycle, like plato's late import of blender_backend, one
+    # of the modules comes before a module it imports, so it goes again
+    for (i, module) in enumerate(reloaded):
+        if imports[module] & set(reloaded[i+1:]):
+            importlib.reload(sys.modules[module])
+
+
+def _remember(modules: Iterable[str]):
+    for module in modules:
+        if module in sys.modules and module not in _MODULE_HASHES:
+            _MODULE_HASHES[module] = _file_hash(module)
+
+
+def rebuild(studies: Sequence[Study], *, force: bool=False) -> List[str]:
+    """Build just the studies whose files or parameters have changed.
+
+    Each study that needs building has its old objects deleted first, and
+    the objects of every other study are left alone. Studies that are no
+    longer in the list are deleted. Returns the topics that were built.
+    """
+    modules = []
+    for study in studies:
+        modules += [module for module in dependencies(study.module)
+                    if module not in modules]
+    _reload_changed(modules)
+    needed = []
+    for study in studies:
+        if force or _FINGERPRINTS.get(study.topic) != fingerprint(study):
+            needed.append(study)
+
+    topics = {study.topic for study in studies}
+    dropped = [topic for topic in _FINGERPRINTS if topic not in topics]
+    if not (needed or dropped):
+        return []
+
+    Plato = importlib.import_module("plato").Plato
+    plato = Plato(batch=True, merge_walls=True)
+    for topic in dropped:
+        plato.delete_study(topic)
+        del _FINGERPRINTS[topic]
+    for study in studies:
+        if study not in needed:
+            print("  {}: unchanged".format(study.topic))
+            continue
+        plato.delete_study(study.topic)
+        plato.study(study.topic, x0=study.x0, y0=study.y0)
+        module = importlib.import_module(study.module)
+        generator = getattr(module, study.generator)(plato)
+        getattr(generator, study.method)(*study.args, **study.kwargs)
+        plato.pontificate()
+        _remember(dependencies(study.module))
+        _FINGERPRINTS[study.topic] = fingerprint(study)
+    return [study.topic for study in needed]
+
+
+def watch(studies: Sequence[Study], interval: float=1.0):
+    """Rebuild studies as their files change, until interrupted."""
+    rebuild(studies)
+    try:
+        while True:
+            time.sleep(interval)
+            rebuild(studies)
+    except KeyboardInterrupt:
+        pass
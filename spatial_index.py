@@ -0,0 +1,186 @@
+# spatial_index.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+import math
+
+import numpy as np
+
+from xyz import Num
+
+QUERY_CHUNK = 4096  # points looked up at a time, to bound the memory used
+
+
+class GridIndex:
+    """GridIndex finds the points near a place, by filing them into cells.
+
+    The points are (x, y) rows, each with a weight, like the area of the
+    face the point is the center of. They are filed into square cells of a
+    uniform grid, sorted by cell, so that the points of any cell are one
+    run of the sorted order. A query then looks only at the few cells near
+    it, and a batch of queries does that all at once, cell by cell.
+    """
+
+    def __init__(self,
+                 xys: np.ndarray,
+                 cell: Num,
+                 weights: Optional[np.ndarray]=None):
+        self.xys = np.asarray(xys, dtype=float).reshape(-1, 2)
+        self.weights = (np.ones(len(self.xys)) if weights is None
+                        else np.asarray(weights, dtype=float))
+        self.cell = float(cell)
+        if len(self.xys):
+            self._low = self.xys.min(axis=0)
+            high = self.xys.max(axis=0)
+        else:
+            self._low = high = np.zeros(2)
+        (self._cols, self._rows) = (np.floor((high - self._low) / self.cell)
+                                    .astype(np.int64) + 1)
+        ids = self._cell_ids(*self._cells(self.xys).T)
+        self._ids = ids
+        self._order = np.argsort(ids, kind="stable")
+        self._first = np.searchsorted(ids[self._order],
+                                      np.arange(self._cols * self._rows + 1))
+
+    def __len__(self):
+        return len(self.xys)
+
+    def _cells(self, xys: np.ndarray) -> np.ndarray:
+        """Return the (column, row) of the cell each point falls in."""
+        return np.floor((xys - self._low) / self.cell).astype(np.int64)
+
+    def _cell_ids(self, columns: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Return the index of each cell, or -1 for cells off the grid."""
+        inside = ((columns >= 0) & (columns < self._cols) &
+                  (rows >= 0) & (rows < self._rows))
+        return np.where(inside, columns * self._rows + rows, -1)
+
+    def _candidates(self, cells: np.ndarray, di: int, dj: int):
+        """Return (query, point) pairs: the points in the cell (di, dj) over
+        from each query's cell, as two arrays of indices.
+        """
+        ids = self._cell_ids(cells[:, 0] + di, cells[:, 1] + dj)
+        queries = np.flatnonzero(ids >= 0)
+        ids = ids[queries]
+        starts = self._first[ids]
+        counts = self._first[ids + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        points = self._order[np.arange(counts.sum()) + offsets]
+        return (np.repeat(queries, counts), points)
+
+    def within(self, xy: Tuple[Num, Num], radius: Num) -> np.ndarray:
+        """Return the indices of the points within radius of a place."""
+        xy = np.asarray(xy, dtype=float).reshape(1, 2)
+        reach = int(math.ceil(radius / self.cell))
+        cells = self._cells(xy)
+        found = []
+        for di in range(-reach, reach + 1):
+            for dj in range(-reach, reach + 1):
+                (queries, points) = self._candidates(cells, di, dj)
+                near = np.hypot(*(self.xys[points] - xy).T) <= radius
+                found.append(points[near])
+        return np.sort(np.concatenate(found))
+
+    def sums_within(self,
+                    xys: np.ndarray,
+                    radius: Num,
+                    exact: bool=True) -> np.ndarray:
+        """Return the total weight of the points within radius of each place.
+
+        With exact=False, each point counts as being at the center of its
+        cell, and so does each place. That makes the work for each place a
+        few sums along rows of cells, however many points are near it, and
+        the answer is off by at most the points in a ring of cells around
+        the circle, so the cells should be small next to the radius.
+        """
+        xys = np.asarray(xys, dtype=float).reshape(-1, 2)
+        sums = np.zeros(len(xys))
+        if len(self) == 0:
+            return sums
+        if not exact:
+            return self._disk_sums(xys, radius)
+        reach = int(math.ceil(radius / self.cell))
+        for q0 in range(0, len(xys), QUERY_CHUNK):
+            chunk = xys[q0:q0+QUERY_CHUNK]
+            cells = self._cells(chunk)
+            for di in range(-reach, reach + 1):
+                for dj in range(-reach, reach + 1):
+                    (queries, points) = self._candidates(cells, di, dj)
+                    gaps = self.xys[points] - chunk[queries]
+                    near = np.hypot(gaps[:, 0], gaps[:, 1]) <= radius
+                    sums[q0:q0+QUERY_CHUNK] += np.bincount(
+                        queries[near], weights=self.weights[points[near]],
+                        minlength=len(chunk))
+        return sums
+
+    def _disk_sums(self, xys: np.ndarray, radius: Num) -> np.ndarray:
+        """Return the total weight of the cells in a disk around each place.
+        """
+        totals = np.bincount(self._ids, weights=self.weights,
+                             minlength=self._cols * self._rows)
+        prefix = np.zeros((self._cols + 1, self._rows))
+        prefix[1:] = np.cumsum(totals.reshape(self._cols, self._rows), axis=0)
+        cells = self._cells(xys)
+        reach = radius / self.cell
+        sums = np.zeros(len(xys))
+        for dj in range(-int(reach), int(reach) + 1):
+            half = int(math.sqrt(reach**2 - dj**2))
+            rows = cells[:, 1] + dj
+            inside = (rows >= 0) & (rows < self._rows)
+            low = np.clip(cells[:, 0] - half, 0, self._cols)
+            high = np.clip(cells[:, 0] + half + 1, 0, self._cols)
+            sums[inside] += (prefix[high[inside], rows[inside]] -
+                             prefix[low[inside], rows[inside]])
+        return sums
+
+    def nearest(self, xys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (index, distance) of the point nearest each place.
+
+        Each place looks through rings of cells around its own, one ring
+        further out at a time, until no point further out could be nearer
+        than the nearest found so far. With no points, the index is -1.
+        """
+        xys = np.asarray(xys, dtype=float).reshape(-1, 2)
+        best = np.full(len(xys), -1, dtype=np.int64)
+        distances = np.full(len(xys), np.inf)
+        if len(self) == 0:
+            return (best, distances)
+        cells = self._cells(xys)
+        ahead = np.arange(len(xys))
+        farthest = np.abs(cells).max() + max(self._cols, self._rows)
+        for ring in range(farthest + 1):
+            if len(ahead) == 0:
+                break
+            for (di, dj) in _ring(ring):
+                (queries, points) = self._candidates(cells[ahead], di, dj)
+                gaps = self.xys[points] - xys[ahead[queries]]
+                lengths = np.hypot(gaps[:, 0], gaps[:, 1])
+                order = np.lexsort((lengths, queries))
+                (queries, points, lengths) = (queries[order], points[order],
+                                              lengths[order])
+                first = np.ones(len(queries), dtype=bool)
+                first[1:] = queries[1:] != queries[:-1]
+                (queries, points, lengths) = (queries[first], points[first],
+                                              lengths[first])
+                closer = lengths < distances[ahead[queries]]
+                best[ahead[queries[closer]]] = points[closer]
+                distances[ahead[queries[closer]]] = lengths[closer]
+            ahead = ahead[distances[ahead] > ring * self.cell]
+        return (best, distances)
+
+
+def _ring(ring: int) -> List[Tuple[int, int]]:
+    """Return the (di, dj) of the cells that are a ring of cells out."""
+    if ring == 0:
+        return [(0, 0)]
+    return ([(di, dj) for di in (-ring, ring)
+             for dj in range(-ring, ring + 1)] +
+            [(di, dj) for di in range(-ring + 1, ring)
+             for dj in (-ring, ring)])
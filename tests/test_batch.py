@@ -0,0 +1,75 @@
+# test_batch.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import os
+import sys
+
+from batch import Job, REPORT_START, run_job, run_all, _jobs
+
+# Fail the first try, and make the output on the second
+FLAKY = """
+import os, sys
+(tries, output) = sys.argv[1:]
+if not os.path.exists(tries):
+    open(tries, "w").close()
+    sys.exit(1)
+print("Blender says hello")
+print({!r})
+print("a report")
+open(output, "w").close()
+""".format(REPORT_START)
+
+
+def _job(tmp_path, script: str, *args):
+    output = str(tmp_path / "out.glb")
+    command = [sys.executable, "-c", script] + list(args) + [output]
+    return Job("test", "cottage", command, output,
+               str(tmp_path / "test_stats.txt"))
+
+
+def test_a_failed_job_is_retried(tmp_path):
+    job = _job(tmp_path, FLAKY, str(tmp_path / "tries"))
+    outcome = run_job(job, retries=1)
+    assert (outcome.ok, outcome.attempts) == (True, 2)
+    with open(job.report) as file:
+        assert file.read() == REPORT_START + "\na report\n"
+
+
+def test_a_job_fails_when_its_tries_run_out(tmp_path):
+    job = _job(tmp_path, FLAKY, str(tmp_path / "tries"))
+    outcome = run_job(job, retries=0)
+    assert (outcome.ok, outcome.attempts) == (False, 1)
+    assert "exited with status 1" in outcome.log
+    assert not os.path.exists(job.report)
+
+
+def test_a_stale_output_does_not_count(tmp_path):
+    job = _job(tmp_path, "import sys")
+    open(job.output, "w").close()
+    outcome = run_job(job, retries=2)
+    assert (outcome.ok, outcome.attempts) == (False, 3)
+    assert not os.path.exists(job.output)
+
+
+def test_a_job_that_hangs_times_out(tmp_path):
+    job = _job(tmp_path, "import time; time.sleep(10)")
+    outcome = run_job(job, retries=0, timeout=0.5)
+    assert not outcome.ok
+    assert outcome.log.startswith("timed out")
+
+
+def test_exports_a_glb_with_its_report(tmp_path):
+    jobs = _jobs(["cottage"], str(tmp_path), None, True)
+    assert [job.name for job in jobs] == ["cottage.glb"]
+    (outcome,) = run_all(jobs, 1)
+    assert outcome.ok, outcome.log
+    assert os.path.getsize(str(tmp_path / "cottage.glb")) > 0
+    with open(str(tmp_path / "cottage_stats.txt")) as file:
+        assert file.readline().rstrip() == REPORT_START
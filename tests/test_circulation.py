@@ -0,0 +1,72 @@
+# test_circulation.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import numpy as np
+
+from place import Place
+from circulation import graph, shortest_paths, touching
+from circulation import kinematic_fluidity
+
+
+def floyd_warshall(n: int, firsts, seconds, costs) -> np.ndarray:
+    best = np.full((n, n), np.inf)
+    np.fill_diagonal(best, 0)
+    for (a, b, cost) in zip(firsts, seconds, costs):
+        best[a, b] = best[b, a] = min(best[a, b], cost)
+    for k in range(n):
+        best = np.minimum(best, best[:, k:k+1] + best[k:k+1, :])
+    return best
+
+
+def test_shortest_paths_is_brute_force():
+    rng = np.random.default_rng(2)
+    n = 30
+    firsts = rng.integers(0, n, size=60)
+    seconds = rng.integers(0, n, size=60)
+    costs = rng.uniform(0.5, 10, size=60)
+    network = graph(n, firsts, seconds, costs)
+    expected = floyd_warshall(n, firsts, seconds, costs)
+    for source in range(n):
+        assert np.allclose(shortest_paths(network, source), expected[source])
+
+
+def test_unreachable_nodes_cost_infinity():
+    network = graph(4, np.array([0]), np.array([1]), np.array([2.0]))
+    assert shortest_paths(network, 0).tolist() == [0, 2, np.inf, np.inf]
+
+
+def test_touching_is_brute_force():
+    rng = np.random.default_rng(3)
+    lows = rng.uniform(0, 100, size=(80, 3))
+    highs = lows + rng.uniform(0, 15, size=(80, 3))
+    (firsts, seconds) = touching(lows, highs, tolerance=0.5)
+    found = {tuple(sorted(pair)) for pair in zip(firsts, seconds)}
+    expected = {(i, j) for i in range(80) for j in range(i + 1, 80)
+                if np.all((lows[i] <= highs[j] + 0.5) &
+                          (lows[j] <= highs[i] + 0.5))}
+    assert found == expected
+    assert len(found) == len(firsts)
+
+
+def test_fluidity_with_few_paths_and_degenerate_faces():
+    """Faces with no area can't be trip starts, and don't count as ones."""
+    (walkway, room) = (Place.WALKWAY.value, Place.ROOM.value)
+    places = np.array([walkway, walkway] + [walkway] * 20 + [room],
+                      dtype=np.int8)
+    centers = np.array([(0, 0, 0), (10, 0, 0)] + [(5, 0, 0)] * 20 +
+                       [(0, 5, 0)], dtype=float)
+    areas = np.array([100.0, 100.0] + [0.0] * 20 + [50.0])
+    lows = centers - (5, 5, 0)
+    highs = centers + (5, 5, 0)
+    fluidity = kinematic_fluidity(places, centers, areas, lows, highs,
+                                  samples=16)
+    assert np.isfinite(fluidity) and fluidity > 0
+    areas[:] = 0
+    assert kinematic_fluidity(places, centers, areas, lows, highs) == 0
@@ -0,0 +1,57 @@
+# test_cli.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cli import COMMANDS, _parser
+from conftest import ROOT
+
+# Which generators does building one study import?
+SCRIPT = """
+import sys
+import cli
+cli.main(sys.argv[1:])
+print(sorted(command.module for command in cli.COMMANDS.values()
+             if command.module in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("name", sorted(COMMANDS))
+def test_commands_name_real_generators(name):
+    command = COMMANDS[name]
+    module = importlib.import_module(command.module)
+    generator = getattr(module, command.generator)
+    assert callable(getattr(generator, command.method))
+    options = _parser().parse_args([name])
+    for (option, parameter, default) in command.options:
+        assert getattr(options, parameter) == default
+
+
+def test_builds_one_study(tmp_path):
+    (glb, counters) = (str(tmp_path / "cottages.glb"),
+                       str(tmp_path / "counters.json"))
+    done = subprocess.run([sys.executable, "-c", SCRIPT,
+                           "--glb", glb, "--counters", counters,
+                           "cottage", "--count", "2"],
+                          cwd=ROOT, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True)
+    assert done.returncode == 0, done.stderr
+    lines = done.stdout.splitlines()
+    assert "Cottage(s) floor area" in lines
+    assert lines[-1] == "['cottage']"
+    assert os.path.getsize(glb) > 0
+    with open(counters) as file:
+        assert list(json.load(file)) == ["Cottage(s)"]
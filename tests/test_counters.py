@@ -0,0 +1,72 @@
+# test_counters.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import csv
+import json
+import time
+
+import numpy as np
+
+from place import Place
+from counters import Counters
+from test_plato import build
+
+
+def test_stages_leave_out_the_stages_within_them(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+    counters = Counters()
+    (outer, counted) = (time.perf_counter(), counters.counted)
+    now[0] += 1
+    (inner, inner_counted) = (time.perf_counter(), counters.counted)
+    now[0] += 2
+    counters.add_seconds_since("inner", inner, inner_counted)
+    now[0] += 4
+    counters.add_seconds_since("outer", outer, counted)
+    assert counters.timings() == {"inner": 2, "outer": 5}
+    assert sum(counters.timings().values()) == now[0]
+
+
+def test_stages_add_up_to_the_time_spent_building():
+    start_time = time.perf_counter()
+    (plato, report) = build("merlon", batch=True)
+    seconds = time.perf_counter() - start_time
+    timings = plato.counters.timings()
+    assert "add" in timings and "backend" in timings
+    assert sum(timings.values()) <= seconds
+
+
+def test_counts_match_the_faces_built():
+    (plato, report) = build("wurster", batch=True)
+    faces = plato.faces
+    built = np.bincount(faces.places, minlength=len(Place) + 1)
+    verts = np.bincount(faces.places, weights=faces.sizes,
+                        minlength=len(Place) + 1)
+    counts = plato.counters.counts()
+    for place in Place:
+        assert plato.counters.faces[place.value] == built[place.value]
+        assert plato.counters.verts[place.value] == verts[place.value]
+        if built[place.value]:
+            assert counts[place.name]["objects"] == 1  # batched
+
+
+def test_write_json_and_csv(tmp_path):
+    (plato, report) = build("wurster", batch=True)
+    plato.write_counters(str(tmp_path / "counters.json"))
+    plato.write_counters(str(tmp_path / "counters.csv"))
+    with open(str(tmp_path / "counters.json")) as file:
+        written = json.load(file)
+    assert written["wurster"]["counts"] == plato.counters.counts()
+    with open(str(tmp_path / "counters.csv"), newline="") as file:
+        rows = list(csv.DictReader(file))
+    faces = {row["name"]: int(row["value"]) for row in rows
+             if row["topic"] == "wurster" and row["kind"] == "faces"}
+    assert faces == {name: counts["faces"] for (name, counts)
+                     in plato.counters.counts().items()}
@@ -0,0 +1,63 @@
+# test_face_buffer.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import numpy as np
+import pytest
+
+from place import Place
+from face_buffer import FaceBuffer, weld_verts, WELD_TOLERANCE
+from test_plato import build
+
+
+def _floor_and_wall(gap: float=0):
+    """Return a buffer with a floor, and a wall standing on its edge."""
+    buffer = FaceBuffer()
+    buffer.add_face(Place.ROOM, [(0, 0, 0), (10, 0, 0), (10, 10, 0),
+                                 (0, 10, 0)])
+    buffer.add_face(Place.WALL, [(0, gap, 0), (10, gap, 0), (10, gap, 9),
+                                 (0, gap, 9)])
+    return buffer
+
+
+def test_faces_that_meet_share_their_corners():
+    faces = np.arange(2)
+    (verts, loops, starts, sizes) = _floor_and_wall().submesh(faces, True)
+    assert len(verts) == 6
+    assert loops[4:6].tolist() == loops[0:2].tolist()
+    near = _floor_and_wall(WELD_TOLERANCE / 10)
+    assert len(near.submesh(faces, True)[0]) == 6
+    apart = _floor_and_wall(WELD_TOLERANCE * 10)
+    assert len(apart.submesh(faces, True)[0]) == 8
+
+
+def test_weld_of_nothing():
+    (verts, loops) = weld_verts(np.empty((0, 3)),
+                                np.empty(0, dtype=np.int64))
+    assert len(verts) == len(loops) == 0
+
+
+@pytest.mark.parametrize("study", ["merlon", "wurster"])
+def test_welding_keeps_the_faces_where_they_are(study):
+    (plato, report) = build(study, batch=True)
+    faces = np.arange(len(plato.faces))
+    (verts, loops, starts, sizes) = plato.faces.submesh(faces)
+    (welded, welded_loops, welded_starts, welded_sizes) = (
+        plato.faces.submesh(faces, weld=True))
+    assert len(welded) < len(verts)
+    assert np.array_equal(welded_starts, starts)
+    assert np.array_equal(welded_sizes, sizes)
+    assert np.allclose(welded[welded_loops], verts[loops],
+                       atol=WELD_TOLERANCE)
+    (points, triangles, places) = plato.faces.triangles(faces)
+    (welded, welded_triangles, welded_places) = (
+        plato.faces.triangles(faces, weld=True))
+    assert np.array_equal(welded_places, places)
+    assert np.allclose(welded[welded_triangles], points[triangles],
+                       atol=WELD_TOLERANCE)
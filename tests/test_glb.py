@@ -0,0 +1,120 @@
+# test_glb.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import contextlib
+import io
+import json
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from xyz import yzwh2rect, polygon_area
+from place import Place
+from face_buffer import FaceBuffer
+from plato import Plato
+from walls import wall_template, frame_matrix
+from glb import GlbBackend, GLB_MAGIC, JSON_CHUNK, BIN_CHUNK
+from glb import FLOAT, UNSIGNED_INT
+from cottage import Cottage
+
+COMPONENTS = {FLOAT: np.float32, UNSIGNED_INT: np.uint32}
+WINDOW = yzwh2rect(2, 3, 4, 4)
+DOOR = yzwh2rect(9, 0, 3, 7)
+TRANSOM = yzwh2rect(15, 8, 3, 1)
+WIDTHS = {"SCALAR": 1, "VEC3": 3}
+
+
+def build_glb(path: str, batch: bool=True, **modes):
+    random.seed(3)
+    with GlbBackend(path) as backend:
+        plato = Plato(backend=backend, batch=batch, **modes)
+        with contextlib.redirect_stdout(io.StringIO()):
+            plato.study("Cottage(s)")
+            Cottage(plato).add_street(3)
+            plato.pontificate()
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("modes", [{}, {"weld": True}, {"instance": True}])
+def test_accessors_are_valid(tmp_path, modes):
+    data = build_glb(str(tmp_path / "cottages.glb"), **modes)
+    (magic, version, length) = struct.unpack_from("<III", data, 0)
+    assert (magic, version, length) == (GLB_MAGIC, 2, len(data))
+    (text_length, kind) = struct.unpack_from("<II", data, 12)
+    assert kind == JSON_CHUNK
+    gltf = json.loads(data[20:20+text_length].decode("utf-8"))
+    (bin_length, kind) = struct.unpack_from("<II", data, 20 + text_length)
+    assert kind == BIN_CHUNK
+    binary = data[28+text_length:]
+    assert len(binary) == bin_length == gltf["buffers"][0]["byteLength"]
+
+    def array(index: int) -> np.ndarray:
+        accessor = gltf["accessors"][index]
+        view = gltf["bufferViews"][accessor["bufferView"]]
+        start = view["byteOffset"]
+        assert start + view["byteLength"] <= len(binary)
+        dtype = COMPONENTS[accessor["componentType"]]
+        values = np.frombuffer(binary[start:start+view["byteLength"]], dtype)
+        width = WIDTHS[accessor["type"]]
+        assert len(values) == accessor["count"] * width
+        return values.reshape(-1, width)
+
+    assert gltf["meshes"]
+    for mesh in gltf["meshes"]:
+        for primitive in mesh["primitives"]:
+            position = gltf["accessors"][primitive["attributes"]["POSITION"]]
+            points = array(primitive["attributes"]["POSITION"])
+            assert len(points) > 0
+            assert position["min"] == points.min(axis=0).tolist()
+            assert position["max"] == points.max(axis=0).tolist()
+            indices = array(primitive["indices"]).ravel()
+            assert len(indices) % 3 == 0
+            assert indices.max() < len(points)
+            assert primitive["material"] < len(gltf["materials"])
+    for node in gltf["nodes"]:
+        assert node["mesh"] < len(gltf["meshes"])
+
+
+def _gltf(data: bytes) -> dict:
+    (text_length, kind) = struct.unpack_from("<II", data, 12)
+    return json.loads(data[20:20+text_length].decode("utf-8"))
+
+
+def test_one_node_per_topic_batched_or_not(tmp_path):
+    batched = _gltf(build_glb(str(tmp_path / "batched.glb")))
+    loose = _gltf(build_glb(str(tmp_path / "loose.glb"), batch=False))
+    assert len(loose["nodes"]) == len(batched["nodes"]) == 1
+    assert loose["nodes"][0]["name"] == "Cottage(s)"
+    counts = [sorted(gltf["accessors"][primitive["indices"]]["count"]
+                     for primitive in gltf["meshes"][0]["primitives"])
+              for gltf in (batched, loose)]
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.parametrize("openings", [[WINDOW], [DOOR], [WINDOW, DOOR],
+                                      [DOOR, TRANSOM, WINDOW]])
+def test_bridged_wall_triangles_cover_the_wall(openings):
+    """A wall's bridged outline, cut into triangles, has the wall's area."""
+    shape = [(5, 5, 0), (5 + 20 * 0.6, 5 + 20 * 0.8, 0),
+             (5 + 20 * 0.6, 5 + 20 * 0.8, 10), (5, 5, 10)]
+    (template, frame) = wall_template(shape, openings)
+    buffer = FaceBuffer()
+    buffer.add_face(Place.WALL,
+                    template.outline @ frame_matrix(frame) + frame[0])
+    (verts, triangles, places) = buffer.triangles(np.arange(1))
+    (a, b, c) = (verts[triangles[:, i]] for i in range(3))
+    total = 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+    expected = 20 * 10 - sum(polygon_area([(y, z, 0) for (y, z) in opening])
+                             for opening in openings)
+    assert np.isclose(total, expected)
+    assert np.isclose(buffer.areas()[0], expected)
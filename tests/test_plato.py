@@ -0,0 +1,170 @@
+# test_plato.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import contextlib
+import io
+import random
+
+from typing import Sequence
+
+import numpy as np
+import pytest
+
+from compass_facing import CompassFacing as Facing
+from place import Place
+from plato import Plato, Backend, LOD_MASSING, LOD_FLOORS, move_home
+from manhattan import Manhattan
+from merlon import Merlon
+from wurster import Wurster
+
+SQUARE = [(0, 0, 0), (20, 0, 0), (20, 20, 0), (0, 20, 0)]
+
+STUDIES = {"manhattan": (Manhattan, "add_blocks", (1, 1)),
+           "manhattan 2x2": (Manhattan, "add_blocks", (2, 2)),
+           "merlon": (Merlon, "add_buildings", (2, 2)),
+           "wurster": (Wurster, "add_buildings", (1,))}
+
+
+class CountingBackend(Backend):
+    """Counts the faces of each Place it is handed, copies and all."""
+
+    def __init__(self):
+        self.built = np.zeros(len(Place) + 1, dtype=np.int64)
+        self.designs = []
+
+    def consume(self, buffer, faces, *, topic="", merge=False):
+        self.built += np.bincount(buffer.places[faces],
+                                  minlength=len(self.built))
+        return self
+
+    def instantiate(self, buffer, designs, *, topic=""):
+        self.designs += designs
+        for occurrences in designs:
+            (f0, f1, at, facing) = occurrences[0]
+            self.built += len(occurrences) * np.bincount(
+                buffer.places[f0:f1], minlength=len(self.built))
+        return self
+
+
+def build(study: str, backend: Backend=None, **modes):
+    """Build a small study, and return its Plato and printed report."""
+    (generator, method, args) = STUDIES[study]
+    random.seed(3)
+    plato = Plato(backend=backend or Backend(), **modes)
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        plato.study(study)
+        getattr(generator(plato), method)(*args)
+        plato.pontificate()
+    return (plato, report.getvalue())
+
+
+@pytest.mark.parametrize("study", sorted(STUDIES))
+def test_envelope_hides_the_same_faces_when_instancing(study):
+    alone = CountingBackend()
+    build(study, alone, batch=True, envelope=True)
+    instanced = CountingBackend()
+    build(study, instanced, batch=True, envelope=True, instance=True)
+    shown = CountingBackend()
+    build(study, shown, batch=True)
+    assert instanced.built.tolist() == alone.built.tolist()
+    assert alone.built[Place.ROOM.value] < shown.built[Place.ROOM.value]
+
+
+def _far(report: str):
+    return [line for line in report.splitlines() if "FAR" in line]
+
+
+@pytest.mark.parametrize("study", sorted(STUDIES))
+def test_report_tallies_every_place_at_any_lod(study):
+    (plato, detail) = build(study, batch=True)
+    for lod in (LOD_MASSING, LOD_FLOORS):
+        (plato, report) = build(study, batch=True, lod=lod)
+        (plato, surveyed) = build(study, survey=True, lod=lod)
+        assert report == surveyed
+        assert _far(report) == _far(detail)
+        assert "ROOM" in report
+
+
+@pytest.mark.parametrize("study", sorted(STUDIES))
+def test_floors_keep_roofs(study):
+    floors = CountingBackend()
+    build(study, floors, batch=True, lod=LOD_FLOORS)
+    detail = CountingBackend()
+    build(study, detail, batch=True)
+    assert floors.built[Place.ROOF.value] > 0
+    assert (floors.built[Place.ROOF.value] ==
+            detail.built[Place.ROOF.value])
+
+
+@pytest.mark.parametrize("modes", [{"batch": True},
+                                   {"batch": True, "lod": (0, 1, 2)},
+                                   {"batch": True, "merge_walls": True,
+                                    "envelope": True, "instance": True}])
+def test_workers_build_the_same_study(modes):
+    (serial, report) = build("manhattan 2x2", workers=1, **modes)
+    (parallel, parallel_report) = build("manhattan 2x2", workers=2, **modes)
+    assert parallel_report == report
+    assert np.array_equal(parallel.faces.verts, serial.faces.verts)
+    assert np.array_equal(parallel.faces.loops, serial.faces.loops)
+    assert np.array_equal(parallel.faces.places, serial.faces.places)
+    for lod in modes.get("lod", ())[:-1]:
+        assert np.array_equal(parallel.faces_at(lod).verts,
+                              serial.faces_at(lod).verts)
+
+
+@pytest.mark.parametrize("study", sorted(STUDIES))
+def test_instances_are_copies_of_their_design(study):
+    instanced = CountingBackend()
+    (plato, report) = build(study, instanced, batch=True, instance=True)
+    alone = CountingBackend()
+    (plato_alone, report_alone) = build(study, alone, batch=True)
+    assert report == report_alone
+    assert instanced.built.tolist() == alone.built.tolist()
+    assert instanced.designs
+    faces = plato.faces
+    for occurrences in instanced.designs:
+        (f0, f1, at, facing) = occurrences[0]
+        design = move_home(faces.submesh(np.arange(f0, f1))[0], at, facing)
+        for (f0, f1, at, facing) in occurrences[1:]:
+            copy = faces.submesh(np.arange(f0, f1))[0]
+            assert np.allclose(move_home(copy, at, facing), design)
+
+
+def _tower(floors: Sequence[int], **modes):
+    """Return the faces of square floors, walled, at these stories."""
+    plato = Plato(backend=Backend(), batch=True, **modes)
+    plato.study("tower")
+    for story in floors:
+        plato.goto(x=5, y=5, z=story * 10, facing=Facing.EAST)
+        plato.add_place(Place.ROOM, shape=SQUARE, wall=10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plato.pontificate()
+    return plato.faces
+
+
+def test_stacked_floors_share_walls():
+    merged = _tower(range(6), merge_walls=True)
+    walls = merged.places == Place.WALL.value
+    assert np.count_nonzero(walls) == 4
+    assert np.allclose(merged.square_feet(), _tower(range(6)).square_feet())
+    gap = _tower([0, 1, 3, 4], merge_walls=True)
+    assert np.count_nonzero(gap.places == Place.WALL.value) == 8
+
+
+@pytest.mark.parametrize("study", sorted(STUDIES))
+def test_merged_walls_keep_their_area(study):
+    (plato, report) = build(study, batch=True)
+    (merged, merged_report) = build(study, batch=True, merge_walls=True)
+    assert merged_report == report
+    assert np.allclose(merged.faces.square_feet(), plato.faces.square_feet())
+    walls = Place.WALL.value
+    assert (np.count_nonzero(merged.faces.places == walls) <=
+            np.count_nonzero(plato.faces.places == walls))
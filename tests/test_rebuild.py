@@ -0,0 +1,47 @@
+# test_rebuild.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+from conftest import ROOT
+
+# Run in a process of its own, on a copy of the code, so it can edit files
+SCRIPT = """
+import sys
+import benchmark
+benchmark._use_blender_or_stand_in()
+import rebuild
+import plato
+import blender_backend
+STUDIES = [rebuild.Study("Cottage", 0, 0, "cottage", "Cottage",
+                         "add_street", (1,))]
+print(rebuild.rebuild(STUDIES))
+with open("plato.py", "a") as file:
+    file.write("# edited")
+print(rebuild.rebuild(STUDIES))
+print(sys.modules["blender_backend"].Backend is sys.modules["plato"].Backend)
+print(rebuild.rebuild(STUDIES))
+"""
+
+
+def test_edited_plato_reaches_blender_backend(tmp_path):
+    for path in glob.glob(os.path.join(ROOT, "*.py")):
+        shutil.copy(path, str(tmp_path))
+    done = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(tmp_path),
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+    assert done.returncode == 0, done.stdout
+    lines = [line for line in done.stdout.splitlines()
+             if line.startswith("[") or line in ("True", "False")]
+    assert lines == ["['Cottage']", "['Cottage']", "True", "[]"]
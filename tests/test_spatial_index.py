@@ -0,0 +1,80 @@
+# test_spatial_index.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import numpy as np
+import pytest
+
+from spatial_index import GridIndex
+
+RADIUS = 30
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(1)
+    xys = rng.uniform(-100, 200, size=(500, 2))
+    weights = rng.uniform(0, 10, size=500)
+    places = np.concatenate([rng.uniform(-150, 250, size=(40, 2)), xys[:10]])
+    return (xys, weights, places)
+
+
+def distances(xys: np.ndarray, places: np.ndarray) -> np.ndarray:
+    return np.hypot(*(places[:, None, :] - xys[None, :, :]).transpose(2, 0, 1))
+
+
+@pytest.mark.parametrize("cell", [7, 25, 64])
+def test_within_is_brute_force(points, cell):
+    (xys, weights, places) = points
+    index = GridIndex(xys, cell, weights)
+    near = distances(xys, places) <= RADIUS
+    for (place, row) in zip(places, near):
+        found = index.within(place, RADIUS)
+        assert found.tolist() == np.flatnonzero(row).tolist()
+
+
+@pytest.mark.parametrize("cell", [7, 25, 64])
+def test_sums_within_is_brute_force(points, cell):
+    (xys, weights, places) = points
+    index = GridIndex(xys, cell, weights)
+    near = distances(xys, places) <= RADIUS
+    assert np.allclose(index.sums_within(places, RADIUS), near @ weights)
+
+
+def test_cell_sums_are_off_by_a_ring_at_most(points):
+    """Summing whole cells is off by no more than the points in a ring of
+    cells around the circle.
+    """
+    (xys, weights, places) = points
+    cell = RADIUS / 16
+    index = GridIndex(xys, cell, weights)
+    exact = index.sums_within(places, RADIUS)
+    rough = index.sums_within(places, RADIUS, exact=False)
+    gaps = distances(xys, places)
+    ring = np.abs(gaps - RADIUS) <= 2 * np.sqrt(2) * cell
+    assert np.all(np.abs(rough - exact) <= ring @ weights + 1e-9)
+
+
+@pytest.mark.parametrize("cell", [7, 25, 64])
+def test_nearest_is_brute_force(points, cell):
+    (xys, weights, places) = points
+    index = GridIndex(xys, cell, weights)
+    (found, lengths) = index.nearest(places)
+    gaps = distances(xys, places)
+    assert np.allclose(lengths, gaps.min(axis=1))
+    assert np.allclose(gaps[np.arange(len(places)), found], lengths)
+
+
+def test_empty_index():
+    index = GridIndex(np.zeros((0, 2)), 10)
+    assert index.within((0, 0), 5).tolist() == []
+    assert index.sums_within(np.zeros((3, 2)), 5).tolist() == [0, 0, 0]
+    (found, lengths) = index.nearest(np.zeros((2, 2)))
+    assert found.tolist() == [-1, -1]
+    assert np.isinf(lengths).all()
@@ -0,0 +1,77 @@
+# test_tiles.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import struct
+
+import numpy as np
+
+from place import Place
+from plato import Plato, Backend
+from tiles import write_tileset
+from cottage import Cottage
+
+
+def read_glb(path: str):
+    """Return {Place name: (points, triangles)} from a GLB file."""
+    with open(path, "rb") as file:
+        data = file.read()
+    (length,) = struct.unpack_from("<I", data, 12)
+    gltf = json.loads(data[20:20+length].decode("utf-8"))
+    binary = data[20+length+8:]
+
+    def array(accessor, dtype, width):
+        view = gltf["bufferViews"][accessor["bufferView"]]
+        start = view["byteOffset"]
+        values = np.frombuffer(binary[start:start+view["byteLength"]], dtype)
+        return values.reshape(-1, width)
+
+    meshes = {}
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            place = gltf["materials"][primitive["material"]]["name"]
+            accessors = gltf["accessors"]
+            points = array(accessors[primitive["attributes"]["POSITION"]],
+                           np.float32, 3)
+            triangles = array(accessors[primitive["indices"]], np.uint32, 3)
+            meshes.setdefault(place, []).append((points, triangles))
+    return meshes
+
+
+def triangle_area(points: np.ndarray, triangles: np.ndarray) -> float:
+    (a, b, c) = (points[triangles[:, i]].astype(float) for i in range(3))
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+
+
+def test_tile_areas_match_report(tmp_path):
+    """Walls with doors and windows come out of the tiles at full size."""
+    random.seed(3)
+    plato = Plato(backend=Backend(), batch=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plato.study("Cottage(s)")
+        Cottage(plato).add_street(4)
+        plato.pontificate()
+    write_tileset(str(tmp_path), plato.faces, (100, 100, 0, 0))
+
+    totals = {}
+    for path in glob.glob(os.path.join(str(tmp_path), "tiles", "*.glb")):
+        for (place, parts) in read_glb(path).items():
+            totals[place] = totals.get(place, 0) + sum(
+                triangle_area(*part) for part in parts)
+    report = plato.faces.square_feet()
+    for place in Place:
+        # The roof panes are not quite flat, so triangles differ a little
+        assert np.isclose(totals.get(place.name, 0), report[place.value],
+                          rtol=1e-3), place.name
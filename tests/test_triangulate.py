@@ -0,0 +1,67 @@
+# test_triangulate.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import numpy as np
+import pytest
+
+from xyz import yzwh2rect
+from triangulate import triangulate
+from walls import wall_template, wall_triangles, frame_matrix
+
+WALL = [(0, 0), (20, 0), (20, 10), (0, 10)]
+WINDOW = yzwh2rect(2, 3, 4, 4)
+DOOR = yzwh2rect(9, 0, 3, 7)
+TRANSOM = yzwh2rect(15, 8, 3, 1)
+
+
+def area(points: np.ndarray) -> float:
+    x = np.asarray(points, dtype=float)[:, 0]
+    y = np.asarray(points, dtype=float)[:, 1]
+    return 0.5 * abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+def triangle_areas(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    (a, b, c) = (points[triangles[:, i]] for i in range(3))
+    return 0.5 * ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+                  (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+
+
+@pytest.mark.parametrize("outer", [WALL, WALL[::-1]])
+@pytest.mark.parametrize("holes", [[], [WINDOW], [DOOR], [TRANSOM, WINDOW],
+                                   [WINDOW, DOOR, TRANSOM]])
+def test_area_is_polygon_minus_holes(outer, holes):
+    (points, triangles) = triangulate(outer, holes)
+    signed = triangle_areas(points, triangles)
+    assert (np.sign(signed) == np.sign(triangle_areas(
+        np.array(outer, dtype=float), np.array([[0, 1, 2]])))).all()
+    expected = area(outer) - sum(area(hole) for hole in holes)
+    assert np.isclose(abs(signed.sum()), expected)
+
+
+@pytest.mark.parametrize("openings", [[WINDOW], [DOOR], [WINDOW, DOOR],
+                                      [DOOR, TRANSOM, WINDOW]])
+def test_wall_triangles_cover_the_wall(openings):
+    """A wall's cached triangles have the wall's area, less its openings."""
+    shape = [(5, 5, 0), (5 + 20 * 0.6, 5 + 20 * 0.8, 0),
+             (5 + 20 * 0.6, 5 + 20 * 0.8, 10), (5, 5, 10)]
+    (triangles, frame) = wall_triangles(shape, openings)
+    (template, frame) = wall_template(shape, openings)
+    verts = triangles.verts @ frame_matrix(frame) + frame[0]
+    (a, b, c) = (verts[triangles.triangles[:, i]] for i in range(3))
+    total = 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+    expected = area(WALL) - sum(area(opening) for opening in openings)
+    assert np.isclose(total, expected)
+    assert np.isclose(template.area, expected)
+
+
+def test_openings_outside_the_wall_are_not_triangulated():
+    shape = [(0, 0, 0), (20, 0, 0), (20, 0, 10), (0, 0, 10)]
+    (triangles, frame) = wall_triangles(shape, [yzwh2rect(18, 3, 4, 4)])
+    assert triangles is None
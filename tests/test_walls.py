@@ -0,0 +1,55 @@
+# test_walls.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import numpy as np
+import pytest
+
+from place import Place
+from plato import LOD_FLOORS
+from walls import Facade, facade_grid
+from test_plato import build
+
+WINDOWS = Facade(bay=8, sill=3, width=4, height=5)
+
+
+def _wall(length, height):
+    return [(0, 0, 0), (length, 0, 0), (length, 0, height), (0, 0, height)]
+
+
+def _quad_areas(verts: np.ndarray, quads: np.ndarray):
+    corners = verts[quads]
+    return ((corners[:, 1, 0] - corners[:, 0, 0]) *
+            (corners[:, 2, 2] - corners[:, 1, 2]))
+
+
+@pytest.mark.parametrize("length, stories", [(40, 1), (43, 3), (7, 2)])
+def test_facade_grid_leaves_holes_for_the_windows(length, stories):
+    (grid, frame) = facade_grid(_wall(length, 9 * stories), stories, WINDOWS)
+    assert grid.windows == (length // WINDOWS.bay) * stories
+    holes = grid.windows * WINDOWS.width * WINDOWS.height
+    assert grid.area == pytest.approx(length * 9 * stories - holes)
+    areas = _quad_areas(grid.verts, grid.quads)
+    assert (areas > 0).all()
+    assert areas.sum() == pytest.approx(grid.area)
+    assert grid.verts[:, 0].min() == 0 and grid.verts[:, 0].max() == length
+    assert grid.verts[:, 2].min() == 0
+    assert grid.verts[:, 2].max() == 9 * stories
+
+
+def test_facades_are_built_as_reported():
+    (plato, report) = build("manhattan", batch=True)
+    (surveyed, survey_report) = build("manhattan", survey=True)
+    assert report == survey_report
+    assert plato.counters.openings[Place.WALL.value] > 0
+    (plain, plain_report) = build("manhattan", batch=True, lod=LOD_FLOORS)
+    assert plain.counters.openings[Place.WALL.value] == 0
+    walls = Place.WALL.value
+    assert (plain.faces.square_feet()[walls] >
+            plato.faces.square_feet()[walls])
@@ -0,0 +1,57 @@
+# test_xyz.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+import pickle
+
+import numpy as np
+import pytest
+
+from compass_facing import CompassFacing as Facing
+from place import Place
+from plato import Plato, Backend
+from xyz import Shape, polygon_area
+
+POINTS = [(0, 0, 0), (30, 0, 0), (30, 20, 0), (10, 25, 0)]
+
+
+def test_shape_is_an_immutable_sequence():
+    shape = Shape(POINTS)
+    assert list(shape) == POINTS
+    assert len(shape) == 4 and shape[1] == (30, 0, 0)
+    assert shape[-1] == POINTS[-1]
+    assert shape.area == polygon_area(POINTS)
+    assert shape.array.shape == (4, 3)
+    with pytest.raises(AttributeError):
+        shape.area = 0
+    with pytest.raises(ValueError):
+        shape.array[0, 0] = 1
+
+
+def test_shapes_of_the_same_points_are_equal():
+    shape = Shape(POINTS)
+    assert shape == Shape(tuple(POINTS))
+    assert hash(shape) == hash(Shape(POINTS))
+    assert shape != Shape(POINTS[:3])
+    assert pickle.loads(pickle.dumps(shape)) == shape
+
+
+@pytest.mark.parametrize("facing", list(Facing))
+def test_shapes_are_placed_like_lists(facing):
+    faces = []
+    for shape in (POINTS, Shape(POINTS)):
+        plato = Plato(backend=Backend(), batch=True)
+        plato.study("shape")
+        plato.goto(x=7, y=-3, z=12, facing=facing)
+        plato.add_place(Place.ROOM, shape=shape, wall=10)
+        faces.append(plato.faces)
+    (listed, shaped) = faces
+    assert np.allclose(shaped.verts, listed.verts)
+    assert np.array_equal(shaped.loops, listed.loops)
+    assert np.array_equal(shaped.places, listed.places)
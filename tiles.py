@@ -0,0 +1,183 @@
+# tiles.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+
+import numpy as np
+
+from xyz import Num
+from face_buffer import FaceBuffer
+from glb import GlbWriter
+from plato import LOD_MASSING, LOD_FLOORS
+
+# Data types
+Grid = Tuple[Num, Num, Num, Num]  # (dx, dy, x0, y0) of the cells of a study
+Cell = Tuple[int, int]            # (column, row) of a cell in a Grid
+
+MIN_HALF_SIZE = 0.01  # bounding boxes of flat tiles get this much thickness
+
+# How far off, in feet, each coarse level of detail is from the real thing
+LOD_ERRORS = {LOD_MASSING: 10,  # about a story
+              LOD_FLOORS: 4}    # about a window
+
+
+def _cells_of(buffer: FaceBuffer, grid: Grid, origin: Tuple[Num, Num]):
+    """Return {Cell: faces} for each cell of the grid that has any faces."""
+    (dx, dy, x0, y0) = grid
+    centers = buffer.centers()
+    columns = np.floor((centers[:, 0] - origin[0] - x0) / dx).astype(np.int64)
+    rows = np.floor((centers[:, 1] - origin[1] - y0) / dy).astype(np.int64)
+    order = np.lexsort((rows, columns))
+    keys = np.stack([columns[order], rows[order]], axis=1)
+    breaks = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+    groups = np.split(order, breaks)
+    return {(int(columns[g[0]]), int(rows[g[0]])): g for g in groups}
+
+
+def _bounds(buffer: FaceBuffer, faces: np.ndarray):
+    (verts, loops, starts, sizes) = buffer.submesh(faces)
+    return (verts.min(axis=0), verts.max(axis=0))
+
+
+def _box(low: np.ndarray, high: np.ndarray):
+    """Return a 3D Tiles bounding box: a center, and three half-axes."""
+    center = (low + high) / 2
+    (hx, hy, hz) = np.maximum((high - low) / 2, MIN_HALF_SIZE)
+    return center.tolist() + [hx, 0, 0, 0, hy, 0, 0, 0, hz]
+
+
+def _uri(cell: Cell, lod: Optional[int]):
+    if lod is None:
+        return "tiles/{}_{}.glb".format(*cell)
+    return "tiles/{}_{}_lod{}.glb".format(cell[0], cell[1], lod)
+
+
+def _cell_tile(cell: Cell, lods: Sequence[Optional[int]], extent):
+    """Return the tile for a cell, with its coarser levels of detail above.
+
+    Each coarser level is a tile of its own, that its finer child replaces
+    once the viewer gets close enough.
+    """
+    box = {"box": _box(*extent)}
+    tile = None
+    for lod in reversed(lods):
+        parent = {"boundingVolume": box,
+                  "geometricError": 0 if lod is None else LOD_ERRORS[lod],
+                  "refine": "ADD" if tile is None else "REPLACE",
+                  "content": {"uri": _uri(cell, lod)}}
+        if tile is not None:
+            parent["children"] = [tile]
+        tile = parent
+    tile["extent"] = extent
+    return tile
+
+
+def _tree(cells: dict, c0: int, c1: int, r0: int, r1: int):
+    """Return the tile for columns [c0, c1) and rows [r0, r1), or None.
+
+    A range of one cell is the cell's own tile. Anything bigger is split in
+    half across each side that is longer than one cell, so the tileset is a
+    quadtree over the grid.
+    """
+    if c1 - c0 == 1 and r1 - r0 == 1:
+        return cells.get((c0, r0))
+    cm = (c0 + c1 + 1) // 2 if c1 - c0 > 1 else c1
+    rm = (r0 + r1 + 1) // 2 if r1 - r0 > 1 else r1
+    children = [_tree(cells, *quarter)
+                for quarter in [(c0, cm, r0, rm), (cm, c1, r0, rm),
+                                (c0, cm, rm, r1), (cm, c1, rm, r1)]
+                if quarter[0] < quarter[1] and quarter[2] < quarter[3]]
+    children = [child for child in children if child is not None]
+    if not children:
+        return None
+    low = np.min([child["extent"][0] for child in children], axis=0)
+    high = np.max([child["extent"][1] for child in children], axis=0)
+    error = max(max(np.linalg.norm(high - low), child["geometricError"])
+                for child in children
+                for (low, high) in [child["extent"]])
+    return {"boundingVolume": {"box": _box(low, high)},
+            "geometricError": float(error),
+            "refine": "ADD",
+            "children": children,
+            "extent": (low, high)}
+
+
+def _strip_extents(tile: dict):
+    tile.pop("extent", None)
+    for child in tile.get("children", []):
+        _strip_extents(child)
+    return tile
+
+
+def write_tileset(directory: str,
+                  buffer: FaceBuffer,
+                  grid: Grid,
+                  *,
+                  origin: Tuple[Num, Num]=(0, 0),
+                  coarse: Dict[int, FaceBuffer]={},
+                  weld: bool=False,
+                  workers: Optional[int]=None):
+    """Write a study's faces as 3D Tiles: one GLB per grid cell, and a tileset.
+
+    Each face goes in the cell its center falls in. The grid is given in
+    the study's own coordinates, like each generator's TILE_GRID, and the
+    origin is where the study was placed (the x0, y0 of plato.study()).
+    The tiles are written in parallel, by a pool of worker threads, and
+    then tileset.json ties them together in a quadtree of bounding boxes.
+    Coarser levels of detail, like plato.faces_at(LOD_MASSING), can be
+    given by level in coarse: each cell then starts out as its coarsest
+    tile, which is replaced by finer ones as the viewer comes closer.
+    With weld=True, faces that meet within a tile share their vertices.
+    Returns the path to tileset.json.
+    """
+    os.makedirs(os.path.join(directory, "tiles"), exist_ok=True)
+    levels = [(lod, coarse[lod]) for lod in sorted(coarse)] + [(None, buffer)]
+    jobs = [(cell, lod, level_buffer, faces)
+            for (lod, level_buffer) in levels if len(level_buffer)
+            for (cell, faces) in _cells_of(level_buffer, grid, origin).items()]
+
+    def write_tile(job):
+        (cell, lod, level_buffer, faces) = job
+        path = os.path.join(directory, _uri(cell, lod))
+        name = "tile {} {}".format(*cell)
+        GlbWriter(path).add_mesh(name, level_buffer, faces, weld).close()
+        return _bounds(level_buffer, faces)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        bounds = list(pool.map(write_tile, jobs))
+    lods = {}
+    extents = {}
+    for ((cell, lod, level_buffer, faces), (low, high)) in zip(jobs, bounds):
+        lods.setdefault(cell, []).append(lod)
+        (low0, high0) = extents.get(cell, (low, high))
+        extents[cell] = (np.minimum(low, low0), np.maximum(high, high0))
+    cells = {cell: _cell_tile(cell, lods[cell], extents[cell])
+             for cell in lods}
+
+    root = {"boundingVolume": {"box": _box(np.zeros(3), np.zeros(3))},
+            "geometricError": 0,
+            "refine": "ADD"}
+    tileset = {"asset": {"version": "1.1"}, "geometricError": 0, "root": root}
+    if cells:
+        (columns, rows) = zip(*cells)
+        root = _tree(cells,
+                     min(columns), max(columns) + 1, min(rows), max(rows) + 1)
+        (low, high) = root["extent"]
+        tileset["geometricError"] = max(float(np.linalg.norm(high - low)),
+                                        root["geometricError"])
+        tileset["root"] = _strip_extents(root)
+    path = os.path.join(directory, "tileset.json")
+    with open(path, "w") as file:
+        json.dump(tileset, file, indent=1)
+    return path
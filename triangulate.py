@@ -0,0 +1,200 @@
+# triangulate.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+
+import numpy as np
+
+EPSILON = 1e-9
+ON_EDGE = 1e-5  # feet: a hole corner this near an edge of the ring is on it
+
+
+def _signed_area(points: np.ndarray):
+    x = points[:, 0]
+    y = points[:, 1]
+    return 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+
+
+def _cross(o, a, b):
+    """The z of (a - o) x (b - o), for each row, or for single points."""
+    return ((a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) -
+            (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0]))
+
+
+def _locally_inside(points: np.ndarray, ring: List[int], i: int, xy):
+    """Is the direction from ring[i] toward xy inside the polygon there?"""
+    a = points[ring[i-1]]
+    p = points[ring[i]]
+    c = points[ring[(i+1) % len(ring)]]
+    to_c = _cross(p, c, xy)   # > 0 when xy is left of p->c
+    to_a = _cross(p, xy, a)   # > 0 when a is left of p->xy
+    if _cross(a, p, c) > 0:
+        return to_c > EPSILON and to_a > EPSILON
+    return to_c > EPSILON or to_a > EPSILON
+
+
+def _is_visible(points: np.ndarray, edges: np.ndarray, m, p):
+    """Does the segment m-p stay clear of all the edges and their corners?"""
+    e0 = points[edges[:, 0]]
+    e1 = points[edges[:, 1]]
+    d1 = _cross(e0, e1, m)
+    d2 = _cross(e0, e1, p)
+    d3 = _cross(m, p, e0)
+    d4 = _cross(m, p, e1)
+    crossing = (d1 * d2 < -EPSILON) & (d3 * d4 < -EPSILON)
+    if crossing.any():
+        return False
+    corners = points[edges[:, 0]]
+    on_line = np.abs(d3) <= EPSILON
+    along = (corners - m) @ (p - m)
+    between = (along > EPSILON) & (along < (p - m) @ (p - m) - EPSILON)
+    return not (on_line & between).any()
+
+
+def _ring_edges(ring: List[int]):
+    ring = np.asarray(ring)
+    edges = np.empty((len(ring), 2), dtype=np.int64)
+    edges[:, 0] = ring
+    edges[:-1, 1] = ring[1:]
+    edges[-1, 1] = ring[0]
+    return edges
+
+
+def _notch_holes(points: np.ndarray, ring: List[int], holes: List[List[int]]):
+    """Turn each hole that runs along an edge of the ring into a notch.
+
+    A door in a wall is a hole whose bottom edge lies on the bottom edge of
+    the wall. Instead of bridging to it, the ring can just detour around it:
+    along the wall to the door, up and over the door, and back down.
+    """
+    apart = []
+    for hole in holes:
+        notched = False
+        for i in range(len(ring)):
+            a = points[ring[i]]
+            b = points[ring[(i+1) % len(ring)]]
+            ab = b - a
+            t = (points[hole] - a) @ ab / (ab @ ab)
+            offset = np.abs(_cross(a, b, points[hole])) / np.sqrt(ab @ ab)
+            on_edge = (offset <= ON_EDGE) & (t >= 0) & (t <= 1)
+            if on_edge.sum() < 2:
+                continue
+            first = int(np.argmin(np.where(on_edge, t, np.inf)))
+            last = int(np.argmax(np.where(on_edge, t, -np.inf)))
+            path = hole[first:] + hole[:first]
+            stop = path.index(hole[last])
+            turn = (np.arange(len(hole) + 1) + first) % len(hole)
+            detour = on_edge[turn[:stop+1]]
+            along = on_edge[turn[stop:]]
+            if detour[1:-1].any() or not along.all():
+                continue
+            ring = ring[:i+1] + path[:stop+1] + ring[i+1:]
+            notched = True
+            break
+        if not notched:
+            apart.append(hole)
+    return (ring, apart)
+
+
+def _bridge_holes(points: np.ndarray, ring: List[int], holes: List[List[int]]):
+    """Splice each hole into the ring, with a bridge out and a bridge back.
+
+    Holes are taken rightmost first. Each hole's rightmost corner is bridged
+    to the nearest ring corner that it can see, and that the bridge leaves
+    into the inside of the polygon.
+    """
+    holes = sorted(holes, key=lambda hole: -points[hole, 0].max())
+    hole_edges = [_ring_edges(hole) for hole in holes]
+    hole_edges.append(np.empty((0, 2), dtype=np.int64))
+    for h, hole in enumerate(holes):
+        start = int(np.argmax(points[hole, 0]))
+        hole = hole[start:] + hole[:start]
+        m = points[hole[0]]
+        waiting = np.concatenate(hole_edges[h:])
+        edges = np.concatenate([_ring_edges(ring), waiting])
+        distances = np.linalg.norm(points[ring] - m, axis=1)
+        bridge = None
+        for i in np.argsort(distances, kind="stable"):
+            p = points[ring[i]]
+            if (_locally_inside(points, ring, i, m) and
+                    _is_visible(points, edges, m, p)):
+                bridge = i
+                break
+        if bridge is None:
+            bridge = int(np.argmin(distances))
+        ring = (ring[:bridge+1] + hole + [hole[0], ring[bridge]] +
+                ring[bridge+1:])
+    return ring
+
+
+def _is_ear(points: np.ndarray, ring: List[int], i: int):
+    a = points[ring[i-1]]
+    b = points[ring[i]]
+    c = points[ring[(i+1) % len(ring)]]
+    if _cross(a, b, c) <= EPSILON:
+        return False
+    others = points[ring]
+    same = (np.all(others == a, axis=1) |
+            np.all(others == b, axis=1) |
+            np.all(others == c, axis=1))
+    inside = ((_cross(a, b, others) >= -EPSILON) &
+              (_cross(b, c, others) >= -EPSILON) &
+              (_cross(c, a, others) >= -EPSILON))
+    return not (inside & ~same).any()
+
+
+def _clip_ears(points: np.ndarray, ring: List[int]):
+    triangles = []
+    i = 0
+    misses = 0
+    while len(ring) > 3:
+        i %= len(ring)
+        if _is_ear(points, ring, i) or misses >= len(ring):
+            triangles.append((ring[i-1], ring[i], ring[(i+1) % len(ring)]))
+            del ring[i]
+            i = max(i - 1, 0)
+            misses = 0
+        else:
+            i += 1
+            misses += 1
+    triangles.append(tuple(ring))
+    return triangles
+
+
+def triangulate(outer: Sequence[Tuple],
+                holes: Sequence[Sequence[Tuple]]=[]):
+    """Triangulate a polygon with holes, by bridging holes and ear clipping.
+
+    The outer polygon and each hole are lists of (x, y) points. Returns
+    (points, triangles): an (n, 2) array of all the outer and hole points,
+    in order, and a (t, 3) array of point indices, with each triangle wound
+    the same way round as the outer polygon. A polygon with n points in all
+    and h holes gets n + 2h - 2 triangles, or fewer when holes are notches
+    in the outer edge, like doors.
+    """
+    rings = [np.asarray(outer, dtype=float)[:, :2]]
+    rings += [np.asarray(hole, dtype=float)[:, :2] for hole in holes]
+    points = np.concatenate(rings)
+    first = np.cumsum([0] + [len(ring) for ring in rings])
+    indices = [list(range(first[i], first[i+1])) for i in range(len(rings))]
+
+    flipped = _signed_area(rings[0]) < 0
+    ring = indices[0][::-1] if flipped else indices[0]
+    hole_rings = []
+    for hole, hole_indices in zip(rings[1:], indices[1:]):
+        clockwise = _signed_area(hole) < 0
+        hole_rings.append(hole_indices if clockwise else hole_indices[::-1])
+
+    (ring, hole_rings) = _notch_holes(points, ring, hole_rings)
+    ring = _bridge_holes(points, ring, hole_rings)
+    triangles = np.array(_clip_ears(points, ring), dtype=np.int64)
+    if flipped:
+        triangles = triangles[:, ::-1]
+    return (points, triangles.reshape(-1, 3))
@@ -0,0 +1,216 @@
+# walls.py
+#
+# <pep8-80 compliant>
+
+# UNLICENSE
+# This is free and unencumbered software released into the public domain.
+# For more information, please refer to <http://unlicense.org>
+#
+# Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
+
+from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+from typing import NamedTuple
+from functools import lru_cache
+import math
+
+import numpy as np
+
+from xyz import Num, Xyz, X, Y, Z, polygon_area
+from triangulate import triangulate
+
+# Data types
+Frame = Tuple[Xyz, Tuple[Num, Num]]  # (origin_xyz, (unit_dx, unit_dy))
+
+WALL_TEMPLATE_CACHE_SIZE = 512
+
+
+class WallTemplate(NamedTuple):
+    """The outline of a wall with openings, and its area.
+
+    The outline is in the wall's own local space: (along, across, up), in
+    feet from the first corner of the wall, where "along" follows the
+    wall's first edge. Each opening is threaded into the outline by a pair
+    of bridges down to the bottom edge, making a single polygon.
+    """
+    outline: np.ndarray
+    area: float
+
+
+class WallTriangles(NamedTuple):
+    """A wall with openings, cut into triangles, in the wall's local space.
+
+    The verts are the corners of the wall and of each opening, as
+    (along, across, up) rows, and each row of triangles is three indices
+    into the verts.
+    """
+    verts: np.ndarray
+    triangles: np.ndarray
+
+
+class Facade(NamedTuple):
+    """A regular grid of windows, the same in every story of a wall.
+
+    Windows are spaced one bay apart, center to center, along the wall,
+    with the row of them centered on the wall. Each window's bottom is the
+    sill height above its story's floor. All lengths are in feet.
+    """
+    bay: Num
+    sill: Num
+    width: Num
+    height: Num
+
+
+class FacadeGrid(NamedTuple):
+    """A wall with a Facade of windows, cut into quads around the windows.
+
+    The verts are (along, across, up) rows in the wall's local space, four
+    for each row of quads. There is a quad for each pier between windows
+    in each story, and one for each band of wall between rows of windows.
+    """
+    verts: np.ndarray
+    quads: np.ndarray
+    windows: int
+    area: float
+
+
+def edge_frame(shape: Sequence[Xyz]) -> Frame:
+    """Return the first corner of a shape, and the direction of its first edge.
+    """
+    (x0, y0, z0) = shape[0]
+    (x1, y1, z1) = shape[1]
+    length = math.hypot(x1 - x0, y1 - y0)
+    return (shape[0], ((x1 - x0) / length, (y1 - y0) / length))
+
+
+def frame_matrix(frame: Frame):
+    """Return the matrix that turns (along, across, up) rows into xyz rows."""
+    (xyz, (ux, uy)) = frame
+    return np.array([(ux, uy, 0), (-uy, ux, 0), (0, 0, 1)])
+
+
+def _to_local(shape: Sequence[Xyz], frame: Frame):
+    ((x0, y0, z0), (ux, uy)) = frame
+    return tuple((round((x - x0) * ux + (y - y0) * uy, 6),
+                  round((y - y0) * ux - (x - x0) * uy, 6),
+                  round(z - z0, 6))
+                 for (x, y, z) in shape)
+
+
+@lru_cache(maxsize=WALL_TEMPLATE_CACHE_SIZE)
+def _wall_template(local_shape: Tuple[Xyz], openings: Tuple) -> WallTemplate:
+    outline = [local_shape[0]]
+    for opening in openings:
+        opening = list(opening)
+        opening.reverse()
+        opening = opening[-1:] + opening[:-1]  # rotate: last to first
+        (length, height) = opening[0]
+        base_point = (length, 0, 0)
+        outline.append(base_point)
+        for (length, height) in opening:
+            outline.append((length, 0, height))
+        (length, height) = opening[0]
+        outline.append((length, 0, height))
+        outline.append(base_point)
+    outline.extend(local_shape)
+    return WallTemplate(np.array(outline, dtype=float), polygon_area(outline))
+
+
+def wall_template(shape: Sequence[Xyz],
+                  openings: Sequence[Sequence[Tuple[Num, Num]]]):
+    """Return the (WallTemplate, Frame) for a wall shape with openings.
+
+    Each opening is a list of (length, height) points, measured along the
+    shape's first edge from its first corner, and up from that corner.
+    Templates are kept in a bounded LRU cache keyed by the shape in its own
+    frame and the openings, so every repeat of the same wall (wherever it
+    is, and whichever way it faces) just needs the frame to transform it.
+    """
+    frame = edge_frame(shape)
+    key = tuple(tuple(map(tuple, opening)) for opening in openings)
+    return (_wall_template(_to_local(shape, frame), key), frame)
+
+
+@lru_cache(maxsize=WALL_TEMPLATE_CACHE_SIZE)
+def _wall_triangles(local_shape: Tuple[Xyz], openings: Tuple):
+    holes = [[(length, 0, height) for (length, height) in opening]
+             for opening in openings]
+    verts = np.array(list(local_shape) + [xyz for h in holes for xyz in h])
+    outer = [(along, up) for (along, across, up) in local_shape]
+    (points, triangles) = triangulate(outer, openings)
+    area = _wall_template(local_shape, openings).area
+    (a, b, c) = (points[triangles[:, i]] for i in range(3))
+    doubled = ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+               (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+    wound_alike = (doubled > 0).all() or (doubled < 0).all()
+    if not wound_alike or abs(0.5 * abs(doubled.sum()) - area) > 1e-6 * area:
+        return None  # the openings are not all inside the wall
+    return WallTriangles(verts, triangles)
+
+
+def wall_triangles(shape: Sequence[Xyz],
+                   openings: Sequence[Sequence[Tuple[Num, Num]]]):
+    """Return (WallTriangles, Frame) for a wall shape with openings.
+
+    The triangles are cached per wall template, like wall_template(). If
+    the openings do not fit inside the wall, there is no clean way to cut
+    it into triangles, and this returns (None, Frame).
+    """
+    frame = edge_frame(shape)
+    key = tuple(tuple(map(tuple, opening)) for opening in openings)
+    return (_wall_triangles(_to_local(shape, frame), key), frame)
+
+
+@lru_cache(maxsize=WALL_TEMPLATE_CACHE_SIZE)
+def _facade_grid(length: Num, story: Num, stories: int, facade: Facade):
+    (bay, sill, width, height) = facade
+    count = int(length // bay)
+    centers = (length - count * bay) / 2 + (np.arange(count) + 0.5) * bay
+    piers = np.concatenate([[0], np.stack([centers - width / 2,
+                                           centers + width / 2], 1).ravel(),
+                            [length]]).reshape(-1, 2)
+    if count == 0:
+        (bottoms, tops) = (np.zeros(0), np.zeros(0))
+    else:
+        bottoms = np.arange(stories) * story + sill
+        tops = bottoms + height
+    x0 = np.concatenate([np.tile(piers[:, 0], len(bottoms)),
+                         np.zeros(len(bottoms) + 1)])
+    x1 = np.concatenate([np.tile(piers[:, 1], len(bottoms)),
+                         np.full(len(bottoms) + 1, length)])
+    z0 = np.concatenate([np.repeat(bottoms, count + 1), [0], tops])
+    z1 = np.concatenate([np.repeat(tops, count + 1),
+                         bottoms, [stories * story]])
+    keep = (x1 > x0) & (z1 > z0)
+    (x0, x1, z0, z1) = (x0[keep], x1[keep], z0[keep], z1[keep])
+    corners = np.stack([np.stack([x0, z0], 1), np.stack([x1, z0], 1),
+                        np.stack([x1, z1], 1), np.stack([x0, z1], 1)], 1)
+    verts = np.zeros((4 * len(x0), 3))
+    verts[:, 0] = corners[:, :, 0].ravel()
+    verts[:, 2] = corners[:, :, 1].ravel()
+    quads = np.arange(4 * len(x0)).reshape(-1, 4)
+    windows = count * len(bottoms)
+    area = length * stories * story - windows * width * height
+    for array in (verts, quads):
+        array.setflags(write=False)
+    return FacadeGrid(verts, quads, windows, area)
+
+
+def facade_grid(wall: Sequence[Xyz], stories: int, facade: Facade):
+    """Return (FacadeGrid, Frame) for a rectangular wall with a Facade.
+
+    The wall is four corners, from the bottom edge up, like the walls plato
+    puts around a shape, and it is split into equal stories. The grid is
+    made for every window of every story at once, with NumPy, and cached
+    by its length, stories, and facade, like wall_template().
+    """
+    frame = edge_frame(wall)
+    ((x0, y0, z0), (x1, y1, z1)) = (wall[0], wall[1])
+    length = round(math.hypot(x1 - x0, y1 - y0), 6)
+    story = round((wall[3][Z] - z0) / stories, 6)
+    return (_facade_grid(length, story, stories, facade), frame)
+
+
+def wall_template_cache_info():
+    return (_wall_template.cache_info(),
+            _wall_triangles.cache_info(),
+            _facade_grid.cache_info())
@@ -12,7 +12,7 @@ from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
 from random import randint
 from importlib import reload
 
-from xyz import Num, Xyz, X, Y, Z, xy2xyz, yzwh2rect, nudge
+from xyz import Num, Xyz, X, Y, Z, Shape, xy2xyz, yzwh2rect, nudge
 from compass_facing import CompassFacing as Facing
 from place import Place
 from plato import Plato
@@ -38,20 +38,20 @@ SOUTH_WING_DY = 85
 SOUTH_WING_X0 = 100
 SOUTH_WING_Y0 = 140
 
-SOUTH_WING = [(0, 0, 0),
-              (SOUTH_WING_DX, 0, 0),
-              (SOUTH_WING_DX, SOUTH_WING_DY, 0),
-              (0, SOUTH_WING_DY, 0)]
+SOUTH_WING = Shape([(0, 0, 0),
+                    (SOUTH_WING_DX, 0, 0),
+                    (SOUTH_WING_DX, SOUTH_WING_DY, 0),
+                    (0, SOUTH_WING_DY, 0)])
 
 CENTER_WING_DX = 53
 CENTER_WING_DY = 116
 CENTER_WING_X0 = SOUTH_WING_X0
 CENTER_WING_Y0 = SOUTH_WING_Y0 + SOUTH_WING_DY
 
-CENTER_WING = [(0, 0, 0),
-               (CENTER_WING_DX, 0, 0),
-               (CENTER_WING_DX, CENTER_WING_DY, 0),
-               (0, CENTER_WING_DY, 0)]
+CENTER_WING = Shape([(0, 0, 0),
+                     (CENTER_WING_DX, 0, 0),
+                     (CENTER_WING_DX, CENTER_WING_DY, 0),
+                     (0, CENTER_WING_DY, 0)])
 
 NUM_SOUTH_WING_CRENELS_X = 18
 NUM_SOUTH_WING_CRENELS_Y = 9
@@ -61,20 +61,20 @@ TOWER_DY = 70
 TOWER_X0 = CENTER_WING_X0 + CENTER_WING_DX
 TOWER_Y0 = CENTER_WING_Y0 + CENTER_WING_DY
 
-TOWER = [(0, 0, 0),
-         (TOWER_DX, 0, 0),
-         (TOWER_DX, TOWER_DY, 0),
-         (0, TOWER_DY, 0)]
+TOWER = Shape([(0, 0, 0),
+               (TOWER_DX, 0, 0),
+               (TOWER_DX, TOWER_DY, 0),
+               (0, TOWER_DY, 0)])
 
 TOWER_EAST_DX = 29
 TOWER_EAST_DY = 56
 TOWER_EAST_X0 = TOWER_X0 + TOWER_DX
 TOWER_EAST_Y0 = TOWER_Y0 + 5
 
-TOWER_EAST = [(0, 0, 0),
-              (TOWER_EAST_DX, 0, 0),
-              (TOWER_EAST_DX, TOWER_EAST_DY, 0),
-              (0, TOWER_EAST_DY, 0)]
+TOWER_EAST = Shape([(0, 0, 0),
+                    (TOWER_EAST_DX, 0, 0),
+                    (TOWER_EAST_DX, TOWER_EAST_DY, 0),
+                    (0, TOWER_EAST_DY, 0)])
 
 TOWER_WEST_DX = 29
 TOWER_WEST_DY = 44
@@ -82,10 +82,10 @@ TOWER_WEST_OFFSET_Y = 17
 TOWER_WEST_X0 = TOWER_X0 - TOWER_EAST_DX
 TOWER_WEST_Y0 = TOWER_Y0 + TOWER_WEST_OFFSET_Y
 
-TOWER_WEST = [(0, 0, 0),
-              (TOWER_WEST_DX, 0, 0),
-              (TOWER_WEST_DX, TOWER_WEST_DY, 0),
-              (0, TOWER_WEST_DY, 0)]
+TOWER_WEST = Shape([(0, 0, 0),
+                    (TOWER_WEST_DX, 0, 0),
+                    (TOWER_WEST_DX, TOWER_WEST_DY, 0),
+                    (0, TOWER_WEST_DY, 0)])
 
 ATRIUM_DX = 22
 ATRIUM_DY = 46
@@ -98,20 +98,20 @@ NORTH_WING_DY = 113
 NORTH_WING_X0 = SOUTH_WING_X0 - (NORTH_WING_DX - TOWER_DX - CENTER_WING_DX)
 NORTH_WING_Y0 = TOWER_Y0
 
-NORTH_WING = [(0, 0, 0),
-              (NORTH_WING_DX - TOWER_DX, 0, 0),
-              (NORTH_WING_DX - TOWER_DX, TOWER_WEST_OFFSET_Y, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX - ATRIUM_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX - ATRIUM_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y + ATRIUM_DY, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y + ATRIUM_DY, 0),
-              (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + TOWER_WEST_DY, 0),
-              (NORTH_WING_DX - TOWER_DX, TOWER_WEST_OFFSET_Y + TOWER_WEST_DY, 0),
-              (NORTH_WING_DX - TOWER_DX, TOWER_DY, 0),
-              (NORTH_WING_DX, TOWER_DY, 0),
-              (NORTH_WING_DX, NORTH_WING_DY, 0),
-              (0, NORTH_WING_DY, 0)]
+NORTH_WING = Shape([(0, 0, 0),
+                    (NORTH_WING_DX - TOWER_DX, 0, 0),
+                    (NORTH_WING_DX - TOWER_DX, TOWER_WEST_OFFSET_Y, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX - ATRIUM_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX - ATRIUM_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y + ATRIUM_DY, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + ATRIUM_OFFSET_Y + ATRIUM_DY, 0),
+                    (NORTH_WING_DX - TOWER_DX - TOWER_WEST_DX, TOWER_WEST_OFFSET_Y + TOWER_WEST_DY, 0),
+                    (NORTH_WING_DX - TOWER_DX, TOWER_WEST_OFFSET_Y + TOWER_WEST_DY, 0),
+                    (NORTH_WING_DX - TOWER_DX, TOWER_DY, 0),
+                    (NORTH_WING_DX, TOWER_DY, 0),
+                    (NORTH_WING_DX, NORTH_WING_DY, 0),
+                    (0, NORTH_WING_DY, 0)])
 
 NUM_NORTH_WING_CRENELS_Y = 12
 
@@ -122,17 +122,17 @@ FLOOR_TEN_BALCONY_DY = 23
 FLOOR_TEN_BALCONY_X0 = TOWER_WEST_X0 - FLOOR_TEN_BALCONY_DX
 FLOOR_TEN_BALCONY_Y0 = TOWER_WEST_Y0
 
-FLOOR_TEN_BALCONY = [(0, 0, 0),
-                     (FLOOR_TEN_BALCONY_DX, 0, 0),
-                     (FLOOR_TEN_BALCONY_DX, FLOOR_TEN_BALCONY_DY, 0),
-                     (0, FLOOR_TEN_BALCONY_DY, 0)]
+FLOOR_TEN_BALCONY = Shape([(0, 0, 0),
+                           (FLOOR_TEN_BALCONY_DX, 0, 0),
+                           (FLOOR_TEN_BALCONY_DX, FLOOR_TEN_BALCONY_DY, 0),
+                           (0, FLOOR_TEN_BALCONY_DY, 0)])
 PARCEL_DX = 360
 PARCEL_DY = 540
 
-PARCEL = [(0, 0, 0),
-          (PARCEL_DX, 0, 0),
-          (PARCEL_DX, PARCEL_DY, 0),
-          (0, PARCEL_DY, 0)]
+PARCEL = Shape([(0, 0, 0),
+                (PARCEL_DX, 0, 0),
+                (PARCEL_DX, PARCEL_DY, 0),
+                (0, PARCEL_DY, 0)])
 
 
 class Wurster:
@@ -9,6 +9,9 @@
 # Authored in 2019 by Nicky Nym <https://github.com/nicky-nym>
 
 from typing import Tuple, Sequence, Iterable, Any, List, Optional, Union
+import collections.abc
+
+import numpy as np
 
 # Data types
 Num = Union[int, float]
@@ -32,3 +35,64 @@ def nudge(xyz: Xyz, dx: Num=0, dy: Num=0, dz: Num=0, dxyz: Xyz=(0, 0, 0)):
     (x, y, z) = xyz
     (d_x, d_y, d_z) = dxyz
     return (x + dx + d_x, y + dy + d_y, z + dz + d_z)
+
+
+def polygon_area(xyzs: Sequence[Xyz]):
+    # Newell's method: half the length of the sum of the edge cross products
+    (nx, ny, nz) = (0, 0, 0)
+    (x0, y0, z0) = xyzs[-1]
+    for (x1, y1, z1) in xyzs:
+        nx += (y0 - y1) * (z0 + z1)
+        ny += (z0 - z1) * (x0 + x1)
+        nz += (x0 - x1) * (y0 + y1)
+        (x0, y0, z0) = (x1, y1, z1)
+    return 0.5 * (nx*nx + ny*ny + nz*nz) ** 0.5
+
+
+class Shape(collections.abc.Sequence):
+    """An immutable polygon: its xyz points, and what plato needs to know
+    about them, worked out once.
+
+    A Shape is a sequence of (x, y, z) tuples, so it can go anywhere a list
+    of points can. It is hashable, so it can be a cache key. Its array is
+    the points as one read-only (n, 3) NumPy array, for transforming them
+    all at once, and it knows its area.
+    """
+
+    __slots__ = ("points", "array", "area", "_hash")
+
+    def __init__(self, xyzs: Iterable[Xyz]):
+        points = tuple((x, y, z) for (x, y, z) in xyzs)
+        array = np.array(points, dtype=float).reshape(-1, 3)
+        array.setflags(write=False)
+        init = super().__setattr__
+        init("points", points)
+        init("array", array)
+        init("area", polygon_area(points) if points else 0)
+        init("_hash", hash(points))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("a Shape can't be changed")
+
+    def __reduce__(self):
+        return (Shape, (self.points,))
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, i):
+        return self.points[i]
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, Shape):
+            return self.points == other.points
+        return NotImplemented
+
+    def __repr__(self):
+        return "Shape({!r})".format(list(self.points))